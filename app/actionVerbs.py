@@ -0,0 +1,53 @@
+import json
+import os
+
+"""
+    Runtime access to the action-verb lexicon compiled by data/technicalVerbs/actionWords.py.
+
+    The lexicon maps every verb (past tense and base form, lower-cased) to a bitmask of the
+    categories it was listed under: CodePath's technical verbs, the Dice power verbs and the
+    University of Iowa categories (leading, quantitative, communicating, ...). It is a small
+    JSON file, so loading it needs neither pandas nor the build script.
+"""
+
+# Bump whenever the file layout changes; the build script writes this version too
+LEXICON_VERSION = 2
+LEXICON_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "technicalVerbs", "actionVerbLexicon.json")
+
+
+class ActionVerbLexicon:
+    __slots__ = ('categories', 'verbs', 'lemmas', 'verb_set', 'listed_verbs')
+
+    def __init__(self, categories: list[str], verbs: dict[str, int], lemmas: dict[str, str], listed: list[str]):
+        self.categories = categories
+        # verb -> category bitmask (bit i is categories[i])
+        self.verbs = verbs
+        self.lemmas = lemmas
+        self.verb_set = frozenset(verbs)
+        # The verbs as the source lists spell them (past tense), without base forms such as "project"
+        self.listed_verbs = frozenset(listed)
+
+    def __contains__(self, verb: str) -> bool:
+        return verb in self.verbs
+
+    # Returns the names of the categories a verb belongs to (empty if it is not in the lexicon).
+    def categories_of(self, verb: str) -> list[str]:
+        mask = self.verbs.get(verb, 0)
+        return [category for bit, category in enumerate(self.categories) if mask & (1 << bit)]
+
+    # Returns the verbs listed under one category, e.g. "leading_verbs".
+    def verbs_in(self, category: str) -> frozenset:
+        bit = 1 << self.categories.index(category)
+        return frozenset(verb for verb, mask in self.verbs.items() if mask & bit)
+
+
+"""
+    Loads the compiled lexicon. Raises ValueError if it was written with another LEXICON_VERSION;
+    re-run `python app/data/technicalVerbs/actionWords.py` to rebuild it.
+"""
+def load_action_verb_lexicon(path: str = LEXICON_PATH) -> ActionVerbLexicon:
+    with open(path, "r") as f:
+        data = json.load(f)
+    if data.get("version") != LEXICON_VERSION:
+        raise ValueError(f"Action verb lexicon at {path} has version {data.get('version')}, expected {LEXICON_VERSION}.")
+    return ActionVerbLexicon(data["categories"], data["verbs"], data["lemmas"], data["listed"])
@@ -1,74 +1,244 @@
 import os
 import re
-import PyPDF2
-from PyPDF2 import PdfReader
-from keybert import KeyBERT
-from sentence_transformers import SentenceTransformer, util
-import google.generativeai as genai
-# Initialize open-source models once
-try:
-    KEYBERT_MODEL = KeyBERT()
-    SENTENCE_MODEL = SentenceTransformer('all-MiniLM-L6-v2')
-    print("[INFO] Open-source ML models loaded successfully.")
-except Exception as e:
-    print(f"[WARN]: Could not load open-source ML models. {e}")
-    KEYBERT_MODEL = None
-    SENTENCE_MODEL = None
-
-# --- Gemini API Configuration ---
-try:
-    GEMINI_API_KEY = ""
-
-    if not GEMINI_API_KEY or GEMINI_API_KEY == "":
-        print("[WARN] GEMINI_API_KEY not found or not set. AI suggestions will be disabled.")
-        GEMINI_MODEL = None
-    else:
-        genai.configure(api_key=GEMINI_API_KEY)
-        GEMINI_MODEL = genai.GenerativeModel('gemini-1.5-flash-latest')
-        print("[INFO] Gemini API configured successfully.")
-except Exception as e:
-    print(f"[WARN]: Could not configure Gemini API. {e}")
-    GEMINI_MODEL = None
-
-# Extracts text content from a given PDF file.
-def extract_text_from_pdf(pdf_path: str) -> str:
-    text = ""
+import atexit
+import asyncio
+import hashlib
+import weakref
+from typing import TYPE_CHECKING
+from modelRegistry import (
+    SENTENCE_MODEL_NAME, get_or_create, get_sentence_model, get_encoder_id, get_encode_batcher, get_keybert_model, get_gemini_model, warmup
+)
+# Extracts text content from a PDF path, bytes or file-like object.
+from pdfExtraction import extract_text_from_pdf, iter_pdf_pages, read_pdf_bytes, PdfLimitError, MAX_PDF_BYTES
+from ttlCache import TTLCache
+from instrumentation import span, annotate
+from parsedResume import ParsedResume, REQUIRED_SECTIONS
+from promptBuilder import compact_prompt_inputs, estimate_tokens, MAX_PROMPT_TOKENS
+
+# Heavy dependencies (PyPDF2, numpy, sentence-transformers, KeyBERT, Gemini) are imported on first use,
+# so the regex-only helpers such as check_codepath_student_resume_format import in milliseconds.
+if TYPE_CHECKING:
+    import numpy as np
+    from embeddingCache import EmbeddingCache
+    from suggestionCache import SuggestionCache
+
+# Models are loaded lazily by modelRegistry; these names are kept for existing callers
+# and resolve to the loaded model (or None) on first access.
+_LAZY_MODELS = {
+    "KEYBERT_MODEL": get_keybert_model,
+    "SENTENCE_MODEL": get_sentence_model,
+    "GEMINI_MODEL": get_gemini_model
+}
+
+def __getattr__(name: str):
+    if name in _LAZY_MODELS:
+        return _LAZY_MODELS[name]()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+# --- Embedding Cache Configuration ---
+# Re-encoding an unchanged resume or JD costs a hash and a disk read instead of a forward pass.
+EMBEDDING_CACHE_DIR = os.environ.get(
+    "RESUME_ELEVATE_CACHE_DIR", os.path.join(os.path.expanduser("~"), ".cache", "resume_elevate", "embeddings")
+)
+EMBEDDING_CACHE_MAX_ENTRIES = int(os.environ.get("RESUME_ELEVATE_CACHE_MAX_ENTRIES", "10000"))
+
+def _open_embedding_cache():
     try:
-        with open(pdf_path, 'rb') as file:
-            pdf_reader = PdfReader(file)
-            for page in pdf_reader.pages:
-                page_text = page.extract_text()
-                if page_text:
-                    text += page_text + "\n"
-    except FileNotFoundError:
-        print(f"Error: The file at {pdf_path} was not found.")
-        return ""
-    return text.strip()
+        from embeddingCache import EmbeddingCache
+        cache = EmbeddingCache(EMBEDDING_CACHE_DIR, max_entries=EMBEDDING_CACHE_MAX_ENTRIES)
+        atexit.register(cache.flush)
+        return cache
+    except OSError as e:
+        print(f"[WARN]: Could not open the embedding cache. Embeddings will not be cached. {e}")
+        return None
+
+def get_embedding_cache() -> "EmbeddingCache | None":
+    return get_or_create("embedding_cache", _open_embedding_cache)
+
+# --- Parsed Resume Cache Configuration ---
+# Re-submitting the same PDF against another JD skips extraction, format checks and resume encoding.
+RESUME_CACHE_MAX_ENTRIES = int(os.environ.get("RESUME_ELEVATE_RESUME_CACHE_MAX_ENTRIES", "256"))
+RESUME_CACHE_TTL_SECONDS = float(os.environ.get("RESUME_ELEVATE_RESUME_CACHE_TTL_SECONDS", "3600"))
+
+def get_resume_cache() -> TTLCache:
+    return get_or_create("resume_cache", lambda: TTLCache(RESUME_CACHE_MAX_ENTRIES, RESUME_CACHE_TTL_SECONDS))
+
+# --- Long Document Configuration ---
+# The sentence model reads at most 256 word pieces (~180 words) and silently drops the rest, so a long
+# resume embedded whole is scored on its opening only. With pooling on, texts are split into overlapping
+# word windows that each fit, all windows are encoded in one batch, and the window embeddings are combined:
+#   "mean"   - cosine of the mean window embeddings
+#   "max"    - cosine of the element-wise max of the window embeddings
+#   "matrix" - each JD window is matched with its most similar resume window, averaged over the JD windows
+# "off" (the default) embeds each text whole.
+SIMILARITY_POOLING_MODES = ("off", "mean", "max", "matrix")
+SIMILARITY_POOLING = os.environ.get("RESUME_ELEVATE_SIMILARITY_POOLING", "off").lower()
+if SIMILARITY_POOLING not in SIMILARITY_POOLING_MODES:
+    print(f"[WARN] Unknown RESUME_ELEVATE_SIMILARITY_POOLING '{SIMILARITY_POOLING}'; texts will be embedded whole.")
+    SIMILARITY_POOLING = "off"
+CHUNK_WORDS = int(os.environ.get("RESUME_ELEVATE_CHUNK_WORDS", "150"))
+CHUNK_OVERLAP_WORDS = int(os.environ.get("RESUME_ELEVATE_CHUNK_OVERLAP_WORDS", "30"))
+_CHUNK_WORD_RE = re.compile(r'\S+')
+
+# Keyphrases KeyBERT returns per document
+KEYWORDS_PER_TEXT = 20
 
 # Extracts relevant keywords from text, optionally guided by seed keywords.
-def extract_keywords(text: str, seed_keywords: list[str] = None) -> list[str]:
-    if not KEYBERT_MODEL: return []
-    try:
-        keywords = KEYBERT_MODEL.extract_keywords(
-            text, keyphrase_ngram_range=(1, 3), stop_words='english',
-            use_mmr=True, diversity=0.5, top_n=20, seed_keywords=seed_keywords
-        )
-        return [keyword for keyword, score in keywords]
-    except Exception as e:
-        print(f"An error occurred during keyword extraction: {e}")
-        return []
-
-# Calculates the semantic similarity between two texts.
-def get_semantic_similarity(text1: str, text2: str) -> float:
-    if not SENTENCE_MODEL: return 0.0
+# The document embedding goes through encode_texts, so the later similarity call reuses it from the cache;
+# callers that already hold it can pass it as doc_embedding.
+def extract_keywords(text: str, seed_keywords: list[str] = None, doc_embedding: "np.ndarray" = None) -> list[str]:
+    return [keyword for keyword, score in extract_scored_keywords(text, seed_keywords, doc_embedding)]
+
+# Like extract_keywords, but keeps KeyBERT's relevance score with each keyword, best first.
+def extract_scored_keywords(text: str, seed_keywords: list[str] = None,
+                            doc_embedding: "np.ndarray" = None) -> list[tuple[str, float]]:
+    keybert_model = get_keybert_model()
+    if not keybert_model or not text.strip(): return []
+    with span("extract_keywords", chars=len(text), seed_keywords=len(seed_keywords or [])) as stage:
+        try:
+            doc_embeddings = encode_texts([text]) if doc_embedding is None else doc_embedding.reshape(1, -1)
+            keywords = keybert_model.extract_keywords(
+                text, keyphrase_ngram_range=(1, 3), stop_words='english',
+                use_mmr=True, diversity=0.5, top_n=KEYWORDS_PER_TEXT, seed_keywords=seed_keywords or None,
+                doc_embeddings=doc_embeddings
+            )
+            stage.set(keywords=len(keywords))
+            return keywords
+        except Exception as e:
+            print(f"An error occurred during keyword extraction: {e}")
+            return []
+
+# Encodes texts with SENTENCE_MODEL, serving repeats from the embedding cache (keyed by model and backend).
+# Only texts missing from the cache are encoded, through the shared micro-batcher, so concurrent
+# requests share forward passes.
+def encode_texts(texts: list[str]) -> "np.ndarray":
+    import numpy as np
+    encode_batcher = get_encode_batcher()
+    embedding_cache = get_embedding_cache()
+    with span("encode", texts=len(texts)) as stage:
+        if embedding_cache is None:
+            stage.set(encoded=len(texts))
+            return encode_batcher.encode(texts)
+
+        encoder_id = get_encoder_id()
+        keys = [embedding_cache.make_key(encoder_id, text) for text in texts]
+        embeddings = embedding_cache.get_many(keys)
+        # Map each uncached key to its first text so duplicates within a call are encoded once
+        missing = {}
+        for i, embedding in enumerate(embeddings):
+            if embedding is None: missing.setdefault(keys[i], i)
+        stage.set(cache_hits=len(texts) - sum(embedding is None for embedding in embeddings), encoded=len(missing))
+        if missing:
+            new_embeddings = encode_batcher.encode([texts[i] for i in missing.values()])
+            embedding_cache.put_many(list(missing), new_embeddings)
+            encoded = dict(zip(missing, new_embeddings))
+            embeddings = [encoded[key] if embedding is None else embedding for key, embedding in zip(keys, embeddings)]
+        return np.stack(embeddings)
+
+# Splits text into windows of chunk_words words, each overlapping the previous one by overlap_words.
+# Text that fits in one window is returned as is, so it shares its cache entry with the whole-text embedding.
+def chunk_text(text: str, chunk_words: int = CHUNK_WORDS, overlap_words: int = CHUNK_OVERLAP_WORDS) -> list[str]:
+    words = _CHUNK_WORD_RE.findall(text)
+    if len(words) <= chunk_words: return [text]
+    step = max(chunk_words - overlap_words, 1)
+    return [" ".join(words[start:start + chunk_words]) for start in range(0, len(words) - overlap_words, step)]
+
+# Encodes the chunks of every text in a single encode_texts call. Returns one (chunks, dim) matrix per text.
+def encode_chunks(texts: list[str]) -> list["np.ndarray"]:
+    import numpy as np
+    chunked = [chunk_text(text) for text in texts]
+    embeddings = encode_texts([chunk for chunks in chunked for chunk in chunks])
+    bounds = np.cumsum([0] + [len(chunks) for chunks in chunked])
+    return [embeddings[start:end] for start, end in zip(bounds[:-1], bounds[1:])]
+
+def _normalize_rows(embeddings: "np.ndarray") -> "np.ndarray":
+    import numpy as np
+    embeddings = np.asarray(embeddings, dtype=np.float32)
+    norms = np.linalg.norm(embeddings, axis=-1, keepdims=True)
+    return embeddings / np.where(norms == 0, 1.0, norms)
+
+# Scores two texts from their chunk embeddings with one of SIMILARITY_POOLING_MODES (other than "off").
+# chunks2 is the reference side (the JD) for "matrix" pooling.
+def get_chunk_similarity(chunks1: "np.ndarray", chunks2: "np.ndarray", pooling: str = SIMILARITY_POOLING) -> float:
+    chunks1, chunks2 = _normalize_rows(chunks1), _normalize_rows(chunks2)
+    if pooling == "matrix":
+        score = (chunks2 @ chunks1.T).max(axis=1).mean()
+    else:
+        pooled1, pooled2 = (chunks.mean(axis=0) if pooling == "mean" else chunks.max(axis=0) for chunks in (chunks1, chunks2))
+        score = _normalize_rows(pooled1) @ _normalize_rows(pooled2)
+    return round(float(score), 2)
+
+# Calculates the semantic similarity between two texts, over their full length when pooling is on.
+def get_semantic_similarity(text1: str, text2: str, pooling: str = SIMILARITY_POOLING) -> float:
+    if not get_sentence_model(): return 0.0
+    with span("semantic_similarity", chars=len(text1) + len(text2), pooling=pooling):
+        try:
+            if pooling != "off":
+                chunks1, chunks2 = encode_chunks([text1, text2])
+                return get_chunk_similarity(chunks1, chunks2, pooling)
+            embedding1, embedding2 = encode_texts([text1, text2])
+            return get_embedding_similarity(embedding1, embedding2)
+        except Exception as e:
+            print(f"An error occurred during semantic similarity calculation: {e}")
+            return 0.0
+
+# Calculates the cosine similarity between two precomputed embeddings.
+def get_embedding_similarity(embedding1: "np.ndarray", embedding2: "np.ndarray") -> float:
+    from sentence_transformers import util
+    cosine_score = util.cos_sim(embedding1, embedding2)
+    return round(cosine_score.item(), 2)
+
+# Scores each resume section against a JD embedding with one cosine-similarity call.
+# Returns [{"section", "semantic_score"}] in resume order.
+def get_section_similarities(headings: list[str], section_embeddings: "np.ndarray", jd_embedding: "np.ndarray") -> list[dict]:
+    if not headings: return []
+    from sentence_transformers import util
+    cosine_scores = util.cos_sim(section_embeddings, jd_embedding)[:, 0].tolist()
+    return [{"section": heading, "semantic_score": round(score, 2)} for heading, score in zip(headings, cosine_scores)]
+
+# Extracts keywords for many texts with a single KeyBERT call, keeping results aligned with the input order.
+def extract_keywords_batch(texts: list[str], seed_keywords: list[str] = None) -> list[list[str]]:
+    results = [[] for _ in texts]
+    keybert_model = get_keybert_model()
+    if not keybert_model: return results
+    # KeyBERT cannot extract from empty documents (e.g. a JD without a preferred section)
+    indices = [i for i, text in enumerate(texts) if text.strip()]
+    if not indices: return results
+    docs = [texts[i] for i in indices]
+    with span("extract_keywords_batch", docs=len(docs), chars=sum(map(len, docs)), seed_keywords=len(seed_keywords or [])):
+        try:
+            keywords = keybert_model.extract_keywords(
+                docs, keyphrase_ngram_range=(1, 3), stop_words='english',
+                use_mmr=True, diversity=0.5, top_n=KEYWORDS_PER_TEXT, seed_keywords=seed_keywords or None,
+                doc_embeddings=encode_texts(docs)
+            )
+            # KeyBERT returns a flat list instead of a list of lists for a single document
+            if len(indices) == 1: keywords = [keywords]
+            for i, doc_keywords in zip(indices, keywords):
+                results[i] = [keyword for keyword, score in doc_keywords]
+        except Exception as e:
+            print(f"An error occurred during batch keyword extraction: {e}")
+    return results
+
+# Calculates the semantic similarity of every text in texts1 against every text in texts2.
+# Both lists are encoded in one batched (cached) call and scored with a single cos_sim call
+# (or, with pooling on, their chunks are encoded in one call and each pair is pooled).
+def get_semantic_similarity_matrix(texts1: list[str], texts2: list[str], pooling: str = SIMILARITY_POOLING) -> list[list[float]]:
+    empty = [[0.0] * len(texts2) for _ in texts1]
+    if not get_sentence_model() or not texts1 or not texts2: return empty
     try:
-        embedding1 = SENTENCE_MODEL.encode(text1, convert_to_tensor=True)
-        embedding2 = SENTENCE_MODEL.encode(text2, convert_to_tensor=True)
-        cosine_score = util.cos_sim(embedding1, embedding2)
-        return round(cosine_score.item(), 2)
+        if pooling != "off":
+            chunk_embeddings = encode_chunks(texts1 + texts2)
+            return [[get_chunk_similarity(chunks1, chunks2, pooling) for chunks2 in chunk_embeddings[len(texts1):]]
+                    for chunks1 in chunk_embeddings[:len(texts1)]]
+        from sentence_transformers import util
+        embeddings = encode_texts(texts1 + texts2)
+        embeddings1, embeddings2 = embeddings[:len(texts1)], embeddings[len(texts1):]
+        cosine_scores = util.cos_sim(embeddings1, embeddings2)
+        return [[round(score, 2) for score in row] for row in cosine_scores.tolist()]
     except Exception as e:
-        print(f"An error occurred during semantic similarity calculation: {e}")
-        return 0.0
+        print(f"An error occurred during batch semantic similarity calculation: {e}")
+        return empty
 
 
 """
@@ -95,109 +265,153 @@ def parse_job_description(jd_text: str) -> dict:
 
 #  Codepath Student resume format
 
-"""
-    Checks the resume against CodePath's specific formatting guidelines for students.
-    resume_text (str): The full text content of the resume.
+# All format patterns are compiled once at import; tokenizing happens once per resume in ParsedResume.
+_GPA_RE = re.compile(r'\b(gpa)\b.*([12]\.\d|3\.[0-4])')
+_GRADUATION_DATE_RE = re.compile(
+    r'\b(january|february|march|april|may|june|july|august|september|october|november|december|expected|grad)\b.*\d{4}'
+)
+_GRADUATION_WORDS = frozenset([
+    'january', 'february', 'march', 'april', 'may', 'june', 'july', 'august',
+    'september', 'october', 'november', 'december', 'expected', 'grad'
+])
+_MAGNITUDE_WORDS = frozenset(['thousand', 'million', 'billion'])
+_QUANTITY_RE = re.compile(r'\d+(?:\.\d+)?')
+
+# The original hand-picked verbs; the bullet check accepts these plus the past-tense verbs of the compiled lexicon
+ACTION_VERBS = frozenset([
+    'developed', 'engineered', 'created', 'led', 'managed', 'implemented',
+    'designed', 'architected', 'built', 'optimized', 'improved', 'increased',
+    'reduced', 'launched', 'spearheaded', 'analyzed', 'collaborated', 'contributed',
+    'debugged', 'deployed', 'executed', 'generated', 'maintained', 'mentored',
+    'programmed', 'researched', 'solved', 'tested', 'transformed', 'upgraded'
+])
+
+def _missing_marker(marker: str):
+    return lambda scan: marker not in scan.markers
+
+def _missing_section(section: str):
+    return lambda scan: section not in scan.section_index
+
+def _has_low_gpa(scan: ParsedResume) -> bool:
+    return 'gpa' in scan.word_set and _GPA_RE.search(scan.lower) is not None
+
+def _missing_graduation_date(scan: ParsedResume) -> bool:
+    return scan.word_set.isdisjoint(_GRADUATION_WORDS) or _GRADUATION_DATE_RE.search(scan.lower) is None
+
+# Listed past tenses that more often open a bullet as a noun ("Set of ...", "Input: ...", "Found in ...")
+AMBIGUOUS_ACTION_VERBS = frozenset(['set', 'input', 'found'])
+
+def _load_action_verbs() -> frozenset:
+    try:
+        from actionVerbs import load_action_verb_lexicon
+        # Base forms are left out, since many double as nouns ("Project: ...", "Research interests ...")
+        return ACTION_VERBS | (load_action_verb_lexicon().listed_verbs - AMBIGUOUS_ACTION_VERBS)
+    except (OSError, ValueError) as e:
+        print(f"[WARN]: Could not load the action verb lexicon. Only the built-in action verbs will be used. {e}")
+        return ACTION_VERBS
+
+# Every action verb the bullet check accepts. Loaded once on first use.
+def get_action_verbs() -> frozenset:
+    return get_or_create("action_verbs", _load_action_verbs)
+
+# A bullet is strong if its first word, or first two words ("rolled out"), is an action verb.
+def _has_weak_bullet_verbs(scan: ParsedResume) -> bool:
+    action_verbs = get_action_verbs()
+    for bullet in scan.bullet_texts:
+        words = bullet.strip().split(' ', 2)
+        if words[0] and words[0] not in action_verbs and ' '.join(words[:2]) not in action_verbs:
+            return True
+    return False
+
+# Threshold for low quantitative detail (can be adjusted)
+QUANTITATIVE_DENSITY_THRESHOLD = 0.005
+
+# Numbers, percentages and magnitude words ("thousand", "million") relative to all words.
+def _has_low_number_density(scan: ParsedResume) -> bool:
+    if not scan.bullets: return False
+    # A decimal such as 3.5 counts once, although it is two words; template blanks such as "__" do not count
+    quantifiable_terms = len(_QUANTITY_RE.findall(scan.text)) + sum(1 for word in scan.words if word in _MAGNITUDE_WORDS)
+    number_density = quantifiable_terms / len(scan.words) if scan.words else 0
+    return number_density < QUANTITATIVE_DENSITY_THRESHOLD
 
-    ret: list[str]: A list of feedback messages regarding the resume's format.
-                   Returns a success message if all checks pass.
 """
-def check_codepath_student_resume_format(resume_text: str) -> list[str]:
-    feedback = []
-
+    Declarative table of CodePath formatting rules, evaluated in order.
+    Each rule is (name, check, feedback) where check(scan) returns True when the resume fails it.
+    New rules should read from the shared ParsedResume instead of rescanning the resume text.
+"""
+CODEPATH_FORMAT_RULES = [
     # -Contact Information Checks
-    _check_contact_info(resume_text, feedback)
-
+    ("contact_email", _missing_marker('email'), "Contact Info: Consider adding your Email Address."),
+    ("contact_phone", _missing_marker('phone'), "Contact Info: Consider adding your Phone Number."),
+    ("contact_linkedin", _missing_marker('linkedin'), "Contact Info: Consider adding your LinkedIn URL."),
+    ("contact_github", _missing_marker('github'), "Contact Info: Consider adding your GitHub URL."),
     # - Section Structure Checks
-    _check_required_sections(resume_text, feedback)
-
+    *[
+        (f"section_{section}", _missing_section(section),
+         f"Structure: Missing a standard '{section.capitalize()}' section, which is required.")
+        for section in REQUIRED_SECTIONS
+    ],
     # --- Education Section Checks
-    _check_education_details(resume_text, feedback)
-
+    ("education_gpa", _has_low_gpa, "Education: Your GPA is below 3.5. It's recommended to remove it."),
+    ("education_degree", _missing_marker('degree'),
+     "Education: Ensure you list your full degree name (e.g., Bachelor of Science in Computer Science)."),
+    ("education_graduation_date", _missing_graduation_date,
+     "Education: Include your planned graduation month and year (e.g., May 2025)."),
     # --- CodePath Specific Mentions
-    _check_codepath_mention(resume_text, feedback)
-
+    ("codepath_mention", lambda scan: 'codepath' not in scan.lower, "Skills/Education: Mention your CodePath course(s)."),
     # --- Experience/Projects Section Checks
-    _check_bullet_point_quality(resume_text, feedback)
+    ("bullet_action_verbs", _has_weak_bullet_verbs,
+     "Experience/Projects: Some bullet points may not start with a strong action verb."),
+    ("bullet_quantitative_details", _has_low_number_density,
+     "Experience/Projects: Add more quantitative details (numbers, percentages, etc.) to show impact."),
+]
 
+"""
+    Checks the resume against CodePath's specific formatting guidelines for students.
+    resume_text (str | ParsedResume): The full text content of the resume, or its parsed form.
+
+    ret: list[str]: A list of feedback messages regarding the resume's format.
+                   Returns a success message if all checks pass.
+"""
+def check_codepath_student_resume_format(resume_text: "str | ParsedResume") -> list[str]:
+    with span("format_checks") as stage:
+        scan = resume_text if isinstance(resume_text, ParsedResume) else ParsedResume(resume_text)
+        feedback = [message for name, check, message in CODEPATH_FORMAT_RULES if check(scan)]
+        stage.set(chars=len(scan.text), bullets=len(scan.bullet_texts), issues=len(feedback))
     return feedback if feedback else ["Your resume format aligns well with CodePath student guidelines! Great job!"]
 
-#  Helper to check for essential contact information.
-def _check_contact_info(resume_text: str, feedback: list[str]):
-    contact_checks = {
-        "Email Address": r'[\w\.-]+@[\w\.-]+',
-        "Phone Number": r'\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}',
-        "LinkedIn URL": r'linkedin.com/in/[\w-]+',
-        "GitHub URL": r'github.com/[\w-]+'
-    }
-    for item, pattern in contact_checks.items():
-        if not re.search(pattern, resume_text, re.IGNORECASE):
-            feedback.append(f"Contact Info: Consider adding your {item}.")
-
-# Helper to check for the presence of standard resume sections.
-def _check_required_sections(resume_text: str, feedback: list[str]):
-    required_sections = ['education', 'experience', 'projects', 'skills']
-    for section in required_sections:
-        if not re.search(r'\b' + section + r'\b', resume_text, re.IGNORECASE):
-            feedback.append(f"Structure: Missing a standard '{section.capitalize()}' section, which is required.")
-
-
-# Helper to check for specific details within the education section.
-def _check_education_details(resume_text: str, feedback: list[str]):
-    # Check for when GPA is below 3.5
-    gpa_pattern = r'\b(gpa)\b.*([12]\.\d|3\.[0-4])'
-    if re.search(gpa_pattern, resume_text, re.IGNORECASE):
-        feedback.append("Education: Your GPA is below 3.5. It's recommended to remove it.")
-    
-    # Check for full degree name
-    degree_pattern = r'\b(bachelor|master|b\.s|m\.s)\b'
-    if not re.search(degree_pattern, resume_text, re.IGNORECASE):
-        feedback.append("Education: Ensure you list your full degree name (e.g., Bachelor of Science in Computer Science).")
-        
-    dates_pattern = r'\b(january|february|march|april|may|june|july|august|september|october|november|december|expected|grad)\b.*\d{4}'
-    # Checks for planned graduation month and year
-    if not re.search(dates_pattern, resume_text, re.IGNORECASE):
-        feedback.append("Education: Include your planned graduation month and year (e.g., May 2025).")
-
-# Helper to check if CodePath courses are mentioned.
-def _check_codepath_mention(resume_text: str, feedback: list[str]):
-    if not re.search(r'codepath', resume_text, re.IGNORECASE):
-        feedback.append("Skills/Education: Mention your CodePath course(s).")
-
-# check bullet points for action verbs and quantitative details.
-def _check_bullet_point_quality(resume_text: str, feedback: list[str]):
-    # TODO: attach data/technicalVerbAnalysis/actionWords.py csv action_verbs file once done refining
-    action_verbs = [
-        'developed', 'engineered', 'created', 'led', 'managed', 'implemented', 
-        'designed', 'architected', 'built', 'optimized', 'improved', 'increased', 
-        'reduced', 'launched', 'spearheaded', 'analyzed', 'collaborated', 'contributed',
-        'debugged', 'deployed', 'executed', 'generated', 'maintained', 'mentored',
-        'programmed', 'researched', 'solved', 'tested', 'transformed', 'upgraded'
-    ]
-    bullet_points = re.findall(r'[\n\r]\s*[\*•-]\s*(.*)', resume_text)
-
-    if bullet_points:
-        # Check for strong action verbs
-        if any(p.strip().split(' ')[0].lower() not in action_verbs for p in bullet_points if p.strip()):
-            feedback.append("Experience/Projects: Some bullet points may not start with a strong action verb.")
-        
-        # Check for quantitative details (numbers/percentages)
-        total_words = len(re.findall(r'\b\w+\b', resume_text))
-        # Updated regex to capture numbers and common quantifiers like "thousand", "million"
-        quantifiable_terms = re.findall(r'\d+(\.\d+)?%?|\b(thousand|million|billion)\b', resume_text, re.IGNORECASE)
-        number_density = len(quantifiable_terms) / total_words if total_words > 0 else 0
-        
-        # Threshold for low quantitative detail (can be adjusted)
-        if number_density < 0.005:
-             feedback.append("Experience/Projects: Add more quantitative details (numbers, percentages, etc.) to show impact.")
-             
 # --- Main Analysis Logic ---
-# Generates resume improvement suggestions using the Gemini API.
-def generate_improvement_suggestions(resume_text, jd_text, matched_keywords, missing_keywords, format_feedback, weighted_score, semantic_score):
-    if not GEMINI_MODEL:
-        return "AI suggestions are disabled. Please set your GEMINI_API_KEY."
-    print("\n[INFO] Generating AI suggestions with Gemini API...")
-    
+# --- LLM Configuration ---
+# Upper bound on concurrent LLM calls per event loop, and on how long a single call may take in the async pipeline.
+MAX_CONCURRENT_LLM_CALLS = int(os.environ.get("RESUME_ELEVATE_MAX_CONCURRENT_LLM_CALLS", "8"))
+LLM_TIMEOUT_SECONDS = float(os.environ.get("RESUME_ELEVATE_LLM_TIMEOUT_SECONDS", "60"))
+# --- Suggestion Cache Configuration ---
+# Identical suggestion requests are answered from disk instead of making a new paid API call.
+SUGGESTION_CACHE_DIR = os.environ.get(
+    "RESUME_ELEVATE_SUGGESTION_CACHE_DIR", os.path.join(os.path.expanduser("~"), ".cache", "resume_elevate", "suggestions")
+)
+SUGGESTION_CACHE_TTL_SECONDS = float(os.environ.get("RESUME_ELEVATE_SUGGESTION_CACHE_TTL_SECONDS", str(7 * 24 * 3600)))
+
+def _open_suggestion_cache():
+    try:
+        from suggestionCache import SuggestionCache
+        return SuggestionCache(SUGGESTION_CACHE_DIR, ttl_seconds=SUGGESTION_CACHE_TTL_SECONDS)
+    except OSError as e:
+        print(f"[WARN]: Could not open the suggestion cache. Suggestions will not be cached. {e}")
+        return None
+
+def get_suggestion_cache() -> "SuggestionCache | None":
+    return get_or_create("suggestion_cache", _open_suggestion_cache)
+
+SUGGESTIONS_DISABLED_MESSAGE = "AI suggestions are disabled. Please set your GEMINI_API_KEY."
+SUGGESTIONS_ERROR_MESSAGE = "Could not generate AI suggestions due to an API error."
+
+# Builds the Gemini prompt for resume improvement suggestions.
+# The resume and JD are compacted to a token budget first (see promptBuilder), and the prompt size is reported.
+def build_improvement_prompt(resume_text, jd_text, matched_keywords, missing_keywords, format_feedback, weighted_score, semantic_score) -> str:
+    resume_text, jd_text, matched_keywords, missing_keywords = compact_prompt_inputs(
+        resume_text, jd_text, matched_keywords, missing_keywords
+    )
     prompt = f"""
     You are an expert career coach specializing in helping CodePath computer science students optimize their resumes for tech job applications. 
     Your goal is to provide highly actionable, empathetic, and constructive feedback based on the provided resume and job description.
@@ -245,27 +459,152 @@ def generate_improvement_suggestions(resume_text, jd_text, matched_keywords, mis
 
     Ensure your suggestions are concise, actionable, and encouraging.
     """
-    try:
-        response = GEMINI_MODEL.generate_content(prompt)
+    prompt_tokens = estimate_tokens(prompt)
+    print(f"[INFO] Suggestion prompt is ~{prompt_tokens} tokens "
+          f"(resume ~{estimate_tokens(resume_text)}, JD ~{estimate_tokens(jd_text)}).")
+    if prompt_tokens > MAX_PROMPT_TOKENS:
+        print(f"[WARN] Suggestion prompt exceeds the {MAX_PROMPT_TOKENS} token budget.")
+    annotate(prompt_tokens=prompt_tokens)
+    return prompt
+
+# Cache key for a suggestion request, or None when caching is off or unavailable.
+def _suggestion_cache_key(llm_client, use_cache, *prompt_inputs) -> str | None:
+    suggestion_cache = get_suggestion_cache() if use_cache else None
+    if not suggestion_cache: return None
+    model_name = getattr(llm_client, "model_name", type(llm_client).__name__)
+    resume_text, *other_inputs = prompt_inputs
+    if isinstance(resume_text, ParsedResume): resume_text = resume_text.text
+    return suggestion_cache.make_key(model_name, resume_text, *other_inputs)
+
+"""
+    Generates resume improvement suggestions using the Gemini API.
+    resume_text: The resume text, or its ParsedResume so prompt compaction reuses the sections.
+    llm_client: Any object with a Gemini-style generate_content(prompt) method returning a
+                response with a .text attribute (see llmClients.FakeLLMClient for tests).
+                Defaults to the configured Gemini model.
+    use_cache: Serve identical requests from the suggestion cache, and share one API call
+               between concurrent identical requests.
+"""
+def generate_improvement_suggestions(resume_text, jd_text, matched_keywords, missing_keywords, format_feedback,
+                                     weighted_score, semantic_score, llm_client=None, use_cache: bool = True):
+    llm_client = llm_client or get_gemini_model()
+    if not llm_client:
+        return SUGGESTIONS_DISABLED_MESSAGE
+    prompt_inputs = (resume_text, jd_text, matched_keywords, missing_keywords, format_feedback, weighted_score, semantic_score)
+
+    def generate() -> str:
+        print("\n[INFO] Generating AI suggestions with Gemini API...")
+        annotate(cache_hit=False)
+        return llm_client.generate_content(build_improvement_prompt(*prompt_inputs)).text
+
+    with span("suggestions") as stage:
+        try:
+            cache_key = _suggestion_cache_key(llm_client, use_cache, *prompt_inputs)
+            # Cleared by generate() when the cache has to call the model after all
+            stage.set(cache_hit=cache_key is not None)
+            if cache_key is None: return generate()
+            return get_suggestion_cache().get_or_generate(cache_key, generate)
+        except Exception as e:
+            print(f"An error occurred during Gemini API call: {e}")
+            return SUGGESTIONS_ERROR_MESSAGE
+
+# One semaphore per running event loop, since asyncio primitives cannot be shared across loops
+_LLM_SEMAPHORES = weakref.WeakKeyDictionary()
+
+def _get_llm_semaphore() -> asyncio.Semaphore:
+    loop = asyncio.get_running_loop()
+    semaphore = _LLM_SEMAPHORES.get(loop)
+    if semaphore is None:
+        semaphore = _LLM_SEMAPHORES[loop] = asyncio.Semaphore(MAX_CONCURRENT_LLM_CALLS)
+    return semaphore
+
+"""
+    Async variant of generate_improvement_suggestions. At most MAX_CONCURRENT_LLM_CALLS calls
+    run at once per event loop, and each is cancelled after timeout seconds.
+    Clients with a generate_content_async coroutine (as Gemini has) are awaited directly;
+    otherwise the blocking generate_content call runs in the default executor.
+"""
+async def generate_improvement_suggestions_async(resume_text, jd_text, matched_keywords, missing_keywords, format_feedback,
+                                                 weighted_score, semantic_score, llm_client=None,
+                                                 timeout: float = LLM_TIMEOUT_SECONDS, use_cache: bool = True) -> str:
+    llm_client = llm_client or get_gemini_model()
+    if not llm_client:
+        return SUGGESTIONS_DISABLED_MESSAGE
+    prompt_inputs = (resume_text, jd_text, matched_keywords, missing_keywords, format_feedback, weighted_score, semantic_score)
+
+    async def generate() -> str:
+        annotate(cache_hit=False)
+        prompt = build_improvement_prompt(*prompt_inputs)
+        async with _get_llm_semaphore():
+            if hasattr(llm_client, "generate_content_async"):
+                response = await asyncio.wait_for(llm_client.generate_content_async(prompt), timeout)
+            else:
+                loop = asyncio.get_running_loop()
+                response = await asyncio.wait_for(loop.run_in_executor(None, llm_client.generate_content, prompt), timeout)
         return response.text
-    except Exception as e:
-        print(f"An error occurred during Gemini API call: {e}")
-        return "Could not generate AI suggestions due to an API error."
 
+    with span("suggestions") as stage:
+        try:
+            cache_key = _suggestion_cache_key(llm_client, use_cache, *prompt_inputs)
+            stage.set(cache_hit=cache_key is not None)
+            if cache_key is None: return await generate()
+            return await get_suggestion_cache().get_or_generate_async(cache_key, generate)
+        except asyncio.TimeoutError:
+            print(f"[WARN] Gemini API call timed out after {timeout} seconds.")
+            stage.set(timed_out=True)
+            return SUGGESTIONS_ERROR_MESSAGE
+        except Exception as e:
+            print(f"An error occurred during Gemini API call: {e}")
+            return SUGGESTIONS_ERROR_MESSAGE
+
+
+# --- Keyword Matching Configuration ---
+# Cosine similarity above which a resume keyphrase counts as matching a JD keyphrase, so that e.g.
+# "rest apis" matches "restful api". Unset (the default) keeps exact string matching.
+_keyword_match_threshold = os.environ.get("RESUME_ELEVATE_KEYWORD_MATCH_THRESHOLD", "")
+KEYWORD_MATCH_THRESHOLD = float(_keyword_match_threshold) if _keyword_match_threshold else None
+
+# Returns the JD keywords that exactly or semantically match a resume keyword.
+# All keyphrases are embedded in one encode_texts call and compared with a single matrix multiply.
+def _match_jd_keywords(resume_keywords: list[str], jd_keywords: list[str], threshold: float | None) -> set[str]:
+    resume_set = set(resume_keywords)
+    exact_matches = {keyword for keyword in jd_keywords if keyword in resume_set}
+    unmatched = [keyword for keyword in jd_keywords if keyword not in exact_matches]
+    if threshold is None or not unmatched or not resume_set or not get_sentence_model():
+        return exact_matches
+    import numpy as np
+    resume_list = sorted(resume_set)
+    try:
+        embeddings = encode_texts(resume_list + unmatched).astype(np.float32)
+    except Exception as e:
+        print(f"[WARN] Keyword embedding failed; falling back to exact matching. {e}")
+        return exact_matches
+    norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+    embeddings /= np.where(norms == 0, 1.0, norms)
+    similarities = embeddings[len(resume_list):] @ embeddings[:len(resume_list)].T
+    fuzzy_matches = np.asarray(unmatched)[similarities.max(axis=1) >= threshold]
+    return exact_matches.union(fuzzy_matches.tolist())
 
 """
     Calculates a weighted score based on keyword matches.
     'Required' keywords are weighted more heavily than 'preferred' keywords.
+
+    match_threshold: Cosine similarity at which keyphrases are treated as the same skill
+                     (e.g. 0.75). None matches exact strings only.
 """
-def score_resume(resume_keywords: list[str], required_keywords: list[str], preferred_keywords: list[str]) -> dict:
+def score_resume(resume_keywords: list[str], required_keywords: list[str], preferred_keywords: list[str],
+                 match_threshold: float | None = None) -> dict:
 
     resume_set = set(resume_keywords)
     required_set = set(required_keywords)
     preferred_set = set(preferred_keywords)
 
     jd_set = required_set.union(preferred_set)
-    matched_skills = list(resume_set.intersection(jd_set))
-    missing_skills = list(jd_set.difference(resume_set))
+    with span("score_resume", resume_keywords=len(resume_set), jd_keywords=len(jd_set)) as stage:
+        matched_jd_set = _match_jd_keywords(list(resume_set), sorted(jd_set), match_threshold)
+        stage.set(matched=len(matched_jd_set))
+    matched_skills = list(matched_jd_set)
+    missing_skills = list(jd_set.difference(matched_jd_set))
 
     score = 0
     total_weight = 0
@@ -273,13 +612,13 @@ def score_resume(resume_keywords: list[str], required_keywords: list[str], prefe
     # Calculate score for required keywords (weight of 2)
     for keyword in required_set:
         total_weight += 2
-        if keyword in resume_set:
+        if keyword in matched_jd_set:
             score += 2
 
     # Calculate score for preferred keywords (weight of 1)
     for keyword in preferred_set:
         total_weight += 1
-        if keyword in resume_set:
+        if keyword in matched_jd_set:
             score += 1
 
     final_score = score / total_weight if total_weight > 0 else 0
@@ -289,45 +628,202 @@ def score_resume(resume_keywords: list[str], required_keywords: list[str], prefe
         "missing_keywords": missing_skills
     }
 
-# Orchestrates the full resume analysis pipeline.
-def run_full_analysis(resume_pdf_path: str, job_description_text: str) -> dict:
-    resume_text = extract_text_from_pdf(resume_pdf_path)
-    if not resume_text: return {"error": "Could not extract text from the resume PDF."}
-    
-    # Parses the job description into sections
-    jd_sections = parse_job_description(job_description_text)
-    required_keywords = extract_keywords(jd_sections['required'])
-    preferred_keywords = extract_keywords(jd_sections['preferred'])
-    
-    all_jd_keywords = list(set(required_keywords + preferred_keywords))
+"""
+    Loads the JD-independent analysis of a resume PDF: extracted text and its ParsedResume,
+    CodePath format feedback, and embeddings of the whole resume and of each section (one
+    batched encode). Results are cached by the SHA-256 of the PDF bytes, so a resume
+    re-submitted against a different JD only pays for the JD-dependent work.
+
+    resume_pdf: A path, bytes or binary file-like object.
 
-    # Will use all JD keywords to guide resume keyword extraction
-    resume_keywords = extract_keywords(resume_text, seed_keywords=all_jd_keywords)
+    ret: dict | None: {"sha256", "text", "parsed", "format_feedback", "embedding", "sections",
+                       "section_embeddings", "chunk_embeddings"}, or None if no text could be extracted.
+                       chunk_embeddings is None unless SIMILARITY_POOLING is on.
+"""
+def load_resume(resume_pdf) -> dict | None:
+    try:
+        pdf_bytes = read_pdf_bytes(resume_pdf, max_bytes=MAX_PDF_BYTES)
+    except FileNotFoundError:
+        print(f"Error: The file at {resume_pdf} was not found.")
+        return None
+    except PdfLimitError as e:
+        print(f"Error: {e}")
+        return None
+
+    with span("load_resume", bytes=len(pdf_bytes)) as stage:
+        resume_cache = get_resume_cache()
+        pdf_hash = hashlib.sha256(pdf_bytes).hexdigest()
+        resume = resume_cache.get(pdf_hash)
+        stage.set(cache_hit=resume is not None)
+        if resume is not None: return resume
+
+        resume_text = extract_text_from_pdf(pdf_bytes)
+        if not resume_text: return None
+        with span("parse_resume", chars=len(resume_text)) as parse_stage:
+            parsed = ParsedResume(resume_text)
+            sections = parsed.section_texts()
+            parse_stage.set(sections=len(sections), bullets=len(parsed.bullet_texts))
+        texts = [resume_text] + [text for _, text in sections]
+        chunks = chunk_text(resume_text) if SIMILARITY_POOLING != "off" else []
+        embeddings = encode_texts(texts + chunks) if get_sentence_model() else None
+        resume = {
+            "sha256": pdf_hash,
+            "text": resume_text,
+            "parsed": parsed,
+            "format_feedback": check_codepath_student_resume_format(parsed),
+            "embedding": embeddings[0] if embeddings is not None else None,
+            "sections": [heading for heading, _ in sections],
+            "section_embeddings": embeddings[1:len(texts)] if embeddings is not None else None,
+            "chunk_embeddings": embeddings[len(texts):] if embeddings is not None and chunks else None
+        }
+        resume_cache.put(pdf_hash, resume)
+        return resume
+
+# Runs every CPU/model-bound stage of the analysis: everything except the LLM suggestions.
+# Returns the partial result together with the parsed resume the suggestions need.
+def run_model_analysis(resume_pdf, job_description_text: str) -> tuple[dict, ParsedResume | None]:
+    with span("model_analysis", jd_chars=len(job_description_text)):
+        resume = load_resume(resume_pdf)
+        if not resume: return {"error": "Could not extract text from the resume PDF."}, None
+        resume_text = resume["text"]
     
-    # Scores based on the new weighted logic
-    scoring_result = score_resume(resume_keywords, required_keywords, preferred_keywords)
+        # Parses the job description into sections
+        with span("jd_keywords", chars=len(job_description_text)) as stage:
+            jd_sections = parse_job_description(job_description_text)
+            required_keywords = extract_keywords(jd_sections['required'])
+            preferred_keywords = extract_keywords(jd_sections['preferred'])
+            stage.set(required=len(required_keywords), preferred=len(preferred_keywords))
     
-    semantic_score = get_semantic_similarity(resume_text, job_description_text)
-    format_feedback = check_codepath_student_resume_format(resume_text)
+        all_jd_keywords = list(set(required_keywords + preferred_keywords))
+
+        # Will use all JD keywords to guide resume keyword extraction
+        resume_keywords = extract_keywords(resume_text, seed_keywords=all_jd_keywords, doc_embedding=resume["embedding"])
     
-    suggestions = generate_improvement_suggestions(
-        resume_text, job_description_text,
-        scoring_result["matched_keywords"], scoring_result["missing_keywords"], format_feedback
-    )
+        # Scores based on the new weighted logic
+        scoring_result = score_resume(resume_keywords, required_keywords, preferred_keywords, KEYWORD_MATCH_THRESHOLD)
     
-    return {
-        "weighted_score": scoring_result["weighted_score"],
-        "semantic_score": semantic_score,
-        "codepath_format_feedback": format_feedback,
-        "matched_keywords": scoring_result["matched_keywords"],
-        "missing_keywords": scoring_result["missing_keywords"],
-        "suggestions": suggestions
-    }
+        semantic_score = 0.0
+        section_scores = []
+        if resume["embedding"] is not None:
+            with span("semantic_similarity", sections=len(resume["sections"]), pooling=SIMILARITY_POOLING):
+                jd_chunks = chunk_text(job_description_text) if resume["chunk_embeddings"] is not None else []
+                jd_embeddings = encode_texts([job_description_text] + jd_chunks)
+                jd_embedding = jd_embeddings[0]
+                if jd_chunks:
+                    semantic_score = get_chunk_similarity(resume["chunk_embeddings"], jd_embeddings[1:])
+                else:
+                    semantic_score = get_embedding_similarity(resume["embedding"], jd_embedding)
+                section_scores = get_section_similarities(resume["sections"], resume["section_embeddings"], jd_embedding)
+        format_feedback = resume["format_feedback"]
+
+        return {
+            "weighted_score": scoring_result["weighted_score"],
+            "semantic_score": semantic_score,
+            "section_scores": section_scores,
+            "codepath_format_feedback": format_feedback,
+            "matched_keywords": scoring_result["matched_keywords"],
+            "missing_keywords": scoring_result["missing_keywords"]
+        }, resume["parsed"]
+
+# Orchestrates the full resume analysis pipeline.
+# Each stage is reported as an instrumentation span under "analysis" (see instrumentation.py).
+def run_full_analysis(resume_pdf, job_description_text: str, llm_client=None) -> dict:
+    with span("analysis"):
+        results, parsed_resume = run_model_analysis(resume_pdf, job_description_text)
+        if "error" in results: return results
+
+        results["suggestions"] = generate_improvement_suggestions(
+            parsed_resume, job_description_text,
+            results["matched_keywords"], results["missing_keywords"], results["codepath_format_feedback"],
+            results["weighted_score"], results["semantic_score"], llm_client=llm_client
+        )
+        return results
+
+"""
+    Async variant of run_full_analysis for servers that keep many analyses in flight.
+    PDF extraction and model inference run in executor (the loop's default thread pool when None),
+    so the event loop stays free while the LLM call is awaited with a timeout and bounded concurrency.
+"""
+async def run_full_analysis_async(resume_pdf, job_description_text: str, llm_client=None, executor=None,
+                                  llm_timeout: float = LLM_TIMEOUT_SECONDS) -> dict:
+    loop = asyncio.get_running_loop()
+    with span("analysis"):
+        results, parsed_resume = await loop.run_in_executor(executor, run_model_analysis, resume_pdf, job_description_text)
+        if "error" in results: return results
+
+        results["suggestions"] = await generate_improvement_suggestions_async(
+            parsed_resume, job_description_text,
+            results["matched_keywords"], results["missing_keywords"], results["codepath_format_feedback"],
+            results["weighted_score"], results["semantic_score"], llm_client=llm_client, timeout=llm_timeout
+        )
+        return results
+
+"""
+    Scores every resume against every job description in one call.
+    Each resume and JD is extracted, keyword-mined and encoded exactly once, so the
+    number of model invocations grows with N + M instead of N * M. Resume keywords are
+    seeded with the keywords of all JDs in the batch. AI suggestions are not generated,
+    since they would need one paid API call per pair.
+
+    resumes (list[str]): Paths to resume PDFs.
+    job_descriptions (list[str] | dict[str, str]): JD texts, optionally keyed by a job id.
+                                                   A plain list is keyed by position.
+
+    ret: list[dict]: One row per (resume, job) pair, ranked by weighted then semantic score.
+"""
+def run_batch_analysis(resumes: list[str], job_descriptions: list[str] | dict[str, str]) -> list[dict]:
+    if not isinstance(job_descriptions, dict):
+        job_descriptions = dict(enumerate(job_descriptions))
+    job_ids = list(job_descriptions)
+    jd_texts = [job_descriptions[job_id] for job_id in job_ids]
+
+    resume_paths, resume_texts, format_feedback = [], [], []
+    for resume_pdf_path in dict.fromkeys(resumes):
+        resume = load_resume(resume_pdf_path)
+        if not resume:
+            print(f"[WARN] Could not extract text from {resume_pdf_path}; skipping it.")
+            continue
+        resume_paths.append(resume_pdf_path)
+        resume_texts.append(resume["text"])
+        format_feedback.append(resume["format_feedback"])
+    if not resume_texts or not jd_texts: return []
+
+    # JD side: parse and mine keywords once per job description
+    jd_sections = [parse_job_description(jd_text) for jd_text in jd_texts]
+    required_keywords = extract_keywords_batch([sections['required'] for sections in jd_sections])
+    preferred_keywords = extract_keywords_batch([sections['preferred'] for sections in jd_sections])
+    all_jd_keywords = sorted({keyword for keywords in required_keywords + preferred_keywords for keyword in keywords})
+
+    # Resume side: keywords and embeddings once per resume (format checks come from load_resume)
+    resume_keywords = extract_keywords_batch(resume_texts, seed_keywords=all_jd_keywords)
+    semantic_scores = get_semantic_similarity_matrix(resume_texts, jd_texts)
+
+    results = []
+    for i, resume_pdf_path in enumerate(resume_paths):
+        for j, job_id in enumerate(job_ids):
+            scoring_result = score_resume(
+                resume_keywords[i], required_keywords[j], preferred_keywords[j], KEYWORD_MATCH_THRESHOLD
+            )
+            results.append({
+                "resume": resume_pdf_path,
+                "job_id": job_id,
+                "weighted_score": scoring_result["weighted_score"],
+                "semantic_score": semantic_scores[i][j],
+                "codepath_format_feedback": format_feedback[i],
+                "matched_keywords": scoring_result["matched_keywords"],
+                "missing_keywords": scoring_result["missing_keywords"]
+            })
+
+    results.sort(key=lambda row: (row["weighted_score"], row["semantic_score"]), reverse=True)
+    for rank, row in enumerate(results, start=1):
+        row["rank"] = rank
+    return results
 
 # --- NOTE: Below is example usage for self testing purposes ---
 if __name__ == '__main__':
     if not os.path.exists('data'): os.makedirs('data')
     try:
+        import PyPDF2
         writer = PyPDF2.PdfWriter()
         writer.add_blank_page(width=300, height=500)
         with open("data/sample_resume.pdf", "wb") as f: writer.write(f)
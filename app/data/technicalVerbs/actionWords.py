@@ -1,5 +1,11 @@
-import pandas as pd
-from typing import list, dict
+import json
+import os
+import re
+import sys
+
+# The lexicon format is defined by the runtime loader, app/actionVerbs.py
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+from actionVerbs import LEXICON_PATH, LEXICON_VERSION
 
 # Recreate the original list after code execution reset
 technical_verbs: list[str] = [
@@ -52,11 +58,11 @@ organizational_verbs: str = """
 Acquired,Appointed,Authorized,Collected,Customized,Facilitated,Issued,Ordered,Retrieved,Simplified,
 Activated,Arranged,Catalogued,Committed,Delegated,Housed,Linked,Organized,Routed,Sought,Adjusted,
 Assembled,Centralized,Confirmed,Designated,Implemented,Logged,Procured,Scheduled,Straightened,Allocated,
-Assessed,Charted,Contracted,Designed,Incorporated,Mapped,out,Programmed,Secured,Suggested,Altered,Assigned,
+Assessed,Charted,Contracted,Designed,Incorporated,Mapped out,Programmed,Secured,Suggested,Altered,Assigned,
 Classified,Coordinated,Established,Instituted,Obtained,Recruited,Selected,Tracked"""
 
 executing_verbs: str = """Acted,Collected,Displayed,Exercised,Input,Merchandised,Produced,Proved,Sold,Administered,
-Completed,Distributed,Forwarded,Installed,Operated,Proofed,Performed,Stocked,Carried,out,Conducted,Entered,Handled,
+Completed,Distributed,Forwarded,Installed,Operated,Proofed,Performed,Stocked,Carried out,Conducted,Entered,Handled,
 Labored,Processed,Prospected,Shipped,Transacted"""
 
 supervising_verbs: str = """Adjusted,Certified,Correlated,Examined,Indexed,Measured,Overhauled,Refined,Screened,Supplied,
@@ -66,7 +72,7 @@ Prohibited,Revised,Supervised,Updated"""
 
 leading_verbs: str = """Accelerated,Changed,Elected,Encouraged,Founded,Inspired,Mentored,Promoted,Spearheaded,Assumed,Conducted,
 Employed,Enlisted,Guided,Involved,Motivated,Raised,Stimulated,Caused,Directed,Hired,Envisioned,Influenced,Led,Originated,
-Recognized,for,Strengthened,Chaired,Disproved,Empowered,Fostered,Initiated,Managed,Pioneered,Set,goals,Supervised"""
+Recognized for,Strengthened,Chaired,Disproved,Empowered,Fostered,Initiated,Managed,Pioneered,Set goals,Supervised"""
 
 getting_results_verbs: str = """Accomplished,Boosted,Contributed,Eliminated,Expanded,Generated,Increased,Launched,Orchestrated,
 Received,Achieved,Built,Delivered,Enlarged,Expedited,Grew,Innovated,Lightened,Overcame,Reduced,Added,Combined,Demonstrated,
@@ -78,13 +84,13 @@ problem_solving_verbs: str = """Alleviated,Collaborated,Created,Detected,Foresaw
 Conceived,Debugged,Determined,Formulated,Recommended,Resolved,Satisfied,Theorized,Applied,Conceptualized,Decided,Diagnosed,Found,Remedied,Revamped,
 Solved,Brainstormed,Crafted,Deciphered,Engineered,Gathered,Remodeled,Revitalized,Streamlined"""
 
-quantitative_verbs: str = """Accounted,for,Balanced,Compiled,Converted,Earned,Financed,Maximized,Projected,Reconciled,Totaled,Appraised,Budgeted,
+quantitative_verbs: str = """Accounted for,Balanced,Compiled,Converted,Earned,Financed,Maximized,Projected,Reconciled,Totaled,Appraised,Budgeted,
 Compounded,Counted,Enumerated,Grossed,Multiplied,Purchased,Recorded,Approximated,Calculated,Computed,Dispensed,Estimated,Increased,Netted,Quantified,
 Reduced,Audited,Checked,Conserved,Dispersed,Figured,Inventoried,Profited,Rated,Tabulated"""
 
 communicating_verbs: str = """Acted,Attested,Convinced,Dramatized,Highlighted,Justified,Publicized,Revealed,Submitted,Tested,Adapted,Briefed,Consulted,Edited,
 Illustrated,Lectured,Queried,Sanctioned,Substantiated,Taught,Admitted,Clarified,Corresponded,Educated,Improvised,Marketed,Questioned,Settled,Suggested,
-Translated,Addressed,Cleared,Up,Critiqued,Elicited,Indicated,Mediated,Referred,Shaped,Summarized,Transmitted,Allowed,Closed,Dedicated,Explained,Inferred,
+Translated,Addressed,Cleared up,Critiqued,Elicited,Indicated,Mediated,Referred,Shaped,Summarized,Transmitted,Allowed,Closed,Dedicated,Explained,Inferred,
 Moderated,Reinforced,Smoothed,Supplemented,Verified,Amended,Communicated,Defined,Extracted,Informed,Negotiated,Related,Specified,Supported,Welcomed,Arbitrated,
 Composed,Deliberated,Fabricated,Instructed,Perceived,Rendered,Spoke,Surveyed,Wrote,Argued,Consented,Demonstrated,Fashioned,Interpreted,Persuaded,Reported,Sold,
 Synthesized,Ascertained,Concluded,Drafted,Greeted,Interviewed,Presented,Represented,Solicited,Systematized"""
@@ -111,17 +117,83 @@ verbs_data : dict[str, list[str]]= {
     "helping_verbs": process_verbs_string(helping_verbs)
 }
 
-unique_verbs = set()
-# Process and combine lists of action verbs
-for verb_dataset in verbs_data:
-    unique_verbs.add(verb_dataset)
-combined_verbs = sorted(unique_verbs)
+# --- Compiled lexicon ---
+# `python actionWords.py` compiles the lists above into actionVerbLexicon.json, which app/actionVerbs.py
+# loads at runtime. Bump LEXICON_VERSION there whenever the file layout changes.
+VERB_CATEGORIES: list[str] = list(verbs_data)
+
+# Past tenses that the suffix rules in lemmatize_verb get wrong
+IRREGULAR_LEMMAS: dict[str, str] = {
+    "built": "build", "rebuilt": "rebuild", "led": "lead", "grew": "grow", "spoke": "speak", "wrote": "write",
+    "sold": "sell", "found": "find", "overcame": "overcome", "oversaw": "oversee", "foresaw": "foresee",
+    "troubleshot": "troubleshoot", "sought": "seek", "taught": "teach", "dealt": "deal", "set": "set",
+    "input": "input", "laid": "lay", "added": "add", "created": "create", "persuaded": "persuade",
+    "expedited": "expedite", "routed": "route", "rerouted": "reroute", "cached": "cache", "cloned": "clone",
+    "honed": "hone", "scoped": "scope", "scaled": "scale", "rescaled": "rescale", "explored": "explore", "restored": "restore", "stored": "store", "ignored": "ignore",
+    "scored": "score", "completed": "complete", "deleted": "delete", "competed": "compete", "noted": "note",
+    "promoted": "promote", "invited": "invite", "united": "unite", "focused": "focus", "biased": "bias",
+    "synced": "sync", "controlled": "control", "patrolled": "patrol", "excelled": "excel", "compelled": "compel",
+    "propelled": "propel", "labelled": "label", "modelled": "model", "cancelled": "cancel", "travelled": "travel"
+}
+# Stem endings (after removing "ed") that take back a silent "e": solved -> solve, reduced -> reduce
+_SILENT_E_RE = re.compile(
+    r'([vcz]|[^aeiou](at|in|un|am|um|im|om|ur|ut|ud|od|ad|ed|ar|ak|ik|ok|uk|il|ul|ap|ip|yp|up|ib|ob|ub)|[^a]ir'
+    r'|[^ao]id|[iu]at|is|iz|ys|yz|us|os|as|ns|rs|ps|ls|ag|rg|dg|lg|ang|eng|ung|[^aeiouwrl]l|u|e)$'
+)
+
+# Returns the base form of a past-tense verb ("optimized" -> "optimize", "mapped" -> "map").
+def lemmatize_verb(verb: str) -> str:
+    if verb in IRREGULAR_LEMMAS: return IRREGULAR_LEMMAS[verb]
+    if not verb.endswith("ed") or len(verb) < 5: return verb
+    if verb.endswith("ied"): return verb[:-3] + "y"
+    stem = verb[:-2]
+    if re.search(r'(bb|dd|gg|mm|nn|pp|rr|tt)$', stem): return stem[:-1]
+    if _SILENT_E_RE.search(stem): return stem + "e"
+    return stem
+
+# Lemmatizes the verb inside a phrase: the first word, or part of a hyphenated word, that has a
+# base form ("mapped out" -> "map out", "fine-tuned" -> "fine-tune", "road mapped" -> "road map").
+def lemmatize_phrase(phrase: str) -> str:
+    words = [word.split("-") for word in phrase.split(" ")]
+    for parts in words:
+        for i, part in enumerate(parts):
+            lemma = lemmatize_verb(part)
+            if lemma != part:
+                parts[i] = lemma
+                return " ".join("-".join(parts) for parts in words)
+    return phrase
+
+# Lower-cases a verb and replaces the non-breaking hyphens (U+2011) copied from the source pages.
+def normalize_verb(verb: str) -> str:
+    return " ".join(verb.replace("\u2011", "-").lower().split())
+
+"""
+    Compiles verbs_data into the lexicon: every verb and its lemma map to a bitmask of the
+    categories it appears in (bit i is VERB_CATEGORIES[i]). "listed" holds the verbs as the
+    lists spell them (past tense), without the lemmas.
 
-# Create DataFrame and save
-df_combined = pd.DataFrame({verbs_data})
-df_combined["power_verbs"] = combined_verbs
-file_path = "data/combined_technical_verbs.csv"
-df_combined.to_csv(file_path, index=False)
+    ret: dict: {"version", "categories", "verbs": {verb: bitmask}, "lemmas": {verb: lemma}, "listed": [verb]}
+"""
+def build_lexicon() -> dict:
+    verbs: dict[str, int] = {}
+    lemmas: dict[str, str] = {}
+    listed: set[str] = set()
+    for bit, category in enumerate(VERB_CATEGORIES):
+        for verb in verbs_data[category]:
+            verb = normalize_verb(verb)
+            listed.add(verb)
+            # "Built-in" is an adjective, so it has no base form
+            lemma = verb if verb == "built-in" else lemmatize_phrase(verb)
+            for form in (verb, lemma):
+                verbs[form] = verbs.get(form, 0) | (1 << bit)
+            if lemma != verb: lemmas[verb] = lemma
+    return {
+        "version": LEXICON_VERSION,
+        "categories": VERB_CATEGORIES,
+        "verbs": dict(sorted(verbs.items())),
+        "lemmas": dict(sorted(lemmas.items())),
+        "listed": sorted(listed)
+    }
 
 """
     Note to future self: how could we make use of the fact that the data from Iowa was categorized? 
@@ -129,4 +201,9 @@ df_combined.to_csv(file_path, index=False)
     like using more leadership active verb recommendations when reviewing someones leaderships sections 
     or when a leadership synonym is found?
 """
-file_path
+
+if __name__ == "__main__":
+    lexicon = build_lexicon()
+    with open(LEXICON_PATH, "w") as f:
+        json.dump(lexicon, f, indent=0, separators=(",", ":"))
+    print(f"[INFO] Wrote {len(lexicon['verbs'])} verb forms in {len(VERB_CATEGORIES)} categories to {LEXICON_PATH}")
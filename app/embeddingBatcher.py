@@ -0,0 +1,139 @@
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+
+import numpy as np
+from instrumentation import span
+
+"""
+    Dynamic micro-batching in front of the sentence encoder.
+
+    Concurrent callers each submit a few texts; a single background thread collects pending
+    texts for up to max_latency_ms (or until max_batch_size texts are waiting), encodes them in
+    one forward pass, and resolves every caller's future with its own rows. Large requests are
+    split into max_batch_size segments, so one long document list cannot hold up short requests
+    for more than a batch. Encoding runs on one thread, which also serializes access to the model.
+"""
+class MicroBatcher:
+    def __init__(self, encode_fn, max_batch_size: int = 64, max_latency_ms: float = 5.0):
+        self.encode_fn = encode_fn
+        self.max_batch_size = max_batch_size
+        self.max_latency_ms = max_latency_ms
+        self.requests = 0
+        self.batches = 0
+        self.items = 0
+        self._condition = threading.Condition()
+        # (request, segment index, texts, enqueued at) in arrival order
+        self._pending = deque()
+        self._pending_items = 0
+        self._thread = None
+        self._closed = False
+
+    # Queues texts for encoding. The future resolves to an array with one row per text.
+    def submit(self, texts: list[str]) -> Future:
+        future = Future()
+        if not texts:
+            future.set_result(np.zeros((0, 0), dtype=np.float32))
+            return future
+        segments = [texts[start:start + self.max_batch_size] for start in range(0, len(texts), self.max_batch_size)]
+        request = _BatchRequest(future, len(segments))
+        now = time.monotonic()
+        with self._condition:
+            if self._closed: raise RuntimeError("MicroBatcher is closed.")
+            self.requests += 1
+            for index, segment in enumerate(segments):
+                self._pending.append((request, index, segment, now))
+            self._pending_items += len(texts)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="embedding-batcher", daemon=True)
+                self._thread.start()
+            self._condition.notify()
+        return future
+
+    def encode(self, texts: list[str]) -> np.ndarray:
+        return self.submit(list(texts)).result()
+
+    def _run(self):
+        max_latency = self.max_latency_ms / 1000
+        while True:
+            with self._condition:
+                while not self._pending and not self._closed:
+                    self._condition.wait()
+                if not self._pending: return
+                # Hold the batch open until it is full or its oldest text has waited max_latency
+                deadline = self._pending[0][3] + max_latency
+                while self._pending_items < self.max_batch_size and not self._closed:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0: break
+                    self._condition.wait(remaining)
+                batch, size = [], 0
+                while self._pending and size + len(self._pending[0][2]) <= self.max_batch_size:
+                    segment = self._pending.popleft()
+                    batch.append(segment)
+                    size += len(segment[2])
+                self._pending_items -= size
+                self.batches += 1
+                self.items += size
+            self._encode_batch(batch)
+
+    def _encode_batch(self, batch: list):
+        texts = [text for _, _, segment, _ in batch for text in segment]
+        try:
+            with span("model_batch", batch_size=len(texts), requests=len(batch),
+                      queued_ms=(time.monotonic() - batch[0][3]) * 1000):
+                embeddings = np.asarray(self.encode_fn(texts))
+        except Exception as e:
+            for request, _, _, _ in batch:
+                if not request.future.done(): request.future.set_exception(e)
+            return
+        offset = 0
+        for request, index, texts, _ in batch:
+            request.parts[index] = embeddings[offset:offset + len(texts)]
+            offset += len(texts)
+            request.remaining -= 1
+            if request.remaining == 0 and not request.future.done():
+                request.future.set_result(np.concatenate(request.parts))
+
+    # Batch counters; fill_rate is the average share of max_batch_size used per forward pass.
+    def stats(self) -> dict:
+        with self._condition:
+            return {
+                "requests": self.requests,
+                "batches": self.batches,
+                "items": self.items,
+                "mean_batch_size": round(self.items / self.batches, 2) if self.batches else 0.0,
+                "fill_rate": round(self.items / (self.batches * self.max_batch_size), 4) if self.batches else 0.0,
+                "pending": self._pending_items,
+                "max_batch_size": self.max_batch_size,
+                "max_latency_ms": self.max_latency_ms
+            }
+
+    # Encodes whatever is still queued, then stops the background thread.
+    def close(self):
+        with self._condition:
+            self._closed = True
+            self._condition.notify()
+        if self._thread is not None:
+            self._thread.join()
+
+
+class _BatchRequest:
+    __slots__ = ('future', 'parts', 'remaining')
+
+    def __init__(self, future: Future, num_segments: int):
+        self.future = future
+        self.parts = [None] * num_segments
+        self.remaining = num_segments
+
+
+# Wraps an encode function as a KeyBERT embedding backend, so KeyBERT's document and
+# candidate-phrase embeddings go through the same batcher as every other encode.
+def make_keybert_backend(embed_fn):
+    from keybert.backend import BaseEmbedder
+
+    class _BatchedEmbedder(BaseEmbedder):
+        def embed(self, documents: list[str], verbose: bool = False) -> np.ndarray:
+            return embed_fn(list(documents))
+
+    return _BatchedEmbedder()
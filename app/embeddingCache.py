@@ -0,0 +1,171 @@
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+"""
+    Persistent, content-addressed store for sentence embeddings.
+
+    Embeddings live in a memory-mapped NumPy file with a fixed number of slots,
+    and a small JSON index maps each key to its slot in least-recently-used order.
+    When every slot is taken, the least recently used entry is evicted.
+    The index is written every flush_every puts and by flush() (registered at exit), not on every
+    put. Each slot also records a digest of the key it holds, so an index left stale by a crash
+    cannot serve a slot that has since been reused for another key.
+    The cache is meant to be owned by a single process; give each process its own directory.
+"""
+class EmbeddingCache:
+    INDEX_FILE = "index.json"
+    STORE_FILE = "embeddings.npy"
+    KEYS_FILE = "keys.npy"
+
+    def __init__(self, cache_dir: str, max_entries: int = 10000, flush_every: int = 256):
+        self.cache_dir = cache_dir
+        self.max_entries = max_entries
+        self.flush_every = flush_every
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        # key -> slot, ordered from least to most recently used
+        self._index: OrderedDict[str, int] = OrderedDict()
+        # Unused slots, taken from the end
+        self._free_slots = list(range(max_entries - 1, -1, -1))
+        self._store = None
+        # Digest of the key held by each slot
+        self._slot_keys = None
+        self._dim = None
+        # Puts since the index was last written
+        self._unflushed = 0
+        os.makedirs(cache_dir, exist_ok=True)
+        self._load()
+
+    # Builds the cache key for a text embedded by a given model. Whitespace is normalized
+    # so that re-extracting the same PDF maps to the same entry.
+    @staticmethod
+    def make_key(model_name: str, text: str) -> str:
+        normalized = " ".join(text.split())
+        return hashlib.sha256(f"{model_name}\0{normalized}".encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def _digest(key: str) -> int:
+        return int(key[:16], 16)
+
+    # Returns the cached embedding for each key, or None where the key is not cached.
+    def get_many(self, keys: list[str]) -> list[np.ndarray | None]:
+        results = []
+        with self._lock:
+            for key in keys:
+                slot = self._index.get(key)
+                if slot is None:
+                    self.misses += 1
+                    results.append(None)
+                    continue
+                self.hits += 1
+                self._index.move_to_end(key)
+                # Copy out of the memory map, since the slot may be reused after an eviction
+                results.append(np.array(self._store[slot]))
+        return results
+
+    # Stores one embedding per key, evicting least recently used entries when full.
+    def put_many(self, keys: list[str], embeddings: np.ndarray):
+        embeddings = np.asarray(embeddings, dtype=np.float32)
+        if not len(keys): return
+        with self._lock:
+            if self._store is None:
+                self._create_store(embeddings.shape[1])
+            elif embeddings.shape[1] != self._dim:
+                print(f"[WARN] Embedding size changed from {self._dim} to {embeddings.shape[1]}; clearing the embedding cache.")
+                self._index.clear()
+                self._create_store(embeddings.shape[1])
+
+            for key, embedding in zip(keys, embeddings):
+                if key in self._index:
+                    slot = self._index[key]
+                    self._index.move_to_end(key)
+                elif self._free_slots:
+                    slot = self._free_slots.pop()
+                    self._index[key] = slot
+                else:
+                    _, slot = self._index.popitem(last=False)
+                    self.evictions += 1
+                    self._index[key] = slot
+                self._store[slot] = embedding
+                self._slot_keys[slot] = self._digest(key)
+            self._unflushed += len(keys)
+            if self._unflushed >= self.flush_every:
+                self._flush_locked()
+
+    # Writes the index and any pending embedding writes to disk.
+    def flush(self):
+        with self._lock:
+            self._flush_locked()
+
+    # Returns hit/miss counters and current occupancy.
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "entries": len(self._index),
+                "max_entries": self.max_entries
+            }
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def _create_store(self, dim: int):
+        self._dim = dim
+        self._store = np.lib.format.open_memmap(
+            os.path.join(self.cache_dir, self.STORE_FILE), mode="w+",
+            dtype=np.float32, shape=(self.max_entries, dim)
+        )
+        self._slot_keys = np.lib.format.open_memmap(
+            os.path.join(self.cache_dir, self.KEYS_FILE), mode="w+", dtype=np.uint64, shape=(self.max_entries,)
+        )
+        self._free_slots = list(range(self.max_entries - 1, -1, -1))
+
+    def _flush_locked(self):
+        if self._store is None: return
+        self._unflushed = 0
+        self._store.flush()
+        self._slot_keys.flush()
+        index_path = os.path.join(self.cache_dir, self.INDEX_FILE)
+        tmp_path = index_path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump({"dim": self._dim, "max_entries": self.max_entries, "entries": list(self._index.items())}, f)
+        os.replace(tmp_path, index_path)
+
+    # Reopens an existing cache directory, discarding it if it is unreadable or was sized differently.
+    def _load(self):
+        index_path = os.path.join(self.cache_dir, self.INDEX_FILE)
+        store_path = os.path.join(self.cache_dir, self.STORE_FILE)
+        keys_path = os.path.join(self.cache_dir, self.KEYS_FILE)
+        if not all(os.path.exists(path) for path in (index_path, store_path, keys_path)): return
+        try:
+            with open(index_path, "r") as f:
+                index = json.load(f)
+            store = np.load(store_path, mmap_mode="r+")
+            slot_keys = np.load(keys_path, mmap_mode="r+")
+        except (OSError, ValueError) as e:
+            print(f"[WARN] Could not read the embedding cache at {self.cache_dir}; starting empty. {e}")
+            return
+        if (index.get("max_entries") != self.max_entries or store.shape != (self.max_entries, index.get("dim"))
+                or slot_keys.shape != (self.max_entries,)):
+            print(f"[WARN] Embedding cache at {self.cache_dir} was built with different limits; starting empty.")
+            return
+        self._dim = index["dim"]
+        self._store = store
+        self._slot_keys = slot_keys
+        # Entries whose slot was reused after the index was last written are dropped
+        self._index = OrderedDict(
+            (key, slot) for key, slot in index["entries"] if int(slot_keys[slot]) == self._digest(key)
+        )
+        used_slots = set(self._index.values())
+        self._free_slots = [slot for slot in range(self.max_entries - 1, -1, -1) if slot not in used_slots]
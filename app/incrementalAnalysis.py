@@ -0,0 +1,187 @@
+from analyzer import (
+    KEYWORD_MATCH_THRESHOLD, KEYWORDS_PER_TEXT, SIMILARITY_POOLING, check_codepath_student_resume_format, chunk_text,
+    encode_texts, extract_keywords, extract_scored_keywords, generate_improvement_suggestions, get_chunk_similarity,
+    get_embedding_similarity, get_section_similarities, parse_job_description, score_resume
+)
+from instrumentation import span
+from modelRegistry import get_sentence_model
+from parsedResume import ParsedResume
+from pdfExtraction import extract_text_from_pdf
+
+"""
+    Incremental re-analysis for edit loops, where a user changes a bullet and analyzes again.
+
+    An IncrementalAnalyzer keeps the previous resume's per-section work in memory: each
+    section's embedding, its chunk embeddings (when SIMILARITY_POOLING is on) and its KeyBERT
+    keywords for the current job description. A new version is diffed against the previous one
+    section by section, only new or edited sections are encoded (in one batch) and keyword-mined,
+    and the cached result is patched with the re-scored values. The format checks are
+    document-level rules over a single pass of the text, so they re-run in full.
+
+    Keywords are mined per section and the best KEYWORDS_PER_TEXT by KeyBERT score are kept,
+    and pooled similarity chunks each section separately so an edit cannot shift the windows
+    of other sections. Scores can therefore differ slightly from run_full_analysis, which mines
+    and chunks the whole text at once.
+
+    An IncrementalAnalyzer holds one editing session and is not thread-safe.
+"""
+
+
+class _SectionState:
+    __slots__ = ('embedding', 'chunk_embeddings', 'keywords')
+
+    def __init__(self, embedding, chunk_embeddings):
+        self.embedding = embedding
+        self.chunk_embeddings = chunk_embeddings
+        # (keyword, score) pairs seeded with the current JD's keywords; None until extracted
+        self.keywords = None
+
+
+class _JobState:
+    __slots__ = ('text', 'required_keywords', 'preferred_keywords', 'embedding', 'chunk_embeddings')
+
+    def __init__(self, text: str):
+        self.text = text
+        jd_sections = parse_job_description(text)
+        self.required_keywords = extract_keywords(jd_sections['required'])
+        self.preferred_keywords = extract_keywords(jd_sections['preferred'])
+        chunks = chunk_text(text) if SIMILARITY_POOLING != "off" else []
+        embeddings = encode_texts([text] + chunks) if get_sentence_model() else None
+        self.embedding = embeddings[0] if embeddings is not None else None
+        self.chunk_embeddings = embeddings[1:] if embeddings is not None and chunks else None
+
+
+class IncrementalAnalyzer:
+    def __init__(self, llm_client=None):
+        self.llm_client = llm_client
+        self.parsed = None
+        self.result = None
+        self._job = None
+        # Section text -> _SectionState, for the sections of the current version
+        self._sections = {}
+        self._section_list = []
+        self._resume_embedding = None
+
+    # Extracts the PDF's text and analyzes it with analyze().
+    def analyze_pdf(self, resume_pdf, job_description_text: str, suggestions: bool = True) -> dict:
+        resume_text = extract_text_from_pdf(resume_pdf)
+        if not resume_text: return {"error": "Could not extract text from the resume PDF."}
+        return self.analyze(resume_text, job_description_text, suggestions)
+
+    """
+        Analyzes a new version of the resume, reusing the work done for unchanged sections.
+        Returns the same keys as run_full_analysis plus "changes": the headings of changed, added
+        and removed sections and the bullets added and removed since the previous call.
+        suggestions: Also regenerate the AI suggestions (an LLM call whenever the text changed).
+    """
+    def analyze(self, resume_text: str, job_description_text: str, suggestions: bool = True) -> dict:
+        with span("incremental_analysis", chars=len(resume_text)) as stage:
+            unchanged = self.result is not None and resume_text == self.parsed.text and job_description_text == self._job.text
+            stage.set(unchanged=unchanged)
+            if unchanged and (not suggestions or "suggestions" in self.result):
+                return dict(self.result, changes=_no_changes())
+
+            if self._job is None or self._job.text != job_description_text:
+                self._job = _JobState(job_description_text)
+                # Resume keywords are seeded with the JD's keywords, so they have to be mined again
+                for section in self._sections.values(): section.keywords = None
+            parsed = ParsedResume(resume_text)
+            sections = parsed.section_texts()
+            changes = self._diff(parsed, sections)
+            encoded = self._update_sections(sections, resume_text, resume_changed=self.parsed is None or resume_text != self.parsed.text)
+            stage.set(sections=len(sections), sections_encoded=encoded)
+            self.parsed, self._section_list = parsed, sections
+
+            result = dict(self.result or {})
+            result.update(self._score())
+            result["codepath_format_feedback"] = check_codepath_student_resume_format(parsed)
+            if suggestions:
+                result["suggestions"] = generate_improvement_suggestions(
+                    parsed, job_description_text,
+                    result["matched_keywords"], result["missing_keywords"], result["codepath_format_feedback"],
+                    result["weighted_score"], result["semantic_score"], llm_client=self.llm_client
+                )
+            self.result = result
+            return dict(result, changes=changes)
+
+    def _diff(self, parsed: ParsedResume, sections: list[tuple[str, str]]) -> dict:
+        old_sections, new_sections = _by_occurrence(self._section_list), _by_occurrence(sections)
+        old_bullets = self.parsed.bullet_texts if self.parsed is not None else []
+        old_bullet_set, new_bullet_set = set(old_bullets), set(parsed.bullet_texts)
+        return {
+            "sections_changed": [heading for (heading, n), text in new_sections.items()
+                                 if (heading, n) in old_sections and old_sections[heading, n] != text],
+            "sections_added": [heading for heading, n in new_sections if (heading, n) not in old_sections],
+            "sections_removed": [heading for heading, n in old_sections if (heading, n) not in new_sections],
+            "bullets_added": [bullet for bullet in parsed.bullet_texts if bullet not in old_bullet_set],
+            "bullets_removed": [bullet for bullet in old_bullets if bullet not in new_bullet_set]
+        }
+
+    # Drops the state of sections that are gone and encodes the new ones in one batch.
+    # Returns how many sections were encoded.
+    def _update_sections(self, sections: list[tuple[str, str]], resume_text: str, resume_changed: bool) -> int:
+        self._sections = {text: self._sections[text] for _, text in sections if text in self._sections}
+        new_texts = list(dict.fromkeys(text for _, text in sections if text not in self._sections))
+        if not get_sentence_model():
+            for text in new_texts: self._sections[text] = _SectionState(None, None)
+            return 0
+        # The whole-text embedding scores the resume when pooling is off
+        whole_text = [resume_text] if SIMILARITY_POOLING == "off" and resume_changed else []
+        chunks = [chunk_text(text) if SIMILARITY_POOLING != "off" else [] for text in new_texts]
+        embeddings = encode_texts(whole_text + new_texts + [chunk for text_chunks in chunks for chunk in text_chunks]) \
+            if whole_text or new_texts else None
+        if whole_text: self._resume_embedding = embeddings[0]
+        offset = len(whole_text) + len(new_texts)
+        for i, text in enumerate(new_texts):
+            self._sections[text] = _SectionState(embeddings[len(whole_text) + i],
+                                                 embeddings[offset:offset + len(chunks[i])] if chunks[i] else None)
+            offset += len(chunks[i])
+        return len(new_texts)
+
+    # Re-scores the current version from the cached per-section state.
+    def _score(self) -> dict:
+        import numpy as np
+        job = self._job
+        seed_keywords = list(set(job.required_keywords + job.preferred_keywords))
+        best_scores = {}
+        for _, text in self._section_list:
+            section = self._sections[text]
+            if section.keywords is None:
+                section.keywords = extract_scored_keywords(text, seed_keywords=seed_keywords, doc_embedding=section.embedding)
+            for keyword, score in section.keywords:
+                best_scores[keyword] = max(score, best_scores.get(keyword, score))
+        resume_keywords = sorted(best_scores, key=best_scores.get, reverse=True)[:KEYWORDS_PER_TEXT]
+        scoring_result = score_resume(resume_keywords, job.required_keywords, job.preferred_keywords, KEYWORD_MATCH_THRESHOLD)
+
+        semantic_score = 0.0
+        section_scores = []
+        if job.embedding is not None and self._section_list:
+            sections = [self._sections[text] for _, text in self._section_list]
+            if job.chunk_embeddings is not None:
+                semantic_score = get_chunk_similarity(np.concatenate([section.chunk_embeddings for section in sections]),
+                                                      job.chunk_embeddings)
+            else:
+                semantic_score = get_embedding_similarity(self._resume_embedding, job.embedding)
+            section_scores = get_section_similarities(
+                [heading for heading, _ in self._section_list], np.stack([section.embedding for section in sections]), job.embedding
+            )
+        return {
+            "weighted_score": scoring_result["weighted_score"],
+            "semantic_score": semantic_score,
+            "section_scores": section_scores,
+            "matched_keywords": scoring_result["matched_keywords"],
+            "missing_keywords": scoring_result["missing_keywords"]
+        }
+
+
+# Keys sections by (heading, occurrence), since a resume may have e.g. two "projects" sections.
+def _by_occurrence(sections: list[tuple[str, str]]) -> dict:
+    counts, keyed = {}, {}
+    for heading, text in sections:
+        keyed[heading, counts.get(heading, 0)] = text
+        counts[heading] = counts.get(heading, 0) + 1
+    return keyed
+
+
+def _no_changes() -> dict:
+    return {"sections_changed": [], "sections_added": [], "sections_removed": [], "bullets_added": [], "bullets_removed": []}
@@ -0,0 +1,210 @@
+import contextvars
+import os
+import threading
+import time
+
+"""
+    Per-stage timing spans for the analysis pipeline.
+
+    Code wraps a stage in `with span("stage", chars=len(text)) as s:` and may add attributes
+    while it runs (s.set(cache_hit=True), or annotate(...) from a helper further down the call
+    stack). When the span closes, a record with its wall time, CPU time of the calling thread,
+    parent stage, attributes and error (if any) is passed to every registered hook.
+
+    With no hooks registered span() returns a shared no-op object, so instrumented code costs
+    one list check per stage. Hooks receive plain dicts, which can be logged, sent to a tracing
+    backend, pickled across processes, or aggregated by StageMetrics into Prometheus text.
+"""
+
+_HOOKS = []
+_HOOKS_LOCK = threading.Lock()
+_CURRENT_SPAN = contextvars.ContextVar("resume_elevate_span", default=None)
+
+
+# Registers fn(record: dict) to be called as every span closes, on the thread that ran the stage.
+def add_span_hook(fn):
+    with _HOOKS_LOCK:
+        if fn not in _HOOKS: _HOOKS.append(fn)
+
+
+def remove_span_hook(fn):
+    with _HOOKS_LOCK:
+        if fn in _HOOKS: _HOOKS.remove(fn)
+
+
+def _emit(record: dict):
+    for hook in tuple(_HOOKS):
+        try:
+            hook(record)
+        except Exception as e:
+            print(f"[WARN] Span hook {hook!r} failed. {e}")
+
+
+class Span:
+    __slots__ = ('name', 'attributes', 'parent', 'start_time', '_wall_start', '_cpu_start', '_token')
+
+    def __init__(self, name: str, attributes: dict):
+        self.name = name
+        self.attributes = attributes
+        self.parent = None
+
+    def set(self, **attributes):
+        self.attributes.update(attributes)
+
+    def __enter__(self):
+        parent = _CURRENT_SPAN.get()
+        self.parent = parent.name if parent is not None else None
+        self._token = _CURRENT_SPAN.set(self)
+        self.start_time = time.time()
+        self._wall_start, self._cpu_start = time.perf_counter(), time.thread_time()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        wall_seconds, cpu_seconds = time.perf_counter() - self._wall_start, time.thread_time() - self._cpu_start
+        _CURRENT_SPAN.reset(self._token)
+        _emit({
+            "name": self.name,
+            "parent": self.parent,
+            "start_time": self.start_time,
+            "wall_seconds": wall_seconds,
+            "cpu_seconds": cpu_seconds,
+            "error": exc_type.__name__ if exc_type is not None else None,
+            "attributes": self.attributes
+        })
+        return False
+
+
+class _NoopSpan:
+    __slots__ = ()
+
+    def set(self, **attributes):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NOOP_SPAN = _NoopSpan()
+
+
+# Times the enclosed stage. attributes are recorded with the span, e.g. input sizes.
+def span(name: str, **attributes):
+    if not _HOOKS: return _NOOP_SPAN
+    return Span(name, attributes)
+
+
+# Adds attributes to the innermost open span, if any (e.g. prompt size from deep inside a stage).
+def annotate(**attributes):
+    current = _CURRENT_SPAN.get()
+    if current is not None: current.attributes.update(attributes)
+
+
+# Collects records in memory until drained, e.g. to ship a worker process's spans with its result.
+class SpanBuffer:
+    def __init__(self):
+        self._records = []
+        self._lock = threading.Lock()
+
+    def __call__(self, record: dict):
+        with self._lock:
+            self._records.append(record)
+
+    def drain(self) -> list[dict]:
+        with self._lock:
+            records, self._records = self._records, []
+        return records
+
+
+def log_span(record: dict):
+    attributes = " ".join(f"{key}={value}" for key, value in record["attributes"].items())
+    error = f" error={record['error']}" if record["error"] else ""
+    print(f"[TRACE] {record['name']} {record['wall_seconds'] * 1000:.1f} ms "
+          f"(cpu {record['cpu_seconds'] * 1000:.1f} ms) {attributes}{error}".rstrip())
+
+
+# Upper bounds, in seconds, of the stage latency histogram buckets
+LATENCY_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+def _escape_label(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+
+"""
+    Aggregates span records into Prometheus counters and histograms per stage.
+    Numeric attributes are summed (e.g. total characters or texts encoded per stage) and
+    boolean attributes are counted when true (e.g. cache hits), alongside how often each
+    attribute was reported, so hit rates and mean sizes can be derived.
+    Register an instance as a span hook, or feed it records from other processes with observe().
+"""
+class StageMetrics:
+    def __init__(self, prefix: str = "resume_elevate", buckets: tuple = LATENCY_BUCKETS):
+        self.prefix = prefix
+        self.buckets = buckets
+        self._lock = threading.Lock()
+        # stage -> [bucket counts..., count, wall sum, cpu sum, errors]
+        self._stages = {}
+        # (stage, attribute) -> [observations, sum]
+        self._attributes = {}
+
+    def __call__(self, record: dict):
+        self.observe(record)
+
+    def observe(self, record: dict):
+        wall_seconds = record["wall_seconds"]
+        with self._lock:
+            stage = self._stages.get(record["name"])
+            if stage is None:
+                stage = self._stages[record["name"]] = [0] * len(self.buckets) + [0, 0.0, 0.0, 0]
+            for i, bound in enumerate(self.buckets):
+                if wall_seconds <= bound: stage[i] += 1
+            n = len(self.buckets)
+            stage[n] += 1
+            stage[n + 1] += wall_seconds
+            stage[n + 2] += record["cpu_seconds"]
+            if record["error"]: stage[n + 3] += 1
+            for attribute, value in record["attributes"].items():
+                if not isinstance(value, (bool, int, float)): continue
+                totals = self._attributes.setdefault((record["name"], attribute), [0, 0.0])
+                totals[0] += 1
+                totals[1] += value
+
+    # Renders the metrics in the Prometheus text exposition format, followed by any extra gauges.
+    def render(self, gauges: dict = None) -> str:
+        p = self.prefix
+        lines = [
+            f"# HELP {p}_stage_seconds Wall time of each analysis stage.",
+            f"# TYPE {p}_stage_seconds histogram"
+        ]
+        with self._lock:
+            stages = {name: list(values) for name, values in self._stages.items()}
+            attributes = {key: list(values) for key, values in self._attributes.items()}
+        n = len(self.buckets)
+        for name, values in sorted(stages.items()):
+            label = f'stage="{_escape_label(name)}"'
+            for bound, count in zip(self.buckets, values):
+                lines.append(f'{p}_stage_seconds_bucket{{{label},le="{bound:g}"}} {count}')
+            lines.append(f'{p}_stage_seconds_bucket{{{label},le="+Inf"}} {values[n]}')
+            lines.append(f"{p}_stage_seconds_sum{{{label}}} {values[n + 1]:.6f}")
+            lines.append(f"{p}_stage_seconds_count{{{label}}} {values[n]}")
+        for metric, index, help_text in (("stage_cpu_seconds_total", n + 2, "CPU time of the thread running each stage."),
+                                         ("stage_errors_total", n + 3, "Stages that raised an exception.")):
+            lines += [f"# HELP {p}_{metric} {help_text}", f"# TYPE {p}_{metric} counter"]
+            for name, values in sorted(stages.items()):
+                lines.append(f'{p}_{metric}{{stage="{_escape_label(name)}"}} {values[index]:g}')
+        for metric, index, help_text in (("stage_attribute_observations_total", 0, "Spans that reported each attribute."),
+                                         ("stage_attribute_sum_total", 1, "Sum of each numeric attribute; true booleans count as 1.")):
+            lines += [f"# HELP {p}_{metric} {help_text}", f"# TYPE {p}_{metric} counter"]
+            for (name, attribute), values in sorted(attributes.items()):
+                lines.append(f'{p}_{metric}{{stage="{_escape_label(name)}",attribute="{_escape_label(attribute)}"}} {values[index]:g}')
+        for name, value in (gauges or {}).items():
+            lines += [f"# TYPE {p}_{name} gauge", f"{p}_{name} {value:g}"]
+        return "\n".join(lines) + "\n"
+
+
+# RESUME_ELEVATE_TRACE=1 prints every span as it closes
+if os.environ.get("RESUME_ELEVATE_TRACE", "").lower() in ("1", "true", "yes"):
+    add_span_hook(log_span)
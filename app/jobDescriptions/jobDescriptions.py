@@ -2,16 +2,24 @@ import pandas as pd
 import spacy
 import re
 from spacy.matcher import Matcher
+from keywordAutomaton import KeywordAutomaton
 
 #  Dataset Source For Training: https://www.kaggle.com/datasets/kshitizregmi/jobs-and-job-description
 class JobDescriptionParser:
-    def __init__(self, spacy_model='en_core_web_sm'):
-        self.nlp = spacy.load(spacy_model)
+    # Only the tokenizer is needed: the Matcher works on LOWER and keyword matching on the raw text,
+    # so the tagger, parser, NER and friends are not loaded at all.
+    UNUSED_PIPES = ["tok2vec", "tagger", "parser", "senter", "attribute_ruler", "lemmatizer", "ner"]
+
+    def __init__(self, spacy_model='en_core_web_sm', exclude_pipes=UNUSED_PIPES):
+        self.nlp = spacy.load(spacy_model, exclude=exclude_pipes)
         # TO DO: Extend with custom NER or rule-based matching for better accuracy
         #        enhance the lists for skills and qualifications.
        
         self.skill_keywords = self._load_keywords('skills.txt') 
         self.qualification_keywords = self._load_keywords('qualifications.txt')
+        # Compiled once, so matching cost grows with the text rather than the keyword lists
+        self.skill_automaton = KeywordAutomaton(self.skill_keywords)
+        self.qualification_automaton = KeywordAutomaton(self.qualification_keywords)
 
         self.matcher = Matcher(self.nlp.vocab)
         # Note to self-- Example pattern for "X+ years of experience"
@@ -32,8 +40,10 @@ class JobDescriptionParser:
     
     # Parses a single job description to extract skills, experience levels, and qualifications.
     def parse_job_description(self, job_description_text):
-        doc = self.nlp(job_description_text.lower())
+        return self._parse_doc(self.nlp(job_description_text.lower()))
 
+    # Shared by parse_job_description and the batched nlp.pipe path in process_csv.
+    def _parse_doc(self, doc):
         extracted_skills = self._extract_skills(doc)
         experience_level = self._extract_experience(doc)
         extracted_qualifications = self._extract_qualifications(doc)
@@ -55,27 +65,38 @@ class JobDescriptionParser:
     def _extract_skills(self, doc):
         required_skills = set()
         preferred_skills = set()
+        text = doc.text
+
+        # Basic attempt to distinguish required vs. preferred, with section boundaries computed once per document
+        # TODO: This needs significant improvement for accuracy
+        has_required_marker = "required" in text or "must have" in text or "mandatory" in text
+        has_preferred_marker = "preferred" in text or "nice to have" in text or "plus" in text
+        required_cutoff = self._section_cutoff(text, ("required", "must have"))
+        preferred_cutoff = self._section_cutoff(text, ("preferred", "nice to have"))
 
-        # Simple keyword matching
-        for skill in self.skill_keywords:
-            if skill in doc.text:
-                # Basic attempt to distinguish required vs. preferred
-                # TODO: This needs significant improvement for accuracy
-                if "required" in doc.text or "must have" in doc.text or "mandatory" in doc.text:
-                    if skill in doc.text.split("required")[0] or skill in doc.text.split("must have")[0]: # Simplified
-                        required_skills.add(skill)
-                    else:
-                        preferred_skills.add(skill)
-                elif "preferred" in doc.text or "nice to have" in doc.text or "plus" in doc.text:
-                     if skill in doc.text.split("preferred")[0] or skill in doc.text.split("nice to have")[0]: # Simplified
-                        preferred_skills.add(skill)
-                     else: # If not explicitly preferred, assume required for simplicity, or refine
-                         required_skills.add(skill)
-                else: # Default to required if no clear indicator
+        # Single pass keyword matching; a skill counts as "before" a marker if its first occurrence ends before it
+        for skill, first_end in self.skill_automaton.first_match_ends(text).items():
+            if has_required_marker:
+                if first_end <= required_cutoff: # Simplified
+                    required_skills.add(skill)
+                else:
+                    preferred_skills.add(skill)
+            elif has_preferred_marker:
+                if first_end <= preferred_cutoff: # Simplified
+                    preferred_skills.add(skill)
+                else: # If not explicitly preferred, assume required for simplicity, or refine
                     required_skills.add(skill)
+            else: # Default to required if no clear indicator
+                required_skills.add(skill)
 
         return {"required": required_skills, "preferred": preferred_skills}
 
+    # Offset of the text that precedes any of the markers, matching text.split(marker)[0] for the
+    # latest-starting marker; markers that do not occur leave the whole text.
+    @staticmethod
+    def _section_cutoff(text, markers):
+        return max(text.find(marker) if marker in text else len(text) for marker in markers)
+
     """
       Extracts experience level (e.g., "3-5 years", "junior", "senior").
       Uses regex and spaCy's Matcher.
@@ -115,61 +136,143 @@ class JobDescriptionParser:
         Similar to skills, this will benefit from more comprehensive lists and context.
     """
     def _extract_qualifications(self, doc):
-        found_qualifications = set()
-        for qual in self.qualification_keywords:
-            if qual in doc.text:
-                found_qualifications.add(qual)
-        return found_qualifications
+        return set(self.qualification_automaton.first_match_ends(doc.text))
 
     """
-        Reads a CSV, parses each job description, and saves the results to a new CSV.
+        Reads a CSV, parses each job description, and saves the results to a new CSV or Parquet file.
+        The input is streamed in chunks of chunksize rows and tokenized with nlp.pipe
+        (batch_size docs per batch, n_process worker processes), and each chunk is appended
+        to the output as soon as it is parsed, so memory stays flat for multi-GB inputs.
+
+        output_format: 'csv' or 'parquet'; inferred from the output file extension when None.
+                       Parquet output keeps skills and qualifications as list columns of
+                       dictionary-encoded strings (see load_parsed_job_descriptions).
     """
-    def process_csv(self, csv_filepath, output_filepath='parsed_job_descriptions.csv'):
+    def process_csv(self, csv_filepath, output_filepath='parsed_job_descriptions.csv',
+                    chunksize=1000, batch_size=64, n_process=1, output_format=None):
+        output_format = output_format or ('parquet' if output_filepath.endswith('.parquet') else 'csv')
         try:
-            df = pd.read_csv(csv_filepath)
+            chunks = pd.read_csv(csv_filepath, chunksize=chunksize)
         except FileNotFoundError:
             print(f"Error: CSV file not found at {csv_filepath}")
             return
 
-        if 'job_description' not in df.columns:
-            print("Error: 'job_description' column not found in the CSV.")
-            return
+        parquet_writer = None
+        if output_format == 'parquet':
+            try:
+                import pyarrow as pa
+                import pyarrow.parquet as pq
+            except ImportError:
+                print("Error: Parquet output requires pyarrow. Install it with 'pip install pyarrow'.")
+                return
+            parquet_writer = pq.ParquetWriter(output_filepath, parsed_job_descriptions_schema())
+
+        total_rows = 0
+        try:
+            for chunk in chunks:
+                if 'job_description' not in chunk.columns:
+                    print("Error: 'job_description' column not found in the CSV.")
+                    return
+
+                parsed_rows = self._parse_chunk(chunk, batch_size, n_process)
+                if parquet_writer:
+                    parquet_writer.write_table(pa.Table.from_pylist(parsed_rows, schema=parquet_writer.schema))
+                else:
+                    parsed_df = pd.DataFrame(parsed_rows)
+                    for column in PARSED_LIST_COLUMNS:
+                        parsed_df[column] = parsed_df[column].str.join(", ")
+                    # The first chunk creates the file with a header; later chunks are appended
+                    parsed_df.to_csv(output_filepath, index=False, mode='w' if total_rows == 0 else 'a', header=total_rows == 0)
+                total_rows += len(parsed_rows)
+                print(f"[INFO] Parsed {total_rows} job descriptions so far...")
+        finally:
+            if parquet_writer: parquet_writer.close()
+
+        print(f"Parsed job descriptions saved to {output_filepath}")
+        return total_rows
+
+    # Parses one CSV chunk, tokenizing its descriptions in batches with nlp.pipe.
+    def _parse_chunk(self, chunk, batch_size, n_process):
+        job_descriptions = chunk['job_description'].astype(str).tolist()
+        job_roles = chunk['job_role'].astype(str).tolist() if 'job_role' in chunk.columns else [""] * len(chunk)
+        docs = self.nlp.pipe((text.lower() for text in job_descriptions), batch_size=batch_size, n_process=n_process)
 
         parsed_data = []
-        for index, row in df.iterrows():
-            job_description = str(row['job_description'])
-            job_role = str(row['job_role'])
-            parsed_info = self.parse_job_description(job_description)
+        for job_role, job_description, doc in zip(job_roles, job_descriptions, docs):
+            parsed_info = self._parse_doc(doc)
             parsed_data.append({
                 "job_role": job_role,
                 "original_description": job_description,
-                "parsed_skills_required": ", ".join(parsed_info["skills"]["required"]),
-                "parsed_skills_preferred": ", ".join(parsed_info["skills"]["preferred"]),
+                "parsed_skills_required": sorted(parsed_info["skills"]["required"]),
+                "parsed_skills_preferred": sorted(parsed_info["skills"]["preferred"]),
                 "parsed_experience_level": parsed_info["experience_level"],
-                "parsed_qualifications": ", ".join(parsed_info["qualifications"])
+                "parsed_qualifications": sorted(parsed_info["qualifications"])
             })
+        return parsed_data
 
-        parsed_df = pd.DataFrame(parsed_data)
-        parsed_df.to_csv(output_filepath, index=False)
-        print(f"Parsed job descriptions saved to {output_filepath}")
-        
-    if __name__ == "__main__":
-        # for self testing purposes
-        dummy_data = {
-            'job_role': ['Software Engineer', 'Data Scientist', 'DevOps Engineer', 'Project Manager'],
-            'job_description': [
-                "We are looking for a Software Engineer with a strong background in Python and Java. Must have 3+ years of experience with REST APIs and microservices. Bachelor's degree in Computer Science is required. AWS experience is a plus. Agile development knowledge preferred.",
-                "Exciting opportunity for a Data Scientist. Requires 5 years of experience in machine learning and NLP. Familiarity with TensorFlow or PyTorch is mandatory. PhD preferred. Strong SQL skills are a must. Experience with Azure is nice to have.",
-                "Seeking a Senior DevOps Engineer with extensive Docker and Kubernetes experience (7+ years). Proficient in cloud computing (AWS/Azure). Communication skills essential. CISSP certification preferred.",
-                "Project Manager with 10+ years of experience. PMP certification required. Experience with Scrum methodology. Excellent problem-solving and teamwork skills."
-            ]
-        }
-        dummy_df = pd.DataFrame(dummy_data)
-        dummy_df.to_csv('job_postings.csv', index=False)
-        print("Created dummy 'job_postings.csv'")
 
-        parser = JobDescriptionParser()
-        parser.process_csv('job_postings.csv', 'parsed_job_descriptions.csv')
+# Columns holding keyword lists: comma-joined strings in CSV output, list columns in Parquet output
+PARSED_LIST_COLUMNS = ("parsed_skills_required", "parsed_skills_preferred", "parsed_qualifications")
+
+# Arrow schema of the Parquet output. Keyword lists are dictionary-encoded, so each distinct
+# skill string is stored once per row group and rows only hold integer codes.
+def parsed_job_descriptions_schema():
+    import pyarrow as pa
+    keyword_list = pa.list_(pa.dictionary(pa.int32(), pa.string()))
+    return pa.schema([
+        ("job_role", pa.string()),
+        ("original_description", pa.string()),
+        ("parsed_skills_required", keyword_list),
+        ("parsed_skills_preferred", keyword_list),
+        ("parsed_experience_level", pa.string()),
+        ("parsed_qualifications", keyword_list)
+    ])
+
+"""
+    Memory-maps a Parquet file written by process_csv back into an Arrow table.
+    The original_description text column is skipped unless include_descriptions is True,
+    so filtering the corpus never has to read the full job description text.
+"""
+def load_parsed_job_descriptions(parquet_filepath, columns=None, include_descriptions=False):
+    import pyarrow.parquet as pq
+    if columns is None:
+        columns = [name for name in parsed_job_descriptions_schema().names
+                   if include_descriptions or name != "original_description"]
+    return pq.read_table(parquet_filepath, columns=columns, memory_map=True)
+
+# Returns the rows of a parsed-JD table whose keyword list column contains keyword,
+# e.g. filter_jobs_by_keyword(table, "kubernetes") for all JDs requiring Kubernetes.
+def filter_jobs_by_keyword(table, keyword, column="parsed_skills_required"):
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    keyword_lists = table[column]
+    keywords = pc.list_flatten(keyword_lists)
+    if pa.types.is_dictionary(keywords.type):
+        keywords = keywords.cast(pa.string())
+    matching_rows = pc.unique(pc.filter(pc.list_parent_indices(keyword_lists), pc.equal(keywords, keyword.lower())))
+    return table.take(matching_rows)
+
+
+if __name__ == "__main__":
+    # for self testing purposes
+    dummy_data = {
+        'job_role': ['Software Engineer', 'Data Scientist', 'DevOps Engineer', 'Project Manager'],
+        'job_description': [
+            "We are looking for a Software Engineer with a strong background in Python and Java. Must have 3+ years of experience with REST APIs and microservices. Bachelor's degree in Computer Science is required. AWS experience is a plus. Agile development knowledge preferred.",
+            "Exciting opportunity for a Data Scientist. Requires 5 years of experience in machine learning and NLP. Familiarity with TensorFlow or PyTorch is mandatory. PhD preferred. Strong SQL skills are a must. Experience with Azure is nice to have.",
+            "Seeking a Senior DevOps Engineer with extensive Docker and Kubernetes experience (7+ years). Proficient in cloud computing (AWS/Azure). Communication skills essential. CISSP certification preferred.",
+            "Project Manager with 10+ years of experience. PMP certification required. Experience with Scrum methodology. Excellent problem-solving and teamwork skills."
+        ]
+    }
+    dummy_df = pd.DataFrame(dummy_data)
+    dummy_df.to_csv('job_postings.csv', index=False)
+    print("Created dummy 'job_postings.csv'")
+
+    parser = JobDescriptionParser()
+    parser.process_csv('job_postings.csv', 'parsed_job_descriptions.csv')
+    parser.process_csv('job_postings.csv', 'parsed_job_descriptions.parquet')
+    kubernetes_jobs = filter_jobs_by_keyword(load_parsed_job_descriptions('parsed_job_descriptions.parquet'), 'kubernetes')
+    print(f"Jobs requiring Kubernetes: {kubernetes_jobs['job_role'].to_pylist()}")
 
-        # parsed_df = pd.read_csv('parsed_job_descriptions.csv')
-        # print(parsed_df.head())
\ No newline at end of file
+    # parsed_df = pd.read_csv('parsed_job_descriptions.csv')
+    # print(parsed_df.head())
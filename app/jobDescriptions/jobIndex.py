@@ -0,0 +1,193 @@
+import json
+import os
+import re
+import numpy as np
+
+"""
+    Inverted skill index over a corpus of parsed job descriptions (the output of
+    JobDescriptionParser.process_csv), for ranking every job against one resume at once.
+
+    Each normalized skill maps to a posting list of (job id, weight), where required skills weigh 2
+    and preferred skills weigh 1, the same weighting score_resume uses. A query only touches the
+    postings of the resume's own keywords, so its cost does not grow with the number of skills in
+    the corpus. Postings are stored as flat NumPy arrays (CSR layout) that are memory-mapped when
+    loaded from disk; jobs added afterwards go to a small in-memory delta until compact() is called.
+"""
+
+REQUIRED_WEIGHT = 2
+PREFERRED_WEIGHT = 1
+_WHITESPACE_RE = re.compile(r'\s+')
+
+
+# Lower-cases a skill and collapses whitespace, so "Machine  Learning" and "machine learning" share a posting list.
+def normalize_skill(skill: str) -> str:
+    return _WHITESPACE_RE.sub(' ', skill.strip().lower())
+
+
+class JobIndex:
+    META_FILE = "meta.json"
+    ARRAY_FILES = ("offsets", "job_ids", "weights", "total_weights")
+
+    def __init__(self):
+        self.job_roles: list[str] = []
+        # Compacted postings: skill -> row in offsets; the postings of row r are job_ids/weights[offsets[r]:offsets[r + 1]]
+        self._vocab: dict[str, int] = {}
+        self._offsets = np.zeros(1, dtype=np.int64)
+        self._job_ids = np.zeros(0, dtype=np.int32)
+        self._weights = np.zeros(0, dtype=np.float32)
+        self._total_weights = np.zeros(0, dtype=np.float32)
+        # Jobs added since the last compaction
+        self._delta_postings: dict[str, tuple[list[int], list[float]]] = {}
+        self._delta_total_weights: list[float] = []
+
+    def __len__(self) -> int:
+        return len(self.job_roles)
+
+    # Adds one job and returns its id. A skill listed as both required and preferred counts for both, as in score_resume.
+    def add_job(self, job_role: str, required_skills: list[str], preferred_skills: list[str]) -> int:
+        job_id = len(self.job_roles)
+        self.job_roles.append(job_role)
+        required_set = {normalize_skill(skill) for skill in required_skills if skill and skill.strip()}
+        preferred_set = {normalize_skill(skill) for skill in preferred_skills if skill and skill.strip()}
+        for skill in required_set | preferred_set:
+            weight = REQUIRED_WEIGHT * (skill in required_set) + PREFERRED_WEIGHT * (skill in preferred_set)
+            job_ids, weights = self._delta_postings.setdefault(skill, ([], []))
+            job_ids.append(job_id)
+            weights.append(weight)
+        self._delta_total_weights.append(REQUIRED_WEIGHT * len(required_set) + PREFERRED_WEIGHT * len(preferred_set))
+        return job_id
+
+    # Merges the in-memory delta into the compacted arrays.
+    def compact(self):
+        if not self._delta_total_weights: return
+        postings = {skill: (self._job_ids[self._offsets[row]:self._offsets[row + 1]],
+                            self._weights[self._offsets[row]:self._offsets[row + 1]])
+                    for skill, row in self._vocab.items()}
+        for skill, (job_ids, weights) in self._delta_postings.items():
+            base_ids, base_weights = postings.get(skill, (np.zeros(0, dtype=np.int32), np.zeros(0, dtype=np.float32)))
+            # Delta job ids are always larger than compacted ones, so each posting list stays sorted
+            postings[skill] = (np.concatenate([base_ids, np.asarray(job_ids, dtype=np.int32)]),
+                               np.concatenate([base_weights, np.asarray(weights, dtype=np.float32)]))
+
+        self._vocab = {skill: row for row, skill in enumerate(postings)}
+        lengths = [len(job_ids) for job_ids, _ in postings.values()]
+        self._offsets = np.concatenate([[0], np.cumsum(lengths, dtype=np.int64)])
+        self._job_ids = np.concatenate([job_ids for job_ids, _ in postings.values()]) if postings else np.zeros(0, dtype=np.int32)
+        self._weights = np.concatenate([weights for _, weights in postings.values()]) if postings else np.zeros(0, dtype=np.float32)
+        self._total_weights = np.concatenate([self._total_weights, np.asarray(self._delta_total_weights, dtype=np.float32)])
+        self._delta_postings = {}
+        self._delta_total_weights = []
+
+    # Returns the (job_ids, weights) posting arrays for a normalized skill, including uncompacted jobs.
+    def _postings(self, skill: str):
+        parts = []
+        row = self._vocab.get(skill)
+        if row is not None:
+            start, end = self._offsets[row], self._offsets[row + 1]
+            parts.append((self._job_ids[start:end], self._weights[start:end]))
+        if skill in self._delta_postings:
+            job_ids, weights = self._delta_postings[skill]
+            parts.append((np.asarray(job_ids, dtype=np.int32), np.asarray(weights, dtype=np.float32)))
+        return parts
+
+    def _all_total_weights(self) -> np.ndarray:
+        if not self._delta_total_weights: return self._total_weights
+        return np.concatenate([self._total_weights, np.asarray(self._delta_total_weights, dtype=np.float32)])
+
+    """
+        Ranks all jobs against a resume's keywords using score_resume's weighting:
+        matched required/preferred weight divided by the job's total weight.
+
+        ret: list[dict]: Up to k rows of {"job_id", "job_role", "weighted_score", "matched_keywords"},
+                         best match first. Jobs sharing no keyword with the resume are omitted.
+    """
+    def top_k(self, resume_keywords: list[str], k: int = 10) -> list[dict]:
+        if not self.job_roles or k <= 0: return []
+        resume_skills = {normalize_skill(keyword) for keyword in resume_keywords if keyword and keyword.strip()}
+        skill_postings = {skill: self._postings(skill) for skill in resume_skills}
+
+        posting_parts = [part for parts in skill_postings.values() for part in parts]
+        if not posting_parts: return []
+        # Sum the matched weight per job over the touched postings only; no pass over the whole corpus
+        candidates, inverse = np.unique(np.concatenate([job_ids for job_ids, _ in posting_parts]), return_inverse=True)
+        matched_weights = np.bincount(inverse, weights=np.concatenate([weights for _, weights in posting_parts]))
+
+        scores = matched_weights / self._all_total_weights()[candidates]
+        if len(candidates) > k:
+            best = np.argpartition(-scores, k - 1)[:k]
+            candidates, scores = candidates[best], scores[best]
+        order = np.lexsort((candidates, -scores))
+        candidates, scores = candidates[order], scores[order]
+
+        results = []
+        for job_id, score in zip(candidates.tolist(), scores.tolist()):
+            results.append({"job_id": job_id, "job_role": self.job_roles[job_id],
+                            "weighted_score": round(score, 2), "matched_keywords": []})
+        # Posting lists are sorted by job id, so membership of the k winners is a binary search
+        for skill, parts in skill_postings.items():
+            for job_ids, _ in parts:
+                positions = np.minimum(np.searchsorted(job_ids, candidates), len(job_ids) - 1)
+                for row, hit in zip(results, (job_ids[positions] == candidates).tolist()):
+                    if hit: row["matched_keywords"].append(skill)
+        return results
+
+    # Weighted scores of the given jobs against a resume's keywords, with the same weighting and rounding as top_k.
+    # Costs a binary search per (keyword posting list, job), so it suits re-scoring a candidate set.
+    def weighted_scores(self, resume_keywords: list[str], job_ids: list[int]) -> np.ndarray:
+        job_ids = np.asarray(job_ids, dtype=np.int64)
+        matched_weights = np.zeros(len(job_ids), dtype=np.float64)
+        if not len(job_ids): return matched_weights
+        resume_skills = {normalize_skill(keyword) for keyword in resume_keywords if keyword and keyword.strip()}
+        for skill in resume_skills:
+            for posting_ids, weights in self._postings(skill):
+                positions = np.minimum(np.searchsorted(posting_ids, job_ids), len(posting_ids) - 1)
+                matched_weights += np.where(posting_ids[positions] == job_ids, weights[positions], 0.0)
+        total_weights = self._all_total_weights()[job_ids]
+        scores = np.divide(matched_weights, total_weights, out=np.zeros_like(matched_weights), where=total_weights > 0)
+        return np.round(scores, 2)
+
+    # Writes the index to a directory: postings as .npy arrays plus a JSON file with the vocabulary and job roles.
+    def save(self, directory: str):
+        self.compact()
+        os.makedirs(directory, exist_ok=True)
+        arrays = {"offsets": self._offsets, "job_ids": self._job_ids, "weights": self._weights, "total_weights": self._total_weights}
+        for name, array in arrays.items():
+            np.save(os.path.join(directory, f"{name}.npy"), array)
+        with open(os.path.join(directory, self.META_FILE), "w") as f:
+            json.dump({"vocab": list(self._vocab), "job_roles": self.job_roles}, f)
+
+    # Loads an index saved with save(). Posting arrays are memory-mapped, so loading is near-instant;
+    # jobs added afterwards are kept in memory until the next compact() or save().
+    @classmethod
+    def load(cls, directory: str) -> "JobIndex":
+        index = cls()
+        with open(os.path.join(directory, cls.META_FILE), "r") as f:
+            meta = json.load(f)
+        index.job_roles = meta["job_roles"]
+        index._vocab = {skill: row for row, skill in enumerate(meta["vocab"])}
+        index._offsets, index._job_ids, index._weights, index._total_weights = (
+            np.load(os.path.join(directory, f"{name}.npy"), mmap_mode="r") for name in cls.ARRAY_FILES
+        )
+        return index
+
+    """
+        Builds an index from the file written by JobDescriptionParser.process_csv, either the
+        CSV output (comma-joined skills) or the Parquet output (list columns). Job ids follow row order.
+    """
+    @classmethod
+    def from_parsed_file(cls, filepath: str, chunksize: int = 10000) -> "JobIndex":
+        index = cls()
+        if filepath.endswith(".parquet"):
+            import pyarrow.parquet as pq
+            columns = ["job_role", "parsed_skills_required", "parsed_skills_preferred"]
+            for batch in pq.ParquetFile(filepath).iter_batches(batch_size=chunksize, columns=columns):
+                for row in batch.to_pylist():
+                    index.add_job(row["job_role"], row["parsed_skills_required"] or [], row["parsed_skills_preferred"] or [])
+        else:
+            import pandas as pd
+            columns = ["job_role", "parsed_skills_required", "parsed_skills_preferred"]
+            for chunk in pd.read_csv(filepath, usecols=columns, chunksize=chunksize, keep_default_na=False):
+                for job_role, required, preferred in chunk.itertuples(index=False):
+                    index.add_job(str(job_role), str(required).split(","), str(preferred).split(","))
+        index.compact()
+        return index
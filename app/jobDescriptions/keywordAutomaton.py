@@ -0,0 +1,66 @@
+from collections import deque
+
+"""
+    Aho-Corasick automaton over a fixed keyword list.
+    Finds every keyword occurrence in a single pass over the text, independent of how many
+    keywords there are. Matches must start and end on word boundaries, so "java" does not
+    match inside "javascript"; keyword edges that are punctuation (".net", "c++") need no boundary.
+"""
+class KeywordAutomaton:
+    def __init__(self, keywords):
+        self.keywords = list(dict.fromkeys(keyword for keyword in keywords if keyword))
+        self._goto = [{}]
+        self._fail = [0]
+        # indices into self.keywords of every keyword ending at each state
+        self._output = [[]]
+        for index, keyword in enumerate(self.keywords):
+            state = 0
+            for char in keyword:
+                next_state = self._goto[state].get(char)
+                if next_state is None:
+                    next_state = len(self._goto)
+                    self._goto[state][char] = next_state
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._output.append([])
+                state = next_state
+            self._output[state].append(index)
+        self._build_failure_links()
+
+    def _build_failure_links(self):
+        # States one character deep fail back to the root, which is already their _fail value
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[next_state] = self._goto[fallback].get(char, 0)
+                self._output[next_state] = self._output[next_state] + self._output[self._fail[next_state]]
+
+    @staticmethod
+    def _is_word_char(char: str) -> bool:
+        return char.isalnum() or char == '_'
+
+    # Yields (start, end, keyword) for every word-bounded match, in order of end offset.
+    def iter_matches(self, text: str):
+        state = 0
+        for position, char in enumerate(text):
+            while state and char not in self._goto[state]:
+                state = self._fail[state]
+            state = self._goto[state].get(char, 0)
+            for index in self._output[state]:
+                keyword = self.keywords[index]
+                start, end = position + 1 - len(keyword), position + 1
+                if self._is_word_char(keyword[0]) and start > 0 and self._is_word_char(text[start - 1]): continue
+                if self._is_word_char(keyword[-1]) and end < len(text) and self._is_word_char(text[end]): continue
+                yield start, end, keyword
+
+    # Returns the end offset of the first match of each keyword found in text.
+    def first_match_ends(self, text: str) -> dict[str, int]:
+        first_ends = {}
+        for start, end, keyword in self.iter_matches(text):
+            first_ends.setdefault(keyword, end)
+        return first_ends
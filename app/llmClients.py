@@ -0,0 +1,39 @@
+import asyncio
+import time
+
+"""
+    Local stand-ins for the Gemini client, for tests and offline development.
+    Any object exposing generate_content(prompt) (and optionally generate_content_async(prompt))
+    that returns a response with a .text attribute can be passed as llm_client to the analyzer.
+"""
+
+
+class LLMResponse:
+    def __init__(self, text: str):
+        self.text = text
+
+
+# Returns a canned response after an optional delay and records every prompt it receives.
+class FakeLLMClient:
+    def __init__(self, response_text: str = "These are fake AI suggestions.", delay_seconds: float = 0.0,
+                 error: Exception = None):
+        self.response_text = response_text
+        self.delay_seconds = delay_seconds
+        self.error = error
+        self.prompts = []
+
+    def generate_content(self, prompt: str) -> LLMResponse:
+        self.prompts.append(prompt)
+        if self.delay_seconds: time.sleep(self.delay_seconds)
+        if self.error: raise self.error
+        return LLMResponse(self.response_text)
+
+    async def generate_content_async(self, prompt: str) -> LLMResponse:
+        self.prompts.append(prompt)
+        if self.delay_seconds: await asyncio.sleep(self.delay_seconds)
+        if self.error: raise self.error
+        return LLMResponse(self.response_text)
+
+    @property
+    def call_count(self) -> int:
+        return len(self.prompts)
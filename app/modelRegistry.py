@@ -0,0 +1,154 @@
+import os
+import threading
+
+"""
+    Lazy, process-wide registry for the ML models used by the analyzer.
+
+    Nothing heavy is imported or loaded until a model is first requested, so tools that only
+    need the regex-based checks import in milliseconds. Each model is loaded at most once per
+    process, even when several threads ask for it at the same time. Servers can call warmup()
+    at start-up to pay the loading cost before the first request.
+"""
+
+SENTENCE_MODEL_NAME = 'all-MiniLM-L6-v2'
+GEMINI_MODEL_NAME = 'gemini-1.5-flash-latest'
+# Inference backend for the sentence model: "torch" (full precision), "int8" (PyTorch dynamic
+# quantization of the linear layers) or "onnx" (ONNX Runtime, needs sentence-transformers>=3.2
+# with the onnx extra). All of them are used through the same encode call.
+ENCODER_BACKENDS = ("torch", "int8", "onnx")
+ENCODER_BACKEND = os.environ.get("RESUME_ELEVATE_ENCODER_BACKEND", "torch").lower()
+# ONNX file inside the model repository, e.g. "onnx/model_quint8_avx2.onnx" for a pre-quantized export
+ONNX_MODEL_FILE = os.environ.get("RESUME_ELEVATE_ONNX_MODEL_FILE", "")
+# Concurrent encode calls are merged into one forward pass of up to this many texts,
+# waiting at most this long for the batch to fill
+ENCODE_MAX_BATCH_SIZE = int(os.environ.get("RESUME_ELEVATE_ENCODE_MAX_BATCH_SIZE", "64"))
+ENCODE_MAX_LATENCY_MS = float(os.environ.get("RESUME_ELEVATE_ENCODE_MAX_LATENCY_MS", "5"))
+
+# Reentrant so that a loader may request another registry entry it depends on
+_LOCK = threading.RLock()
+_REGISTRY = {}
+
+
+# Returns the registry entry for name, creating it with factory on first use.
+# A factory that fails should return None; the None is cached so the load is not retried.
+def get_or_create(name: str, factory):
+    if name in _REGISTRY: return _REGISTRY[name]
+    with _LOCK:
+        if name not in _REGISTRY:
+            _REGISTRY[name] = factory()
+        return _REGISTRY[name]
+
+
+# Drops the registry entry for name if it is still entry, so the next get_or_create builds a new one.
+def discard(name: str, entry):
+    with _LOCK:
+        if _REGISTRY.get(name) is entry: del _REGISTRY[name]
+
+
+# Loads SENTENCE_MODEL_NAME on one inference backend. Raises if the backend is unknown or cannot be loaded.
+def load_sentence_encoder(backend: str):
+    if backend not in ENCODER_BACKENDS:
+        raise ValueError(f"Unknown encoder backend '{backend}'; expected one of {', '.join(ENCODER_BACKENDS)}.")
+    from sentence_transformers import SentenceTransformer
+    if backend == "onnx":
+        model_kwargs = {"file_name": ONNX_MODEL_FILE} if ONNX_MODEL_FILE else None
+        return SentenceTransformer(SENTENCE_MODEL_NAME, backend="onnx", model_kwargs=model_kwargs)
+    model = SentenceTransformer(SENTENCE_MODEL_NAME)
+    if backend == "int8":
+        import torch
+        model = torch.ao.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+    return model
+
+
+# Loads the sentence model on ENCODER_BACKEND, falling back to plain PyTorch if that backend is unavailable.
+def _load_sentence_model():
+    for backend in dict.fromkeys([ENCODER_BACKEND, "torch"]):
+        try:
+            model = load_sentence_encoder(backend)
+            # Runs under _LOCK inside get_or_create, like every factory
+            _REGISTRY["encoder_backend"] = backend
+            print(f"[INFO] Sentence model '{SENTENCE_MODEL_NAME}' loaded successfully ({backend} backend).")
+            return model
+        except Exception as e:
+            print(f"[WARN]: Could not load the sentence model with the {backend} backend. {e}")
+    return None
+
+
+def _create_encode_batcher():
+    sentence_model = get_sentence_model()
+    if sentence_model is None: return None
+    from embeddingBatcher import MicroBatcher
+    return MicroBatcher(
+        lambda texts: sentence_model.encode(texts, batch_size=ENCODE_MAX_BATCH_SIZE, convert_to_numpy=True),
+        max_batch_size=ENCODE_MAX_BATCH_SIZE, max_latency_ms=ENCODE_MAX_LATENCY_MS
+    )
+
+
+# KeyBERT embeds through the shared encode batcher instead of loading its own default
+# transformer, so each process holds one embedding model and KeyBERT's calls are batched too.
+def _load_keybert_model():
+    encode_batcher = get_encode_batcher()
+    if encode_batcher is None: return None
+    try:
+        from keybert import KeyBERT
+        from embeddingBatcher import make_keybert_backend
+        model = KeyBERT(model=make_keybert_backend(encode_batcher.encode))
+        print(f"[INFO] KeyBERT model loaded successfully on top of '{get_encoder_id()}'.")
+        return model
+    except Exception as e:
+        print(f"[WARN]: Could not load the KeyBERT model. {e}")
+        return None
+
+
+def _load_gemini_model():
+    try:
+        gemini_api_key = os.environ.get("GEMINI_API_KEY", "")
+        if not gemini_api_key:
+            print("[WARN] GEMINI_API_KEY not found or not set. AI suggestions will be disabled.")
+            return None
+        import google.generativeai as genai
+        genai.configure(api_key=gemini_api_key)
+        model = genai.GenerativeModel(GEMINI_MODEL_NAME)
+        print("[INFO] Gemini API configured successfully.")
+        return model
+    except Exception as e:
+        print(f"[WARN]: Could not configure Gemini API. {e}")
+        return None
+
+
+def get_sentence_model():
+    return get_or_create("sentence_model", _load_sentence_model)
+
+
+# Identifies the loaded encoder, model and backend, so embeddings from different backends are never mixed in a cache.
+# The torch backend keeps the bare model name, so existing caches stay valid.
+def get_encoder_id() -> str:
+    get_sentence_model()
+    backend = _REGISTRY.get("encoder_backend", ENCODER_BACKEND)
+    if backend == "onnx" and ONNX_MODEL_FILE:
+        return f"{SENTENCE_MODEL_NAME}+onnx:{ONNX_MODEL_FILE}"
+    return SENTENCE_MODEL_NAME if backend == "torch" else f"{SENTENCE_MODEL_NAME}+{backend}"
+
+
+# Micro-batching front end of the sentence model; every encode in the process should go through it.
+def get_encode_batcher():
+    return get_or_create("encode_batcher", _create_encode_batcher)
+
+
+def get_keybert_model():
+    return get_or_create("keybert_model", _load_keybert_model)
+
+
+def get_gemini_model():
+    return get_or_create("gemini_model", _load_gemini_model)
+
+
+# Loads every model up front and reports which ones are available.
+def warmup(include_gemini: bool = True) -> dict:
+    status = {
+        "sentence_model": get_sentence_model() is not None,
+        "keybert_model": get_keybert_model() is not None
+    }
+    if include_gemini:
+        status["gemini_model"] = get_gemini_model() is not None
+    return status
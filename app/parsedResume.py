@@ -0,0 +1,106 @@
+import re
+from bisect import bisect_right
+
+"""
+    Structured view of extracted resume text, built in a single pass and shared by every stage
+    that needs more than the flat string: the CodePath format rules, prompt compaction and
+    per-section embeddings. All offsets (sections, bullets, words) index into the original text.
+"""
+
+REQUIRED_SECTIONS = ('education', 'experience', 'projects', 'skills')
+
+RESUME_SECTION_HEADINGS = (
+    'education', 'experience', 'work experience', 'professional experience', 'projects', 'personal projects',
+    'skills', 'technical skills', 'leadership', 'activities', 'awards', 'honors', 'certifications',
+    'interests', 'summary', 'objective', 'publications', 'volunteer', 'volunteering', 'relevant coursework',
+    'coursework', 'additional experience'
+)
+_RESUME_HEADING_RE = re.compile(
+    r'^\s*(' + '|'.join(sorted(map(re.escape, RESUME_SECTION_HEADINGS), key=len, reverse=True)) + r')\s*(:|$)',
+    re.IGNORECASE
+)
+
+# The tokenizer alternates between the markers the format rules look for and plain words,
+# so one pass over the text yields everything.
+_RESUME_TOKEN_RE = re.compile(
+    r'(?P<bullet>[\n\r]\s*[\*•-]\s*)'
+    r'|(?P<email>[\w\.-]+@[\w\.-]+)'
+    r'|(?P<linkedin>linkedin.com/in/[\w-]+)'
+    r'|(?P<github>github.com/[\w-]+)'
+    r'|(?P<phone>\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4})'
+    r'|(?P<degree>\b(?:bachelor|master|b\.s|m\.s)\b)'
+    r'|(?P<word>\w+)',
+    re.IGNORECASE
+)
+_WORD_RE = re.compile(r'\w+')
+
+
+class ParsedResume:
+    __slots__ = ('text', 'lower', 'markers', 'words', 'word_offsets', 'word_set', 'section_index',
+                 'bullets', 'bullet_texts', 'sections', '_section_starts')
+
+    def __init__(self, resume_text: str):
+        self.text = resume_text
+        self.lower = resume_text.lower()
+        # Kinds of contact/degree markers present (email, phone, linkedin, github, degree)
+        self.markers = set()
+        # Lower-cased words and the offset at which each starts
+        self.words = []
+        self.word_offsets = []
+        # First offset of each required section word anywhere in the text
+        self.section_index = {}
+        # (start, end) of each bullet's text, and that text lower-cased
+        self.bullets = []
+        self.bullet_texts = []
+
+        for match in _RESUME_TOKEN_RE.finditer(resume_text):
+            kind = match.lastgroup
+            if kind == 'word':
+                word = match.group().lower()
+                self.words.append(word)
+                self.word_offsets.append(match.start())
+                if word in REQUIRED_SECTIONS: self.section_index.setdefault(word, match.start())
+            elif kind == 'bullet':
+                line_end = resume_text.find('\n', match.end())
+                span = (match.end(), line_end if line_end != -1 else len(resume_text))
+                self.bullets.append(span)
+                self.bullet_texts.append(resume_text[span[0]:span[1]].lower())
+            else:
+                self.markers.add(kind)
+                # Words inside emails, URLs and phone numbers still count towards the word total
+                for word in _WORD_RE.finditer(match.group()):
+                    self.words.append(word.group().lower())
+                    self.word_offsets.append(match.start() + word.start())
+        self.word_set = frozenset(self.words)
+
+        # (heading, start, end) for each section, split at lines that are a standard heading.
+        # Text before the first heading (name, contact details) is the "header" section.
+        self.sections = [("header", 0, len(resume_text))]
+        offset = 0
+        for line in resume_text.splitlines(keepends=True):
+            match = _RESUME_HEADING_RE.match(line)
+            if match:
+                heading, start, _ = self.sections[-1]
+                self.sections[-1] = (heading, start, offset)
+                self.sections.append((match.group(1).lower(), offset, len(resume_text)))
+            offset += len(line)
+        self._section_starts = [start for _, start, _ in self.sections]
+
+    # Text of a section with line endings normalized to "\n".
+    def section_text(self, index: int) -> str:
+        _, start, end = self.sections[index]
+        return "\n".join(self.text[start:end].splitlines()).strip()
+
+    # Returns (heading, text) for every non-empty section, in order.
+    def section_texts(self) -> list[tuple[str, str]]:
+        texts = ((heading, self.section_text(i)) for i, (heading, _, _) in enumerate(self.sections))
+        return [(heading, text) for heading, text in texts if text]
+
+    # Index into sections of the section containing a text offset.
+    def section_at(self, offset: int) -> int:
+        return max(bisect_right(self._section_starts, offset) - 1, 0)
+
+    # Returns the lower-cased bullets that fall inside sections with the given heading.
+    def bullets_in(self, heading: str) -> list[str]:
+        return [text for (start, _), text in zip(self.bullets, self.bullet_texts)
+                if self.sections[self.section_at(start)][0] == heading]
@@ -0,0 +1,165 @@
+import io
+import multiprocessing
+import os
+import time
+from itertools import islice
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from modelRegistry import discard, get_or_create
+from instrumentation import span
+
+"""
+    Streaming text extraction for resume PDFs.
+
+    Sources may be a file path, raw bytes, or a binary file-like object, so web uploads can be
+    parsed without writing a temp file. Size and page limits and an overall time limit keep a
+    pathological PDF from stalling a worker, and long documents can be split across a process pool.
+"""
+
+MAX_PDF_BYTES = int(os.environ.get("RESUME_ELEVATE_MAX_PDF_BYTES", str(10 * 1024 * 1024)))
+MAX_PDF_PAGES = int(os.environ.get("RESUME_ELEVATE_MAX_PDF_PAGES", "50"))
+# Documents with at least this many pages are extracted across the process pool
+PARALLEL_PAGE_THRESHOLD = 16
+PAGES_PER_TASK = 4
+# Time limit for one document, in seconds. The sequential path checks it between pages.
+EXTRACTION_TIMEOUT = 60
+
+
+class PdfLimitError(ValueError):
+    pass
+
+
+# Reads a path, bytes or binary file-like object into bytes, refusing anything over max_bytes.
+def read_pdf_bytes(source, max_bytes: int) -> bytes:
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        data = bytes(source)
+    elif isinstance(source, (str, os.PathLike)):
+        with open(source, 'rb') as file:
+            data = file.read(max_bytes + 1)
+    else:
+        data = source.read(max_bytes + 1)
+    if len(data) > max_bytes:
+        raise PdfLimitError(f"PDF is larger than the {max_bytes} byte limit.")
+    return data
+
+
+def _open_reader(data: bytes, max_pages: int):
+    from PyPDF2 import PdfReader
+    pdf_reader = PdfReader(io.BytesIO(data))
+    if len(pdf_reader.pages) > max_pages:
+        print(f"[WARN] PDF has {len(pdf_reader.pages)} pages; only the first {max_pages} will be extracted.")
+    return pdf_reader
+
+
+def _iter_reader_pages(pdf_reader, max_pages: int, deadline: float = None):
+    for page in islice(pdf_reader.pages, max_pages):
+        if deadline is not None and time.monotonic() > deadline:
+            raise FutureTimeoutError()
+        page_text = page.extract_text()
+        if page_text:
+            yield page_text
+
+
+# Worker task: extracts text from pages [start, stop). Top-level so it can be pickled.
+def _extract_page_range(data: bytes, start: int, stop: int) -> list[str]:
+    from PyPDF2 import PdfReader
+    pdf_reader = PdfReader(io.BytesIO(data))
+    return [page.extract_text() or "" for page in islice(pdf_reader.pages, start, stop)]
+
+
+# Worker initializer: tells the parent which process to kill if the pool has to be replaced.
+def _report_worker_pid(worker_pids):
+    worker_pids.put(os.getpid())
+
+
+class _PagePool:
+    def __init__(self):
+        # Workers are spawned rather than forked, so they do not inherit the parent's threads, locks or loaded models
+        context = multiprocessing.get_context("spawn")
+        self.worker_pids = context.SimpleQueue()
+        self.executor = ProcessPoolExecutor(mp_context=context, initializer=_report_worker_pid, initargs=(self.worker_pids,))
+
+    # Stops the pool without waiting for running tasks, and kills its workers so a hung task cannot hold one.
+    def terminate(self):
+        import signal
+        self.executor.shutdown(wait=False, cancel_futures=True)
+        while not self.worker_pids.empty():
+            try:
+                os.kill(self.worker_pids.get(), signal.SIGTERM)
+            except OSError:
+                pass
+
+
+def _create_page_pool():
+    import atexit
+    pool = _PagePool()
+    atexit.register(pool.executor.shutdown, wait=False, cancel_futures=True)
+    return pool
+
+
+def _get_page_pool() -> _PagePool:
+    return get_or_create("pdf_page_pool", _create_page_pool)
+
+
+# Drops a pool whose tasks overran the time limit or whose worker died; the next extraction creates a new one.
+def _replace_page_pool(pool: _PagePool):
+    discard("pdf_page_pool", pool)
+    pool.terminate()
+
+
+# Yields the text of each page in order, skipping pages with no extractable text.
+def iter_pdf_pages(source, max_pages: int = MAX_PDF_PAGES, max_bytes: int = MAX_PDF_BYTES):
+    pdf_reader = _open_reader(read_pdf_bytes(source, max_bytes), max_pages)
+    yield from _iter_reader_pages(pdf_reader, max_pages)
+
+
+"""
+    Extracts text content from a PDF given as a path, bytes or binary file-like object.
+    Documents with PARALLEL_PAGE_THRESHOLD pages or more are split into page ranges
+    and extracted on a shared process pool, unless parallel is False.
+    timeout: Seconds allowed for the whole document; extraction gives up with "" after that.
+
+    ret: str: The page texts joined by newlines, or "" if the PDF could not be read.
+"""
+def extract_text_from_pdf(source, max_pages: int = MAX_PDF_PAGES, max_bytes: int = MAX_PDF_BYTES,
+                          parallel: bool = True, timeout: float = EXTRACTION_TIMEOUT) -> str:
+    deadline = time.monotonic() + timeout
+    with span("pdf_extraction") as stage:
+        try:
+            data = read_pdf_bytes(source, max_bytes)
+            pdf_reader = _open_reader(data, max_pages)
+            num_pages = min(len(pdf_reader.pages), max_pages)
+            stage.set(bytes=len(data), pages=num_pages)
+            if parallel and num_pages >= PARALLEL_PAGE_THRESHOLD:
+                pool = _get_page_pool()
+                futures = []
+                try:
+                    for start in range(0, num_pages, PAGES_PER_TASK):
+                        futures.append(pool.executor.submit(_extract_page_range, data, start,
+                                                            min(start + PAGES_PER_TASK, num_pages)))
+                    pages = [page_text for future in futures
+                             for page_text in future.result(timeout=max(deadline - time.monotonic(), 0))]
+                except (FutureTimeoutError, BrokenProcessPool):
+                    _replace_page_pool(pool)
+                    raise
+                finally:
+                    for future in futures: future.cancel()
+                text = "\n".join(page_text for page_text in pages if page_text).strip()
+            else:
+                text = "\n".join(_iter_reader_pages(pdf_reader, max_pages, deadline)).strip()
+            stage.set(chars=len(text), parallel=parallel and num_pages >= PARALLEL_PAGE_THRESHOLD)
+            return text
+        except FileNotFoundError:
+            print(f"Error: The file at {source} was not found.")
+        except PdfLimitError as e:
+            print(f"Error: {e}")
+        except FutureTimeoutError:
+            print(f"Error: PDF extraction took longer than {timeout} seconds.")
+            stage.set(timed_out=True)
+        except BrokenProcessPool:
+            print("Error: A PDF extraction worker died; the worker pool was restarted.")
+        except Exception as e:
+            # Corrupted PDFs make PyPDF2 raise all kinds of errors, not only PdfReadError
+            print(f"Error: Could not read the PDF. {type(e).__name__}: {e}")
+        stage.set(failed=True)
+    return ""
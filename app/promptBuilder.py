@@ -0,0 +1,157 @@
+import os
+import re
+from parsedResume import ParsedResume, RESUME_SECTION_HEADINGS
+
+"""
+    Token budgeting for the Gemini suggestion prompt.
+
+    Long resumes and job descriptions are compacted before they are embedded in the prompt:
+    boilerplate (EEO statements, benefits, legal notices) is dropped from the JD, only the resume
+    sections relevant to the missing keywords are kept, and both are capped to a token budget.
+    Token counts are estimated locally, so measuring a prompt costs no API call.
+"""
+
+MAX_PROMPT_TOKENS = int(os.environ.get("RESUME_ELEVATE_MAX_PROMPT_TOKENS", "4000"))
+MAX_RESUME_TOKENS = int(os.environ.get("RESUME_ELEVATE_MAX_RESUME_PROMPT_TOKENS", "1500"))
+MAX_JD_TOKENS = int(os.environ.get("RESUME_ELEVATE_MAX_JD_PROMPT_TOKENS", "1200"))
+MAX_PROMPT_KEYWORDS = 30
+
+# Roughly one token per short word or punctuation mark; long words split into several pieces
+_TOKEN_PIECE_RE = re.compile(r'\w+|[^\w\s]')
+_WORD_RE = re.compile(r'\w+')
+
+# Headings that open a JD block which can be dropped as a whole
+_JD_BOILERPLATE_HEADING_RE = re.compile(
+    r'^\W*(benefits|perks|what we offer|compensation|salary|pay range|equal (employment )?opportunity|eeo'
+    r'|diversity|accommodations?|privacy|legal|e-verify)\b',
+    re.IGNORECASE
+)
+# Boilerplate sentences that appear outside a dedicated heading
+_JD_BOILERPLATE_LINE_RE = re.compile(
+    r'\b(equal (employment )?opportunity|affirmative action|without regard to|regardless of (race|gender|age)'
+    r'|reasonable accommodations?|e-verify|paid time off|pto|health,? dental|dental,? (and )?vision'
+    r'|privacy (notice|policy))\b|\b401\(?k\b',
+    re.IGNORECASE
+)
+# Bulleted or numbered list items, which are never headings
+_LIST_ITEM_RE = re.compile(r'^\s*([\*•·–-]|\d+[.)])\s+')
+
+# Sections the suggestions always work from, even when they share no words with the missing keywords
+ALWAYS_KEPT_SECTIONS = ('experience', 'work experience', 'professional experience', 'projects', 'personal projects')
+# The prompt asks for Skills-section and GPA/CodePath advice, so these get the budget before any other section
+ESSENTIAL_SECTIONS = ('education', 'skills', 'technical skills')
+
+
+# Estimates the number of LLM tokens in text.
+def estimate_tokens(text: str) -> int:
+    return sum(1 + len(piece) // 8 for piece in _TOKEN_PIECE_RE.findall(text))
+
+
+# Cuts text to roughly max_tokens, ending on a line boundary where possible.
+def truncate_to_tokens(text: str, max_tokens: int) -> str:
+    if estimate_tokens(text) <= max_tokens: return text
+    kept_lines, used = [], 0
+    for line in text.splitlines():
+        line_tokens = estimate_tokens(line)
+        if used + line_tokens > max_tokens:
+            remaining_words = line.split()[:max(max_tokens - used, 0)]
+            if remaining_words: kept_lines.append(" ".join(remaining_words))
+            break
+        kept_lines.append(line)
+        used += line_tokens
+    return "\n".join(kept_lines) + "\n[...]"
+
+
+# Heuristic JD heading: a short line that is not a list item and ends with a colon or has no sentence
+# punctuation. strict requires a colon or title case, as loose lines inside a block often look like headings.
+def _is_heading(line: str, strict: bool = False) -> bool:
+    stripped = line.strip()
+    if not stripped or _LIST_ITEM_RE.match(line) or len(stripped.split()) > 6: return False
+    if stripped.endswith(':'): return True
+    if re.search(r'[.,;]', stripped): return False
+    return not strict or all(not word[0].isalpha() or word[0].isupper() for word in stripped.split())
+
+
+# Drops EEO statements, benefits and other boilerplate blocks from a job description.
+# A dropped block ends only at the next real section heading.
+def strip_jd_boilerplate(jd_text: str) -> str:
+    kept_lines = []
+    skipping_block = False
+    for line in jd_text.splitlines():
+        if _is_heading(line, strict=skipping_block):
+            skipping_block = bool(_JD_BOILERPLATE_HEADING_RE.match(line))
+        if skipping_block or _JD_BOILERPLATE_LINE_RE.search(line):
+            continue
+        kept_lines.append(line)
+    # Collapse the blank lines left behind by dropped blocks
+    return re.sub(r'\n\s*\n(\s*\n)+', '\n\n', "\n".join(kept_lines)).strip()
+
+
+"""
+    Splits resume text into (heading, text) sections at standard section headings.
+    Text before the first heading (name, contact details) is returned under the heading "header".
+"""
+def split_resume_sections(resume_text: "str | ParsedResume") -> list[tuple[str, str]]:
+    parsed = resume_text if isinstance(resume_text, ParsedResume) else ParsedResume(resume_text)
+    return parsed.section_texts()
+
+
+"""
+    Keeps the resume within max_tokens. A resume that fits is returned whole; otherwise only the
+    sections relevant to the missing keywords are kept. A section is relevant if it shares a word
+    with any missing keyword or is one of ALWAYS_KEPT_SECTIONS; ESSENTIAL_SECTIONS are always kept
+    first. Sections are chosen by relevance but returned in their original order. When no section
+    is relevant, the resume is kept from the top up to the budget.
+    A ParsedResume may be passed instead of the text, so its sections are not split again.
+"""
+def select_resume_sections(resume_text: "str | ParsedResume", missing_keywords: list[str],
+                           max_tokens: int = MAX_RESUME_TOKENS) -> str:
+    parsed = resume_text if isinstance(resume_text, ParsedResume) else None
+    if parsed: resume_text = parsed.text
+    if estimate_tokens(resume_text) <= max_tokens:
+        return resume_text
+    missing_words = {word for keyword in missing_keywords for word in _WORD_RE.findall(keyword.lower())}
+
+    scored_sections = []
+    for position, (heading, text) in enumerate(split_resume_sections(parsed or resume_text)):
+        overlap = len(missing_words.intersection(_WORD_RE.findall(text.lower())))
+        priority = 2 if heading in ESSENTIAL_SECTIONS else 1 if heading in ALWAYS_KEPT_SECTIONS else 0
+        if overlap or priority:
+            scored_sections.append((priority, overlap, position, text))
+    if not scored_sections:
+        return truncate_to_tokens(resume_text, max_tokens)
+
+    selected, used = [], 0
+    for priority, overlap, position, text in sorted(scored_sections, key=lambda s: (s[0], s[1]), reverse=True):
+        remaining = max_tokens - used
+        if remaining <= 0: break
+        section_tokens = estimate_tokens(text)
+        if section_tokens > remaining:
+            text = truncate_to_tokens(text, remaining)
+            section_tokens = remaining
+        selected.append((position, text))
+        used += section_tokens
+    return "\n\n".join(text for position, text in sorted(selected))
+
+
+# Orders keywords by how often they occur in the JD, most frequent first (ties alphabetically),
+# so truncating the list drops the least emphasized ones rather than the end of the alphabet.
+def rank_keywords_by_jd(keywords: list[str], jd_text: str) -> list[str]:
+    jd_lower = jd_text.lower()
+    counts = {keyword: len(re.findall(r'\b' + re.escape(keyword.lower()) + r'\b', jd_lower)) for keyword in set(keywords)}
+    return sorted(counts, key=lambda keyword: (-counts[keyword], keyword))
+
+
+"""
+    Compacts the variable parts of the suggestion prompt.
+
+    ret: tuple[str, str, list[str], list[str]]: The compacted resume text, JD text, and the
+                                                matched and missing keyword lists.
+"""
+def compact_prompt_inputs(resume_text: "str | ParsedResume", jd_text: str, matched_keywords: list[str], missing_keywords: list[str],
+                          max_resume_tokens: int = MAX_RESUME_TOKENS, max_jd_tokens: int = MAX_JD_TOKENS):
+    missing_keywords = rank_keywords_by_jd(missing_keywords, jd_text)[:MAX_PROMPT_KEYWORDS]
+    matched_keywords = rank_keywords_by_jd(matched_keywords, jd_text)[:MAX_PROMPT_KEYWORDS]
+    compact_jd = truncate_to_tokens(strip_jd_boilerplate(jd_text), max_jd_tokens)
+    compact_resume = select_resume_sections(resume_text, missing_keywords, max_resume_tokens)
+    return compact_resume, compact_jd, matched_keywords, missing_keywords
@@ -0,0 +1,325 @@
+import asyncio
+import base64
+import binascii
+import json
+import multiprocessing
+import os
+import signal
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pdfExtraction import MAX_PDF_BYTES
+from instrumentation import SpanBuffer, StageMetrics, add_span_hook
+
+"""
+    HTTP service for resume analysis, built on the standard library.
+
+    The model-bound stages run on a pool of worker processes that are started, and load the
+    models, before the server accepts traffic; each worker then serves many requests. A request
+    is admitted only while fewer than workers + max_queue analyses are in flight, so overload
+    gets an immediate 503 instead of an ever-growing queue, and each request has a deadline
+    (504 when exceeded). AI suggestions are I/O-bound, so they are awaited on one event loop in
+    the server process rather than tying up a model worker. SIGTERM/SIGINT stop accepting new
+    requests, let in-flight ones finish, then stop the workers.
+
+    Endpoints:
+        POST /analyze  {"resume_pdf": "<base64 PDF>", "job_description": "..."}
+        GET  /healthz
+        GET  /metrics  Per-stage latency, CPU time and sizes in the Prometheus text format
+"""
+
+SERVER_HOST = os.environ.get("RESUME_ELEVATE_HOST", "127.0.0.1")
+SERVER_PORT = int(os.environ.get("RESUME_ELEVATE_PORT", "8000"))
+SERVER_WORKERS = int(os.environ.get("RESUME_ELEVATE_SERVER_WORKERS", str(min(2, os.cpu_count() or 1))))
+# Analyses allowed to wait for a free worker; past workers + max queue, requests are rejected with 503
+SERVER_MAX_QUEUE = int(os.environ.get("RESUME_ELEVATE_SERVER_MAX_QUEUE", str(2 * SERVER_WORKERS)))
+REQUEST_TIMEOUT_SECONDS = float(os.environ.get("RESUME_ELEVATE_REQUEST_TIMEOUT_SECONDS", "120"))
+# Base64 grows the PDF by a third; the rest is headroom for the job description
+MAX_REQUEST_BYTES = MAX_PDF_BYTES * 4 // 3 + 1024 * 1024
+RETRY_AFTER_SECONDS = 1
+
+
+# --- Worker process ---
+# Spans recorded in this worker since its last task; each worker runs one analysis at a time,
+# so they all belong to that analysis and are returned with its result
+_WORKER_SPANS = SpanBuffer()
+# Set in the workers of a pool that start() waits for
+_READY_BARRIER = None
+
+# Runs once in each worker before it takes requests.
+def _init_worker(slot_counter, workers: int, threads_per_worker: int, ready_barrier=None):
+    global _READY_BARRIER
+    # Split the cores between workers instead of every worker's torch claiming all of them
+    for variable in ("OMP_NUM_THREADS", "MKL_NUM_THREADS"):
+        os.environ.setdefault(variable, str(threads_per_worker))
+    os.environ.setdefault("TOKENIZERS_PARALLELISM", "false")
+    with slot_counter.get_lock():
+        # Each pool (re)start is a new generation of worker slots
+        generation, slot = divmod(slot_counter.value, workers)
+        slot_counter.value += 1
+
+    import analyzer
+    import pdfExtraction
+    # The embedding cache is owned by a single process, so each worker slot gets its own directory.
+    # Workers of a replaced pool may still be finishing, so a restarted pool does not reuse their directories.
+    analyzer.EMBEDDING_CACHE_DIR = os.path.join(analyzer.EMBEDDING_CACHE_DIR, f"worker-{generation}-{slot}")
+    # Requests already run in parallel across workers; do not fan one PDF out to a nested pool
+    pdfExtraction.PARALLEL_PAGE_THRESHOLD = pdfExtraction.MAX_PDF_PAGES + 1
+    print(f"[INFO] Worker {slot} (pid {os.getpid()}) models: {analyzer.warmup(include_gemini=False)}")
+    add_span_hook(_WORKER_SPANS)
+    _READY_BARRIER = ready_barrier
+
+
+# Blocks until every worker of the pool runs it, so each worker answers exactly once.
+def _worker_ready() -> int:
+    _READY_BARRIER.wait()
+    return os.getpid()
+
+
+def _analyze_in_worker(pdf_bytes: bytes, job_description_text: str):
+    import analyzer
+    _WORKER_SPANS.drain()
+    results, parsed_resume = analyzer.run_model_analysis(pdf_bytes, job_description_text)
+    return results, parsed_resume, _WORKER_SPANS.drain()
+
+
+class RequestError(Exception):
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+class AnalysisServer:
+    def __init__(self, host: str = SERVER_HOST, port: int = SERVER_PORT, workers: int = SERVER_WORKERS,
+                 max_queue: int = SERVER_MAX_QUEUE, request_timeout: float = REQUEST_TIMEOUT_SECONDS):
+        self.workers = workers
+        self.capacity = workers + max_queue
+        self.request_timeout = request_timeout
+        self.draining = False
+        self.in_flight = 0
+        self.rejected = 0
+        self.timed_out = 0
+        self._lock = threading.Lock()
+        self._mp_context = multiprocessing.get_context("spawn")
+        self._slot_counter = self._mp_context.Value("i", 0)
+        self._pool = None
+        self.worker_pids = set()
+        # Stage metrics from the workers' spans, plus the suggestion spans recorded in this process
+        self.metrics = StageMetrics()
+        add_span_hook(self.metrics)
+        # Event loop for the suggestion calls, so they share one LLM semaphore and the async cache coalescing
+        self._loop = asyncio.new_event_loop()
+        self._loop_thread = threading.Thread(target=self._loop.run_forever, name="llm-loop", daemon=True)
+        self.httpd = _AnalysisHTTPServer((host, port), _AnalysisRequestHandler)
+        self.httpd.app = self
+
+    # Starts the worker processes and waits until every one has loaded its models.
+    def start(self):
+        self._pool = self._create_pool(ready_barrier=self._mp_context.Barrier(self.workers))
+        # Workers run their initializer before any task, and none can take a second task
+        # until all of them are waiting at the barrier
+        ready = [self._pool.submit(_worker_ready) for _ in range(self.workers)]
+        self.worker_pids = {future.result() for future in ready}
+        print(f"[INFO] Started {len(self.worker_pids)} analysis workers.")
+        self._loop_thread.start()
+
+    def _create_pool(self, ready_barrier=None) -> ProcessPoolExecutor:
+        threads_per_worker = max(1, (os.cpu_count() or 1) // self.workers)
+        return ProcessPoolExecutor(
+            max_workers=self.workers, mp_context=self._mp_context, initializer=_init_worker,
+            initargs=(self._slot_counter, self.workers, threads_per_worker, ready_barrier)
+        )
+
+    # Replaces a pool whose worker died, so later requests are served again.
+    def _restart_pool(self, broken_pool: ProcessPoolExecutor):
+        with self._lock:
+            if self._pool is not broken_pool: return
+            print("[WARN] An analysis worker died; restarting the worker pool.")
+            self._pool = self._create_pool()
+        broken_pool.shutdown(wait=False)
+
+    def _admit(self) -> bool:
+        with self._lock:
+            if self.draining or self.in_flight >= self.capacity:
+                self.rejected += 1
+                return False
+            self.in_flight += 1
+            return True
+
+    def _release(self, _future=None):
+        with self._lock:
+            self.in_flight -= 1
+
+    """
+        Runs one analysis: the model stages on a worker process, then the AI suggestions.
+        Raises RequestError with the HTTP status to return when the request cannot be served.
+    """
+    def analyze(self, pdf_bytes: bytes, job_description_text: str) -> dict:
+        deadline = time.monotonic() + self.request_timeout
+        if not self._admit():
+            raise RequestError(503, "Server is shutting down." if self.draining else "Server is busy; retry shortly.")
+        pool = self._pool
+        try:
+            future = pool.submit(_analyze_in_worker, pdf_bytes, job_description_text)
+        except BrokenProcessPool:
+            self._release()
+            self._restart_pool(pool)
+            raise RequestError(503, "Analysis workers are restarting; retry shortly.")
+        # The slot is freed when the worker finishes, not when the caller gives up, so a timed-out
+        # analysis still counts against capacity while it occupies a worker
+        future.add_done_callback(self._release)
+
+        try:
+            results, parsed_resume, spans = future.result(timeout=max(deadline - time.monotonic(), 0))
+        except FutureTimeoutError:
+            with self._lock: self.timed_out += 1
+            raise RequestError(504, f"Analysis did not finish within {self.request_timeout:g} seconds.")
+        except BrokenProcessPool:
+            self._restart_pool(pool)
+            raise RequestError(500, "The analysis worker crashed.")
+        for record in spans: self.metrics.observe(record)
+        if "error" in results:
+            raise RequestError(422, results["error"])
+
+        import analyzer
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            with self._lock: self.timed_out += 1
+            raise RequestError(504, f"Analysis did not finish within {self.request_timeout:g} seconds.")
+        suggestions = analyzer.generate_improvement_suggestions_async(
+            parsed_resume, job_description_text,
+            results["matched_keywords"], results["missing_keywords"], results["codepath_format_feedback"],
+            results["weighted_score"], results["semantic_score"], timeout=remaining
+        )
+        suggestions_future = asyncio.run_coroutine_threadsafe(suggestions, self._loop)
+        try:
+            # The LLM call has its own timeout; this also bounds waiting for the LLM semaphore
+            results["suggestions"] = suggestions_future.result(timeout=max(deadline - time.monotonic(), 0))
+        except FutureTimeoutError:
+            suggestions_future.cancel()
+            with self._lock: self.timed_out += 1
+            raise RequestError(504, f"Analysis did not finish within {self.request_timeout:g} seconds.")
+        return results
+
+    def health(self) -> dict:
+        with self._lock:
+            return {
+                "status": "draining" if self.draining else "ok",
+                "workers": self.workers,
+                "in_flight": self.in_flight,
+                "capacity": self.capacity,
+                "rejected": self.rejected,
+                "timed_out": self.timed_out
+            }
+
+    def render_metrics(self) -> str:
+        health = self.health()
+        return self.metrics.render({
+            "server_in_flight": health["in_flight"],
+            "server_capacity": health["capacity"],
+            "server_rejected_requests": health["rejected"],
+            "server_timed_out_requests": health["timed_out"]
+        })
+
+    # Serves until shutdown() is called, then waits for in-flight requests and stops the workers.
+    def serve_forever(self):
+        try:
+            self.httpd.serve_forever()
+        finally:
+            # Joins the request threads, so every admitted request gets its response
+            self.httpd.server_close()
+            self._pool.shutdown(wait=True)
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._loop_thread.join()
+            print("[INFO] Server stopped.")
+
+    # Stops accepting requests. Safe to call from a signal handler.
+    def shutdown(self):
+        if self.draining: return
+        print("[INFO] Shutting down; finishing in-flight requests.")
+        self.draining = True
+        # httpd.shutdown() blocks until serve_forever returns, so it cannot run on the serving thread
+        threading.Thread(target=self.httpd.shutdown, name="shutdown").start()
+
+
+class _AnalysisHTTPServer(ThreadingHTTPServer):
+    # Request threads are joined on close, which is what lets shutdown drain in-flight requests
+    daemon_threads = False
+    block_on_close = True
+    request_queue_size = 128
+
+
+class _AnalysisRequestHandler(BaseHTTPRequestHandler):
+    server_version = "ResumeElevate/1.0"
+
+    def do_GET(self):
+        if self.path == "/healthz":
+            health = self.server.app.health()
+            self._send_json(503 if health["status"] == "draining" else 200, health)
+        elif self.path == "/metrics":
+            self._send(200, "text/plain; version=0.0.4; charset=utf-8", self.server.app.render_metrics().encode("utf-8"))
+        else:
+            self._send_json(404, {"error": f"Unknown path {self.path}."})
+
+    def do_POST(self):
+        if self.path != "/analyze":
+            self._send_json(404, {"error": f"Unknown path {self.path}."})
+            return
+        try:
+            pdf_bytes, job_description_text = self._read_analyze_request()
+            self._send_json(200, self.server.app.analyze(pdf_bytes, job_description_text))
+        except RequestError as e:
+            self._send_json(e.status, {"error": str(e)})
+        except Exception as e:
+            print(f"Error: Analysis request failed. {e}")
+            self._send_json(500, {"error": "Internal server error."})
+
+    def _read_analyze_request(self) -> tuple[bytes, str]:
+        try:
+            length = int(self.headers.get("Content-Length", ""))
+        except ValueError:
+            raise RequestError(411, "Content-Length is required.")
+        if length > MAX_REQUEST_BYTES:
+            raise RequestError(413, f"Request body is larger than the {MAX_REQUEST_BYTES} byte limit.")
+        try:
+            payload = json.loads(self.rfile.read(length))
+            pdf_bytes = base64.b64decode(payload["resume_pdf"], validate=True)
+            job_description_text = payload["job_description"]
+        except (ValueError, KeyError, TypeError, binascii.Error):
+            raise RequestError(400, 'Expected a JSON body with "resume_pdf" (base64) and "job_description".')
+        if not isinstance(job_description_text, str) or not job_description_text.strip():
+            raise RequestError(400, '"job_description" must be a non-empty string.')
+        if len(pdf_bytes) > MAX_PDF_BYTES:
+            raise RequestError(413, f"PDF is larger than the {MAX_PDF_BYTES} byte limit.")
+        return pdf_bytes, job_description_text
+
+    def _send_json(self, status: int, body: dict):
+        self._send(status, "application/json", json.dumps(body).encode("utf-8"))
+
+    def _send(self, status: int, content_type: str, data: bytes):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        if status == 503:
+            self.send_header("Retry-After", str(RETRY_AFTER_SECONDS))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        print(f"[INFO] {self.address_string()} {format % args}")
+
+
+def main():
+    server = AnalysisServer()
+    server.start()
+    signal.signal(signal.SIGTERM, lambda signum, frame: server.shutdown())
+    signal.signal(signal.SIGINT, lambda signum, frame: server.shutdown())
+    host, port = server.httpd.server_address[:2]
+    print(f"[INFO] Serving resume analysis on http://{host}:{port} (workers={server.workers}, capacity={server.capacity}).")
+    server.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
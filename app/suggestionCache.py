@@ -0,0 +1,160 @@
+import asyncio
+import hashlib
+import json
+import os
+import threading
+import time
+from concurrent.futures import Future
+from ttlCache import TTLCache
+
+"""
+    Cache for LLM-generated resume suggestions.
+
+    Responses are keyed by a hash of the normalized prompt inputs and kept both in memory and
+    on disk (one JSON file per key), expiring after ttl_seconds. Concurrent requests for the
+    same key are coalesced: the first caller generates the response and the others wait for it,
+    so a burst of identical submissions costs a single API call.
+    Only successful responses are cached; a failing generate callable should raise.
+    Expired files are pruned from disk by put(), at most once every prune_interval_seconds.
+"""
+class SuggestionCache:
+    def __init__(self, cache_dir: str, ttl_seconds: float = 7 * 24 * 3600, max_memory_entries: int = 1024,
+                 prune_interval_seconds: float = 3600):
+        self.cache_dir = cache_dir
+        self.ttl_seconds = ttl_seconds
+        self.prune_interval_seconds = prune_interval_seconds
+        self._last_prune = time.monotonic()
+        self.coalesced = 0
+        self._memory = TTLCache(max_memory_entries, ttl_seconds)
+        self._lock = threading.Lock()
+        self._in_flight: dict[str, Future] = {}
+        self._async_in_flight: dict[tuple[int, str], asyncio.Task] = {}
+        os.makedirs(cache_dir, exist_ok=True)
+
+    # Builds the cache key from the suggestion inputs. Whitespace is collapsed, scores are rounded
+    # to the precision shown in the prompt and keyword lists are sorted, so equivalent requests share a key.
+    @staticmethod
+    def make_key(model_name: str, resume_text: str, jd_text: str, matched_keywords: list[str],
+                 missing_keywords: list[str], format_feedback: list[str], weighted_score: float,
+                 semantic_score: float) -> str:
+        normalized = {
+            "model": model_name,
+            "resume": " ".join(resume_text.split()),
+            "jd": " ".join(jd_text.split()),
+            "matched": sorted(matched_keywords),
+            "missing": sorted(missing_keywords),
+            "format": list(format_feedback),
+            "weighted_score": round(weighted_score, 2),
+            "semantic_score": round(semantic_score, 2)
+        }
+        return hashlib.sha256(json.dumps(normalized, sort_keys=True).encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> str | None:
+        text = self._memory.get(key)
+        if text is not None: return text
+        path = self._path(key)
+        try:
+            with open(path, "r") as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        age = time.time() - entry.get("created_at", 0)
+        if age >= self.ttl_seconds:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            return None
+        self._memory.put(key, entry["text"], ttl_seconds=self.ttl_seconds - age)
+        return entry["text"]
+
+    def put(self, key: str, text: str):
+        self._memory.put(key, text)
+        path = self._path(key)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp_path, "w") as f:
+                json.dump({"created_at": time.time(), "text": text}, f)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"[WARN] Could not persist suggestion cache entry. {e}")
+        with self._lock:
+            prune_due = time.monotonic() - self._last_prune >= self.prune_interval_seconds
+            if prune_due: self._last_prune = time.monotonic()
+        if prune_due: self.prune()
+
+    # Returns the cached response for key, or calls generate() once even if several threads ask at the same time.
+    def get_or_generate(self, key: str, generate) -> str:
+        text = self.get(key)
+        if text is not None: return text
+
+        with self._lock:
+            # The previous owner may have stored the response and left since the check above
+            text = self.get(key)
+            if text is not None: return text
+            future = self._in_flight.get(key)
+            is_owner = future is None
+            if is_owner:
+                future = self._in_flight[key] = Future()
+            else:
+                self.coalesced += 1
+        if not is_owner: return future.result()
+
+        try:
+            text = generate()
+            self.put(key, text)
+            future.set_result(text)
+            return text
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                self._in_flight.pop(key, None)
+
+    # Async counterpart of get_or_generate; generate is a coroutine function.
+    async def get_or_generate_async(self, key: str, generate) -> str:
+        text = self.get(key)
+        if text is not None: return text
+
+        flight_key = (id(asyncio.get_running_loop()), key)
+        task = self._async_in_flight.get(flight_key)
+        if task is None:
+            task = asyncio.ensure_future(self._generate_async(key, generate))
+            self._async_in_flight[flight_key] = task
+            task.add_done_callback(lambda _: self._async_in_flight.pop(flight_key, None))
+        else:
+            self.coalesced += 1
+        # Shielded so that one cancelled waiter does not cancel the shared call
+        return await asyncio.shield(task)
+
+    async def _generate_async(self, key: str, generate) -> str:
+        # Another event loop or thread may have stored the response since get_or_generate_async checked
+        text = self.get(key)
+        if text is not None: return text
+        text = await generate()
+        self.put(key, text)
+        return text
+
+    # Deletes expired entries from disk.
+    def prune(self) -> int:
+        removed = 0
+        now = time.time()
+        for name in os.listdir(self.cache_dir):
+            if not name.endswith(".json"): continue
+            path = os.path.join(self.cache_dir, name)
+            try:
+                with open(path, "r") as f:
+                    created_at = json.load(f).get("created_at", 0)
+                if now - created_at >= self.ttl_seconds:
+                    os.remove(path)
+                    removed += 1
+            except (OSError, ValueError):
+                continue
+        return removed
+
+    def stats(self) -> dict:
+        return {**self._memory.stats(), "coalesced": self.coalesced}
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.json")
@@ -0,0 +1,177 @@
+import json
+import os
+import numpy as np
+from analyzer import encode_texts
+from modelRegistry import get_sentence_model
+
+"""
+    Local, CPU-only vector index over job description embeddings for "which roles fit this
+    resume" retrieval.
+
+    Embeddings from the analyzer's sentence encoder are L2-normalized and stored either as
+    float32 or as int8 with a per-vector scale (4x smaller). Search is an exact (flat) inner
+    product over the whole matrix, which for normalized vectors is cosine similarity; with the
+    384-dim MiniLM embeddings this stays fast well into hundreds of thousands of jobs.
+    Saved indexes are memory-mapped on load.
+"""
+
+QUANTIZATIONS = ("float32", "int8")
+# Rows of an int8 index converted to float32 at a time while scoring
+SCORE_BLOCK_ROWS = 4096
+
+
+class VectorIndex:
+    META_FILE = "meta.json"
+    VECTORS_FILE = "vectors.npy"
+    SCALES_FILE = "scales.npy"
+
+    def __init__(self, quantization: str = "float32"):
+        if quantization not in QUANTIZATIONS:
+            raise ValueError(f"quantization must be one of {QUANTIZATIONS}, got '{quantization}'")
+        self.quantization = quantization
+        self.job_ids: list = []
+        self._chunks: list[np.ndarray] = []
+        self._scale_chunks: list[np.ndarray] = []
+        self._vectors = None
+        self._scales = None
+
+    def __len__(self) -> int:
+        return len(self.job_ids)
+
+    # Encodes and adds job descriptions in batches of batch_size; job_ids are returned by search.
+    def add_texts(self, job_ids: list, texts: list[str], batch_size: int = 256):
+        for start in range(0, len(texts), batch_size):
+            self.add_embeddings(job_ids[start:start + batch_size], _encode(texts[start:start + batch_size]))
+
+    # Adds precomputed embeddings, one row per job id.
+    def add_embeddings(self, job_ids: list, embeddings: np.ndarray):
+        embeddings = _normalize(np.asarray(embeddings, dtype=np.float32))
+        if self.quantization == "int8":
+            scales = np.abs(embeddings).max(axis=1, keepdims=True) / 127.0
+            scales[scales == 0] = 1.0
+            self._chunks.append(np.round(embeddings / scales).astype(np.int8))
+            self._scale_chunks.append(scales.astype(np.float32).ravel())
+        else:
+            self._chunks.append(embeddings)
+        self.job_ids.extend(job_ids)
+
+    # Merges pending batches into one matrix so searches are a single matrix-vector product.
+    def _consolidate(self):
+        if not self._chunks: return
+        parts = ([self._vectors] if self._vectors is not None else []) + self._chunks
+        self._vectors = np.concatenate(parts)
+        self._chunks = []
+        if self.quantization == "int8":
+            scale_parts = ([self._scales] if self._scales is not None else []) + self._scale_chunks
+            self._scales = np.concatenate(scale_parts)
+            self._scale_chunks = []
+
+    # Cosine similarity of query_embedding against every indexed job.
+    def scores(self, query_embedding: np.ndarray) -> np.ndarray:
+        self._consolidate()
+        if self._vectors is None: return np.zeros(0, dtype=np.float32)
+        query = _normalize(np.asarray(query_embedding, dtype=np.float32).reshape(1, -1))[0]
+        if self.quantization == "int8":
+            # Converting the whole (possibly memory-mapped) matrix per query would allocate 4x its size
+            scores = np.empty(len(self._vectors), dtype=np.float32)
+            for start in range(0, len(self._vectors), SCORE_BLOCK_ROWS):
+                block = self._vectors[start:start + SCORE_BLOCK_ROWS]
+                np.matmul(block.astype(np.float32), query, out=scores[start:start + len(block)])
+            scores *= self._scales
+            return scores
+        return self._vectors @ query
+
+    """
+        Returns the k jobs whose descriptions are semantically closest to resume_text.
+
+        ret: list[tuple]: (job_id, semantic_score) pairs, best first.
+    """
+    def search(self, resume_text: str, k: int = 10) -> list[tuple]:
+        return self.search_embedding(_encode([resume_text])[0], k)
+
+    def search_embedding(self, query_embedding: np.ndarray, k: int = 10) -> list[tuple]:
+        scores = self.scores(query_embedding)
+        if not len(scores) or k <= 0: return []
+        k = min(k, len(scores))
+        best = np.argpartition(-scores, k - 1)[:k]
+        best = best[np.argsort(-scores[best], kind="stable")]
+        return [(self.job_ids[i], round(float(scores[i]), 4)) for i in best]
+
+    def save(self, directory: str):
+        self._consolidate()
+        os.makedirs(directory, exist_ok=True)
+        if self._vectors is not None:
+            np.save(os.path.join(directory, self.VECTORS_FILE), self._vectors)
+        if self.quantization == "int8":
+            scales = self._scales if self._scales is not None else np.zeros(0, dtype=np.float32)
+            np.save(os.path.join(directory, self.SCALES_FILE), scales)
+        with open(os.path.join(directory, self.META_FILE), "w") as f:
+            json.dump({"quantization": self.quantization, "job_ids": self.job_ids}, f)
+
+    # Loads an index written by save(); the vector matrix is memory-mapped rather than read into RAM.
+    @classmethod
+    def load(cls, directory: str) -> "VectorIndex":
+        with open(os.path.join(directory, cls.META_FILE), "r") as f:
+            meta = json.load(f)
+        index = cls(meta["quantization"])
+        index.job_ids = meta["job_ids"]
+        vectors_path = os.path.join(directory, cls.VECTORS_FILE)
+        if os.path.exists(vectors_path):
+            index._vectors = np.load(vectors_path, mmap_mode="r")
+        # Indexes saved with no rows may have no scales file
+        if index.quantization == "int8" and index._vectors is not None:
+            index._scales = np.load(os.path.join(directory, cls.SCALES_FILE), mmap_mode="r")
+        return index
+
+
+# encode_texts, with a clear error instead of an AttributeError when the sentence model could not be loaded.
+def _encode(texts: list[str]) -> np.ndarray:
+    if not get_sentence_model():
+        raise RuntimeError("The sentence model is not available, so job descriptions cannot be encoded. "
+                           "Install sentence-transformers to use the vector index.")
+    return encode_texts(texts)
+
+
+def _normalize(embeddings: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return embeddings / norms
+
+
+"""
+    Ranks jobs for a resume by blending semantic similarity with the weighted keyword score.
+    Candidates are the union of the top-k hits of the vector index and of the keyword JobIndex;
+    both indexes must use the same job ids (row order of the parsed JD file).
+
+    semantic_weight: Share of the final score given to semantic similarity (0-1.0).
+
+    ret: list[dict]: Up to k rows of {"job_id", "score", "semantic_score", "weighted_score"}, best first.
+"""
+def rank_jobs(resume_text: str, resume_keywords: list[str], vector_index: VectorIndex, job_index=None,
+              k: int = 10, semantic_weight: float = 0.5, candidate_pool: int = 100) -> list[dict]:
+    semantic_scores = vector_index.scores(_encode([resume_text])[0])
+    if not len(semantic_scores): return []
+    position_of_job = {job_id: position for position, job_id in enumerate(vector_index.job_ids)}
+
+    pool = min(candidate_pool, len(semantic_scores))
+    candidates = {vector_index.job_ids[i] for i in np.argpartition(-semantic_scores, pool - 1)[:pool]}
+    keyword_scores = {}
+    if job_index is not None:
+        candidates.update(row["job_id"] for row in job_index.top_k(resume_keywords, candidate_pool))
+        # Scored for every candidate, not only the keyword top-k, so semantic hits are not ranked as keyword misses
+        scored_ids = [job_id for job_id in candidates if 0 <= job_id < len(job_index)]
+        keyword_scores = dict(zip(scored_ids, job_index.weighted_scores(resume_keywords, scored_ids).tolist()))
+
+    results = []
+    for job_id in candidates:
+        position = position_of_job.get(job_id)
+        semantic_score = float(semantic_scores[position]) if position is not None else 0.0
+        weighted_score = keyword_scores.get(job_id, 0.0)
+        results.append({
+            "job_id": job_id,
+            "score": round(semantic_weight * semantic_score + (1 - semantic_weight) * weighted_score, 4),
+            "semantic_score": round(semantic_score, 2),
+            "weighted_score": weighted_score
+        })
+    results.sort(key=lambda row: row["score"], reverse=True)
+    return results[:k]
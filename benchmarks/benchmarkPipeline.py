@@ -0,0 +1,254 @@
+import argparse
+import glob
+import json
+import os
+import platform
+import random
+import resource
+import statistics
+import subprocess
+import sys
+import time
+
+"""
+    Benchmarks the stages of the resume analysis pipeline on the bundled resume PDFs and
+    synthetic job descriptions of increasing size.
+
+    Every stage runs once "cold" (the first call in this process, including any lazy model
+    loading it triggers) and then --repeats times "warm". Wall time, CPU time and the process's
+    peak RSS are recorded per stage and input, and the results are written as JSON so two
+    commits can be compared with --compare.
+
+    Usage (from the repository root):
+        python benchmarks/benchmarkPipeline.py --output bench.json
+        python benchmarks/benchmarkPipeline.py --output new.json --compare bench.json
+
+    Stages whose dependencies are not installed (KeyBERT, sentence-transformers, spaCy) are
+    reported as skipped. The persistent embedding cache is disabled unless --embedding-cache
+    is given, so warm encoder timings measure the model rather than cache hits.
+"""
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APP_DIR = os.path.join(REPO_DIR, "app")
+JOB_DESCRIPTIONS_DIR = os.path.join(APP_DIR, "jobDescriptions")
+sys.path[:0] = [APP_DIR, JOB_DESCRIPTIONS_DIR]
+
+RESUME_DIRS = [os.path.join(APP_DIR, "data", "resumeTraining"), os.path.join(APP_DIR, "data", "codepathResumeTemplates")]
+# Synthetic JD sizes, as the number of requirement bullets
+JD_SIZES = (5, 20, 80)
+# score_resume sizes, as the number of keywords on each side
+KEYWORD_COUNTS = (10, 100, 1000)
+
+_JD_INTRO = "We are seeking a Software Engineer to join our platform team and build reliable services."
+_JD_BULLETS = (
+    "Experience with {skill} in production systems.",
+    "{years}+ years of experience building software with {skill}.",
+    "Strong understanding of {skill} and {other}.",
+    "Design, build and maintain services using {skill}.",
+    "Collaborate with product and design to ship features on {skill}."
+)
+_JD_BOILERPLATE = (
+    "Benefits\nWe offer health, dental and vision insurance, 401(k) matching and paid time off.\n"
+    "Equal Opportunity\nWe are an equal opportunity employer and value diversity."
+)
+
+
+def peak_rss_mb() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in kilobytes on Linux and bytes on macOS
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def git_commit() -> str | None:
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], cwd=REPO_DIR, capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def load_skills() -> list[str]:
+    with open(os.path.join(JOB_DESCRIPTIONS_DIR, "skills.txt"), "r") as f:
+        return [line.strip() for line in f if line.strip()]
+
+
+# Builds a deterministic job description with num_bullets required and num_bullets // 2 preferred bullets.
+def make_job_description(num_bullets: int, skills: list[str], seed: int = 0) -> str:
+    rng = random.Random(seed + num_bullets)
+    def bullet():
+        template = rng.choice(_JD_BULLETS)
+        return "- " + template.format(skill=rng.choice(skills), other=rng.choice(skills), years=rng.randint(1, 8))
+    required = "\n".join(bullet() for _ in range(num_bullets))
+    preferred = "\n".join(bullet() for _ in range(max(num_bullets // 2, 1)))
+    return f"{_JD_INTRO}\nRequirements:\n{required}\nPreferred Qualifications:\n{preferred}\n{_JD_BOILERPLATE}"
+
+
+# Times fn() once cold and `repeats` times warm; exceptions propagate to the caller.
+def time_stage(fn, repeats: int) -> dict:
+    def run_once():
+        wall_start, cpu_start = time.perf_counter(), time.process_time()
+        fn()
+        return (time.perf_counter() - wall_start) * 1000, (time.process_time() - cpu_start) * 1000
+    cold_wall, cold_cpu = run_once()
+    warm = [run_once() for _ in range(repeats)]
+    warm_wall = sorted(wall for wall, _ in warm)
+    result = {"cold_ms": round(cold_wall, 3), "cold_cpu_ms": round(cold_cpu, 3)}
+    if warm_wall:
+        result["warm_ms"] = {
+            "min": round(warm_wall[0], 3),
+            "median": round(statistics.median(warm_wall), 3),
+            "p95": round(warm_wall[min(int(len(warm_wall) * 0.95), len(warm_wall) - 1)], 3),
+            "mean": round(statistics.fmean(warm_wall), 3)
+        }
+        result["warm_cpu_ms"] = round(statistics.fmean(cpu for _, cpu in warm), 3)
+    result["peak_rss_mb"] = peak_rss_mb()
+    return result
+
+
+class BenchmarkRun:
+    def __init__(self, repeats: int):
+        self.repeats = repeats
+        self.results = []
+
+    def measure(self, stage: str, input_name: str, size: dict, fn):
+        row = {"stage": stage, "input": input_name, "size": size}
+        try:
+            row.update(time_stage(fn, self.repeats))
+        except Exception as e:
+            row["skipped"] = f"{type(e).__name__}: {e}"
+        self.results.append(row)
+        timing = f"{row['cold_ms']:.1f} ms cold, {row['warm_ms']['median']:.1f} ms warm" if "warm_ms" in row else row.get("skipped", "")
+        print(f"[INFO] {stage:<24} {input_name:<40} {timing}")
+
+    def skip(self, stage: str, reason: str):
+        self.results.append({"stage": stage, "input": None, "size": {}, "skipped": reason})
+        print(f"[WARN] {stage:<24} skipped: {reason}")
+
+
+def run_benchmarks(args) -> dict:
+    import analyzer
+    from modelRegistry import get_or_create, get_sentence_model, get_keybert_model
+    from pdfExtraction import extract_text_from_pdf
+    if not args.embedding_cache:
+        # The registry caches None, so encode_texts runs without the persistent cache
+        get_or_create("embedding_cache", lambda: None)
+
+    run = BenchmarkRun(args.repeats)
+    skills = load_skills()
+    pdf_paths = sorted(path for directory in RESUME_DIRS for path in glob.glob(os.path.join(directory, "*.pdf")))
+    job_descriptions = {size: make_job_description(size, skills) for size in args.jd_sizes}
+
+    # --- Resume-side stages, once per bundled PDF ---
+    resume_texts = {}
+    for path in pdf_paths:
+        name = os.path.basename(path)
+        with open(path, "rb") as f:
+            pdf_bytes = f.read()
+        run.measure("pdf_extraction", name, {"bytes": len(pdf_bytes)}, lambda: extract_text_from_pdf(pdf_bytes))
+        resume_texts[name] = extract_text_from_pdf(pdf_bytes)
+    for name, text in resume_texts.items():
+        run.measure("format_checks", name, {"chars": len(text)}, lambda: analyzer.check_codepath_student_resume_format(text))
+
+    # --- score_resume across keyword list sizes ---
+    rng = random.Random(0)
+    vocabulary = [f"skill {i}" for i in range(max(args.keyword_counts) * 2)]
+    for count in args.keyword_counts:
+        resume_keywords = rng.sample(vocabulary, count)
+        required, preferred = rng.sample(vocabulary, count), rng.sample(vocabulary, count // 2)
+        run.measure("score_resume", f"{count} keywords", {"keywords": count},
+                    lambda: analyzer.score_resume(resume_keywords, required, preferred))
+
+    # --- Model stages; the first measured call includes loading the models ---
+    load_start = time.perf_counter()
+    models_available = get_sentence_model() is not None
+    if models_available:
+        run.results.append({"stage": "model_load", "input": "sentence model", "size": {},
+                            "cold_ms": round((time.perf_counter() - load_start) * 1000, 3), "peak_rss_mb": peak_rss_mb()})
+        largest_resume = max(resume_texts.values(), key=len, default="")
+        for size, jd_text in job_descriptions.items():
+            run.measure("semantic_similarity", f"largest resume vs JD x{size}", {"jd_chars": len(jd_text)},
+                        lambda: analyzer.get_semantic_similarity(largest_resume, jd_text))
+    else:
+        run.skip("semantic_similarity", "sentence-transformers model is not available")
+    if models_available and get_keybert_model() is not None:
+        for name, text in resume_texts.items():
+            run.measure("extract_keywords", name, {"chars": len(text)}, lambda: analyzer.extract_keywords(text))
+        for size, jd_text in job_descriptions.items():
+            run.measure("extract_keywords", f"JD x{size}", {"chars": len(jd_text)}, lambda: analyzer.extract_keywords(jd_text))
+    else:
+        run.skip("extract_keywords", "KeyBERT is not available")
+
+    # --- JD parsing with spaCy ---
+    try:
+        parser = _build_job_description_parser()
+    except Exception as e:
+        run.skip("parse_job_description", f"{type(e).__name__}: {e}")
+    else:
+        for size, jd_text in job_descriptions.items():
+            run.measure("parse_job_description", f"JD x{size}", {"chars": len(jd_text)},
+                        lambda: parser.parse_job_description(jd_text))
+
+    return {
+        "meta": {
+            "commit": git_commit(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "repeats": args.repeats,
+            "embedding_cache": args.embedding_cache,
+            "peak_rss_mb": peak_rss_mb()
+        },
+        "results": run.results
+    }
+
+
+# JobDescriptionParser reads its keyword lists relative to the working directory.
+def _build_job_description_parser():
+    from jobDescriptions import JobDescriptionParser, KeywordAutomaton
+    cwd = os.getcwd()
+    os.chdir(JOB_DESCRIPTIONS_DIR)
+    try:
+        parser = JobDescriptionParser()
+    finally:
+        os.chdir(cwd)
+    qualifications_path = os.path.join(REPO_DIR, "qualifications.txt")
+    if not parser.qualification_keywords and os.path.exists(qualifications_path):
+        parser.qualification_keywords = parser._load_keywords(qualifications_path)
+        parser.qualification_automaton = KeywordAutomaton(parser.qualification_keywords)
+    return parser
+
+
+# Prints the warm median of each stage/input relative to a previous run.
+def compare(current: dict, baseline: dict):
+    def medians(report):
+        return {(row["stage"], row["input"]): row["warm_ms"]["median"] for row in report["results"] if "warm_ms" in row}
+    before, after = medians(baseline), medians(current)
+    print(f"\nCompared with {baseline['meta'].get('commit') or 'baseline'} (warm median):")
+    for key in sorted(before.keys() & after.keys(), key=str):
+        ratio = after[key] / before[key] if before[key] else float("inf")
+        print(f"  {key[0]:<24} {key[1]:<40} {before[key]:>10.2f} -> {after[key]:>10.2f} ms  ({ratio:.2f}x)")
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="Benchmark the resume analysis pipeline.")
+    arg_parser.add_argument("--output", default="benchmark_results.json", help="Where to write the JSON report.")
+    arg_parser.add_argument("--repeats", type=int, default=5, help="Warm runs per stage and input.")
+    arg_parser.add_argument("--jd-sizes", type=int, nargs="+", default=list(JD_SIZES),
+                            help="Synthetic JD sizes, in requirement bullets.")
+    arg_parser.add_argument("--keyword-counts", type=int, nargs="+", default=list(KEYWORD_COUNTS),
+                            help="Keyword list sizes for score_resume.")
+    arg_parser.add_argument("--embedding-cache", action="store_true", help="Keep the persistent embedding cache enabled.")
+    arg_parser.add_argument("--compare", help="A previous JSON report to compare against.")
+    args = arg_parser.parse_args()
+
+    report = run_benchmarks(args)
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"[INFO] Wrote {len(report['results'])} results to {args.output} (peak RSS {report['meta']['peak_rss_mb']} MB).")
+    if args.compare:
+        with open(args.compare, "r") as f:
+            compare(report, json.load(f))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,158 @@
+import argparse
+import glob
+import json
+import os
+import statistics
+import sys
+import time
+# Importing benchmarkPipeline also puts app/ on sys.path
+from benchmarkPipeline import RESUME_DIRS, JD_SIZES, git_commit, load_skills, make_job_description, peak_rss_mb
+from modelRegistry import ENCODER_BACKENDS, ENCODE_MAX_BATCH_SIZE, load_sentence_encoder
+
+"""
+    Parity check and speed benchmark for the sentence encoder backends (RESUME_ELEVATE_ENCODER_BACKEND).
+
+    Every backend encodes the same texts: the bundled resume PDFs, their sections and synthetic
+    job descriptions. Each backend's resume-vs-JD similarity scores are compared with the torch
+    backend. A backend fails the parity check when any score differs by more than --tolerance.
+    The report also gives the share of each document's top-k job descriptions that the backend
+    ranks the same as torch.
+    Encode throughput is timed over --repeats warm runs.
+
+    Usage (from the repository root):
+        python benchmarks/encoderBackends.py --output encoder_backends.json
+        python benchmarks/encoderBackends.py --backends torch int8 --tolerance 0.02
+
+    Exits with status 1 if a backend that loaded is outside the tolerance. Backends whose
+    dependencies are missing (e.g. onnxruntime) are reported as skipped.
+"""
+
+DEFAULT_TOLERANCE = 0.02
+# Job descriptions per document compared by the top-k agreement
+TOP_K = 3
+
+
+def _normalize(embeddings):
+    import numpy as np
+    embeddings = np.asarray(embeddings, dtype=np.float32)
+    norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+    return embeddings / np.where(norms == 0, 1.0, norms)
+
+
+def load_corpus() -> tuple[list[str], list[str]]:
+    from pdfExtraction import extract_text_from_pdf
+    from parsedResume import ParsedResume
+    resumes = []
+    for directory in RESUME_DIRS:
+        for path in sorted(glob.glob(os.path.join(directory, "*.pdf"))):
+            text = extract_text_from_pdf(path)
+            if text: resumes.append(text)
+    sections = [text for resume in resumes for _, text in ParsedResume(resume).section_texts()]
+    skills = load_skills()
+    job_descriptions = [make_job_description(size, skills, seed) for size in JD_SIZES for seed in range(3)]
+    return resumes + sections, job_descriptions
+
+
+def benchmark_backend(backend: str, documents: list[str], job_descriptions: list[str], repeats: int) -> dict:
+    load_start = time.perf_counter()
+    model = load_sentence_encoder(backend)
+    load_seconds = time.perf_counter() - load_start
+    texts = documents + job_descriptions
+
+    def encode():
+        return model.encode(texts, batch_size=ENCODE_MAX_BATCH_SIZE, convert_to_numpy=True)
+
+    cold_start = time.perf_counter()
+    embeddings = encode()
+    cold_seconds = time.perf_counter() - cold_start
+    warm_seconds = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        encode()
+        warm_seconds.append(time.perf_counter() - start)
+    median = statistics.median(warm_seconds) if warm_seconds else cold_seconds
+    embeddings = _normalize(embeddings)
+    return {
+        "backend": backend,
+        "load_seconds": round(load_seconds, 3),
+        "cold_encode_seconds": round(cold_seconds, 4),
+        "warm_encode_seconds": round(median, 4),
+        "texts_per_second": round(len(texts) / median, 1),
+        "peak_rss_mb": peak_rss_mb(),
+        # Similarity of every document to every job description, as get_embedding_similarity computes it
+        "_scores": embeddings[:len(documents)] @ embeddings[len(documents):].T,
+        "_embeddings": embeddings
+    }
+
+
+# Compares a backend's scores and embeddings with the reference (torch) backend.
+def parity(result: dict, reference: dict, tolerance: float, top_k: int = TOP_K) -> dict:
+    import numpy as np
+    score_diff = np.abs(result["_scores"] - reference["_scores"])
+    top_k = min(top_k, reference["_scores"].shape[1])
+    result_top = np.argsort(-result["_scores"], axis=1, kind="stable")[:, :top_k]
+    reference_top = np.argsort(-reference["_scores"], axis=1, kind="stable")[:, :top_k]
+    top_k_agreement = np.mean([len(set(a) & set(b)) / top_k for a, b in zip(result_top, reference_top)])
+    embedding_cosine = np.sum(result["_embeddings"] * reference["_embeddings"], axis=1)
+    rounded_equal = np.round(result["_scores"], 2) == np.round(reference["_scores"], 2)
+    return {
+        "max_score_diff": round(float(score_diff.max()), 4),
+        "mean_score_diff": round(float(score_diff.mean()), 4),
+        "rounded_scores_equal": round(float(rounded_equal.mean()), 4),
+        "min_embedding_cosine": round(float(embedding_cosine.min()), 4),
+        "top_k_agreement": round(float(top_k_agreement), 4),
+        "within_tolerance": bool(score_diff.max() <= tolerance)
+    }
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="Compare the sentence encoder backends.")
+    arg_parser.add_argument("--backends", nargs="+", default=list(ENCODER_BACKENDS), choices=ENCODER_BACKENDS)
+    arg_parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE,
+                            help="Largest allowed difference in a similarity score from the torch backend.")
+    arg_parser.add_argument("--repeats", type=int, default=3, help="Warm encode runs per backend.")
+    arg_parser.add_argument("--output", default="encoder_backends.json", help="Where to write the JSON report.")
+    args = arg_parser.parse_args()
+
+    documents, job_descriptions = load_corpus()
+    print(f"[INFO] Encoding {len(documents)} resume texts and {len(job_descriptions)} job descriptions per backend.")
+    results, reference = [], None
+    # torch is the reference, so it always runs first
+    for backend in dict.fromkeys(["torch"] + args.backends):
+        try:
+            result = benchmark_backend(backend, documents, job_descriptions, args.repeats)
+        except Exception as e:
+            print(f"[WARN] {backend:<6} skipped: {type(e).__name__}: {e}")
+            results.append({"backend": backend, "skipped": f"{type(e).__name__}: {e}"})
+            continue
+        if backend == "torch": reference = result
+        results.append(result)
+
+    failed = False
+    for result in results:
+        if "skipped" in result: continue
+        if reference is not None:
+            result["speedup"] = round(reference["warm_encode_seconds"] / result["warm_encode_seconds"], 2)
+            result["parity"] = parity(result, reference, args.tolerance)
+            failed = failed or not result["parity"]["within_tolerance"]
+        print(f"[INFO] {result['backend']:<6} {result['texts_per_second']:>8.1f} texts/s  "
+              f"speedup {result.get('speedup', '-')}x  parity {result.get('parity', 'no torch reference')}")
+    for result in results:
+        result.pop("_scores", None)
+        result.pop("_embeddings", None)
+
+    report = {
+        "meta": {"commit": git_commit(), "tolerance": args.tolerance, "documents": len(documents),
+                 "job_descriptions": len(job_descriptions), "repeats": args.repeats},
+        "results": results
+    }
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"[INFO] Wrote {args.output}.")
+    if failed:
+        print(f"Error: At least one backend differs from torch by more than {args.tolerance}.")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
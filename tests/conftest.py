@@ -0,0 +1,20 @@
+import os
+import sys
+
+import pytest
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APP_DIR = os.path.join(REPO_DIR, "app")
+# The app modules import each other script-style, so tests import them the same way
+sys.path[:0] = [APP_DIR, os.path.join(APP_DIR, "jobDescriptions"), os.path.join(REPO_DIR, "benchmarks")]
+
+
+# Gives a test its own model registry entries, restoring the process-wide ones afterwards.
+@pytest.fixture
+def registry():
+    import modelRegistry
+    saved = dict(modelRegistry._REGISTRY)
+    modelRegistry._REGISTRY.clear()
+    yield modelRegistry
+    modelRegistry._REGISTRY.clear()
+    modelRegistry._REGISTRY.update(saved)
@@ -0,0 +1,84 @@
+import threading
+import time
+
+import numpy as np
+import pytest
+
+from embeddingBatcher import MicroBatcher
+
+
+class RecordingEncoder:
+    def __init__(self, delay_seconds: float = 0.0, error: Exception = None):
+        self.delay_seconds = delay_seconds
+        self.error = error
+        self.batches = []
+
+    def __call__(self, texts):
+        self.batches.append(list(texts))
+        if self.delay_seconds: time.sleep(self.delay_seconds)
+        if self.error: raise self.error
+        return np.array([[float(text), 1.0] for text in texts], dtype=np.float32)
+
+
+@pytest.fixture
+def make_batcher():
+    batchers = []
+
+    def make(encoder, **kwargs):
+        batchers.append(MicroBatcher(encoder, **kwargs))
+        return batchers[-1]
+    yield make
+    for batcher in batchers: batcher.close()
+
+
+def test_concurrent_requests_are_merged_and_get_their_own_rows(make_batcher):
+    encoder = RecordingEncoder()
+    batcher = make_batcher(encoder, max_batch_size=64, max_latency_ms=200)
+    futures = [batcher.submit([str(i), str(i + 100)]) for i in range(8)]
+    for i, future in enumerate(futures):
+        np.testing.assert_array_equal(future.result(timeout=5)[:, 0], [i, i + 100])
+    assert len(encoder.batches) == 1 and len(encoder.batches[0]) == 16
+    assert batcher.stats()["mean_batch_size"] == 16
+
+
+def test_large_requests_are_split_into_max_batch_size_segments(make_batcher):
+    encoder = RecordingEncoder()
+    batcher = make_batcher(encoder, max_batch_size=4, max_latency_ms=1)
+    embeddings = batcher.encode([str(i) for i in range(10)])
+    np.testing.assert_array_equal(embeddings[:, 0], np.arange(10))
+    assert max(len(batch) for batch in encoder.batches) <= 4
+
+
+def test_a_lone_request_waits_at_most_max_latency(make_batcher):
+    batcher = make_batcher(RecordingEncoder(), max_batch_size=64, max_latency_ms=50)
+    start = time.monotonic()
+    batcher.encode(["1"])
+    assert 0.04 <= time.monotonic() - start < 1.0
+
+
+def test_full_batch_does_not_wait_for_the_latency(make_batcher):
+    batcher = make_batcher(RecordingEncoder(), max_batch_size=2, max_latency_ms=10_000)
+    start = time.monotonic()
+    batcher.encode(["1", "2"])
+    assert time.monotonic() - start < 1.0
+
+
+def test_encoder_errors_reach_every_caller_in_the_batch(make_batcher):
+    batcher = make_batcher(RecordingEncoder(error=ValueError("model failed")), max_latency_ms=100)
+    futures = [batcher.submit([str(i)]) for i in range(3)]
+    for future in futures:
+        with pytest.raises(ValueError, match="model failed"):
+            future.result(timeout=5)
+    # The batcher keeps serving after a failed batch
+    batcher.encode_fn = RecordingEncoder()
+    assert batcher.encode(["7"])[0, 0] == 7
+
+
+def test_close_encodes_pending_texts_then_rejects_new_ones():
+    encoder = RecordingEncoder(delay_seconds=0.05)
+    batcher = MicroBatcher(encoder, max_batch_size=64, max_latency_ms=10_000)
+    future = batcher.submit(["3"])
+    threading.Thread(target=batcher.close).start()
+    assert future.result(timeout=5)[0, 0] == 3
+    with pytest.raises(RuntimeError):
+        batcher.submit(["4"])
@@ -0,0 +1,60 @@
+import numpy as np
+
+from embeddingCache import EmbeddingCache
+
+
+class CountingBatcher:
+    def __init__(self):
+        self.texts = []
+
+    def encode(self, texts):
+        self.texts.extend(texts)
+        return np.array([[len(text), 1.0, 0.0] for text in texts], dtype=np.float32)
+
+
+def test_second_encode_texts_call_is_a_cache_hit(registry, tmp_path):
+    import analyzer
+    batcher = CountingBatcher()
+    cache = EmbeddingCache(str(tmp_path), max_entries=10)
+    registry.get_or_create("encode_batcher", lambda: batcher)
+    registry.get_or_create("embedding_cache", lambda: cache)
+
+    first = analyzer.encode_texts(["hello world"])
+    second = analyzer.encode_texts(["hello world"])
+
+    assert batcher.texts == ["hello world"]
+    np.testing.assert_array_equal(first, second)
+    assert cache.stats()["hits"] == 1 and cache.stats()["misses"] == 1
+
+
+def test_reopened_cache_serves_flushed_entries(tmp_path):
+    cache = EmbeddingCache(str(tmp_path), max_entries=4)
+    keys = [cache.make_key("model", text) for text in ("a", "b")]
+    cache.put_many(keys, np.eye(2, 3))
+    cache.flush()
+
+    reopened = EmbeddingCache(str(tmp_path), max_entries=4)
+    np.testing.assert_array_equal(reopened.get_many(keys)[1], np.eye(2, 3)[1])
+    assert len(reopened._free_slots) == 2
+
+
+def test_puts_do_not_rewrite_the_index_until_flush_every(tmp_path):
+    cache = EmbeddingCache(str(tmp_path), max_entries=8, flush_every=3)
+    cache.put_many([cache.make_key("model", "a")], np.ones((1, 3)))
+    assert not (tmp_path / EmbeddingCache.INDEX_FILE).exists()
+    cache.put_many([cache.make_key("model", text) for text in ("b", "c")], np.ones((2, 3)))
+    assert (tmp_path / EmbeddingCache.INDEX_FILE).exists()
+
+
+def test_stale_index_entry_for_a_reused_slot_is_dropped(tmp_path):
+    cache = EmbeddingCache(str(tmp_path), max_entries=2, flush_every=100)
+    a, b, c = (cache.make_key("model", text) for text in "abc")
+    cache.put_many([a, b], np.ones((2, 3)))
+    cache.flush()
+    # Evicts a and reuses its slot without writing the index, as if the process then crashed
+    cache.put_many([c], np.zeros((1, 3)))
+
+    reopened = EmbeddingCache(str(tmp_path), max_entries=2)
+    assert reopened.get_many([a])[0] is None
+    assert reopened.get_many([b])[0] is not None
+    assert len(reopened._free_slots) == 1
@@ -0,0 +1,43 @@
+import numpy as np
+import pytest
+
+from encoderBackends import DEFAULT_TOLERANCE, benchmark_backend, load_corpus, parity
+
+# A backend must stay this close to the torch backend on the bundled resumes and synthetic JDs
+MIN_EMBEDDING_COSINE = 0.99
+MIN_TOP_K_AGREEMENT = 0.9
+# Modules each backend needs besides sentence-transformers
+BACKEND_MODULES = {"int8": ("torch",), "onnx": ("onnxruntime", "optimum")}
+
+
+@pytest.fixture(scope="module")
+def corpus():
+    pytest.importorskip("sentence_transformers")
+    return load_corpus()
+
+
+@pytest.fixture(scope="module")
+def reference(corpus):
+    return benchmark_backend("torch", *corpus, repeats=0)
+
+
+@pytest.mark.parametrize("backend", sorted(BACKEND_MODULES))
+def test_backend_matches_torch(backend, corpus, reference):
+    for module in BACKEND_MODULES[backend]:
+        pytest.importorskip(module)
+    report = parity(benchmark_backend(backend, *corpus, repeats=0), reference, DEFAULT_TOLERANCE)
+    assert report["min_embedding_cosine"] >= MIN_EMBEDDING_COSINE, report
+    assert report["top_k_agreement"] >= MIN_TOP_K_AGREEMENT, report
+    assert report["within_tolerance"], report
+
+
+def test_parity_reports_top_k_agreement():
+    scores = np.array([[0.9, 0.5, 0.1, 0.3], [0.2, 0.4, 0.6, 0.8]], dtype=np.float32)
+    embeddings = np.eye(2, dtype=np.float32)
+    reference = {"_scores": scores, "_embeddings": embeddings}
+    # The second document's top two job descriptions swap one member
+    shifted = {"_scores": scores + np.array([[0, 0, 0, 0], [0, 0.5, 0, 0]], dtype=np.float32), "_embeddings": embeddings}
+    assert parity(reference, reference, DEFAULT_TOLERANCE, top_k=2)["top_k_agreement"] == 1.0
+    report = parity(shifted, reference, DEFAULT_TOLERANCE, top_k=2)
+    assert report["top_k_agreement"] == 0.75
+    assert not report["within_tolerance"]
@@ -0,0 +1,57 @@
+import glob
+import json
+import os
+import re
+
+import pytest
+
+from analyzer import check_codepath_student_resume_format
+from conftest import APP_DIR
+from pdfExtraction import extract_text_from_pdf
+
+WEAK_VERB_FEEDBACK = "Experience/Projects: Some bullet points may not start with a strong action verb."
+QUANTITATIVE_FEEDBACK = "Experience/Projects: Add more quantitative details (numbers, percentages, etc.) to show impact."
+BUNDLED_PDFS = sorted(
+    glob.glob(os.path.join(APP_DIR, "data", "resumeTraining", "*.pdf"))
+    + glob.glob(os.path.join(APP_DIR, "data", "codepathResumeTemplates", "*.pdf"))
+)
+
+
+# The number-density rule as it was written before the rule engine, kept as the reference.
+def _reference_low_number_density(resume_text: str) -> bool:
+    if not re.findall(r'[\n\r]\s*[\*•-]\s*(.*)', resume_text): return False
+    total_words = len(re.findall(r'\b\w+\b', resume_text))
+    quantifiable_terms = re.findall(r'\d+(\.\d+)?%?|\b(thousand|million|billion)\b', resume_text, re.IGNORECASE)
+    return (len(quantifiable_terms) / total_words if total_words > 0 else 0) < 0.005
+
+
+@pytest.mark.parametrize("pdf_path", BUNDLED_PDFS, ids=os.path.basename)
+def test_quantitative_feedback_matches_the_reference_rule(pdf_path):
+    resume_text = extract_text_from_pdf(pdf_path)
+    feedback = check_codepath_student_resume_format(resume_text)
+    assert (QUANTITATIVE_FEEDBACK in feedback) == _reference_low_number_density(resume_text)
+
+
+def test_template_blanks_are_not_counted_as_numbers():
+    resume_text = "Experience\n- Led the __ team of ___ people\n- " + " ".join(["word"] * 300) + " 3.5"
+    assert QUANTITATIVE_FEEDBACK in check_codepath_student_resume_format(resume_text)
+
+
+
+@pytest.mark.parametrize("bullet", ["Project: inventory tracker", "Research interests include compilers",
+                                    "Market analysis of ride sharing", "Set of tools for students", "Input: CSV files"])
+def test_bullets_opening_with_nouns_are_weak(bullet):
+    assert WEAK_VERB_FEEDBACK in check_codepath_student_resume_format(f"Experience\n- {bullet}")
+
+
+@pytest.mark.parametrize("bullet", ["Researched caching strategies", "Architected a REST API", "Rolled out dark mode"])
+def test_bullets_opening_with_listed_verbs_are_strong(bullet):
+    assert WEAK_VERB_FEEDBACK not in check_codepath_student_resume_format(f"Experience\n- {bullet}")
+
+
+def test_lexicon_is_built_with_the_loader_version():
+    import actionVerbs
+    from data.technicalVerbs import actionWords
+    assert actionWords.LEXICON_VERSION is actionVerbs.LEXICON_VERSION
+    with open(actionVerbs.LEXICON_PATH, "r") as f:
+        assert actionWords.build_lexicon() == json.load(f)
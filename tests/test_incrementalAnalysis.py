@@ -0,0 +1,41 @@
+import os
+
+import pytest
+
+from conftest import APP_DIR
+from incrementalAnalysis import IncrementalAnalyzer
+from parsedResume import ParsedResume
+from pdfExtraction import extract_text_from_pdf
+
+JD_TEXT = "Requirements:\n- Experience with Python and REST APIs"
+
+
+@pytest.fixture(scope="module")
+def resume_text() -> str:
+    # This resume has two "projects" sections
+    return extract_text_from_pdf(os.path.join(APP_DIR, "data", "resumeTraining", "EXPERIENCED_alumni.pdf"))
+
+
+def _projects_sections(resume_text: str) -> list[str]:
+    return [text for heading, text in ParsedResume(resume_text).section_texts() if heading == "projects"]
+
+
+@pytest.mark.parametrize("occurrence", [0, 1])
+def test_edits_to_either_duplicate_section_are_reported(resume_text, occurrence):
+    projects = _projects_sections(resume_text)
+    assert len(projects) == 2
+    analyzer = IncrementalAnalyzer()
+    analyzer.analyze(resume_text, JD_TEXT, suggestions=False)
+    edited = resume_text.replace(projects[occurrence], projects[occurrence] + " with Docker", 1)
+    changes = analyzer.analyze(edited, JD_TEXT, suggestions=False)["changes"]
+    assert changes["sections_changed"] == ["projects"]
+    assert changes["sections_added"] == [] and changes["sections_removed"] == []
+
+
+def test_removing_a_duplicate_section_is_reported():
+    first = "Projects\n- Built a chess engine in C++\nProjects\n- Wrote a compiler in Rust\nEducation\nState University"
+    analyzer = IncrementalAnalyzer()
+    analyzer.analyze(first, JD_TEXT, suggestions=False)
+    changes = analyzer.analyze(first.replace("Projects\n- Wrote a compiler in Rust\n", ""), JD_TEXT, suggestions=False)["changes"]
+    assert changes["sections_removed"] == ["projects"]
+    assert changes["sections_changed"] == []
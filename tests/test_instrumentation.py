@@ -0,0 +1,107 @@
+import pytest
+
+import instrumentation
+from instrumentation import SpanBuffer, StageMetrics, add_span_hook, annotate, remove_span_hook, span
+
+
+@pytest.fixture
+def records():
+    buffer = SpanBuffer()
+    add_span_hook(buffer)
+    yield buffer
+    remove_span_hook(buffer)
+
+
+def _record(name: str, wall_seconds: float, error: str = None, **attributes) -> dict:
+    return {"name": name, "parent": None, "start_time": 0.0, "wall_seconds": wall_seconds,
+            "cpu_seconds": wall_seconds / 2, "error": error, "attributes": attributes}
+
+
+def test_span_is_a_shared_no_op_without_hooks(monkeypatch):
+    monkeypatch.setattr(instrumentation, "_HOOKS", [])
+    assert span("stage") is span("other")
+    with span("stage") as stage:
+        stage.set(chars=1)
+        annotate(cache_hit=True)
+
+
+def test_spans_record_parent_attributes_and_errors(records):
+    with span("analysis", chars=10) as outer:
+        with span("encode"):
+            annotate(cache_hit=True)
+        outer.set(sections=3)
+    with pytest.raises(ValueError):
+        with span("failing"):
+            raise ValueError("bad input")
+    encode, analysis, failing = records.drain()
+    assert (encode["name"], encode["parent"], encode["attributes"]) == ("encode", "analysis", {"cache_hit": True})
+    assert (analysis["parent"], analysis["attributes"]) == (None, {"chars": 10, "sections": 3})
+    assert failing["error"] == "ValueError"
+    assert analysis["wall_seconds"] >= encode["wall_seconds"] >= 0
+    assert records.drain() == []
+
+
+def test_failing_hook_does_not_break_the_stage(records, capsys):
+    def broken_hook(record):
+        raise RuntimeError("hook failed")
+    add_span_hook(broken_hook)
+    try:
+        with span("stage"):
+            pass
+    finally:
+        remove_span_hook(broken_hook)
+    assert [record["name"] for record in records.drain()] == ["stage"]
+    assert "hook failed" in capsys.readouterr().out
+
+
+def test_prometheus_rendering():
+    metrics = StageMetrics(prefix="test", buckets=(0.1, 1.0))
+    metrics.observe(_record("encode", 0.05, texts=4, cache_hit=True))
+    metrics.observe(_record("encode", 0.5, texts=6, cache_hit=False, model="minilm"))
+    metrics.observe(_record('pdf "extraction"', 2.0, error="TimeoutError"))
+    assert metrics.render({"server_in_flight": 2}) == """\
+# HELP test_stage_seconds Wall time of each analysis stage.
+# TYPE test_stage_seconds histogram
+test_stage_seconds_bucket{stage="encode",le="0.1"} 1
+test_stage_seconds_bucket{stage="encode",le="1"} 2
+test_stage_seconds_bucket{stage="encode",le="+Inf"} 2
+test_stage_seconds_sum{stage="encode"} 0.550000
+test_stage_seconds_count{stage="encode"} 2
+test_stage_seconds_bucket{stage="pdf \\"extraction\\"",le="0.1"} 0
+test_stage_seconds_bucket{stage="pdf \\"extraction\\"",le="1"} 0
+test_stage_seconds_bucket{stage="pdf \\"extraction\\"",le="+Inf"} 1
+test_stage_seconds_sum{stage="pdf \\"extraction\\""} 2.000000
+test_stage_seconds_count{stage="pdf \\"extraction\\""} 1
+# HELP test_stage_cpu_seconds_total CPU time of the thread running each stage.
+# TYPE test_stage_cpu_seconds_total counter
+test_stage_cpu_seconds_total{stage="encode"} 0.275
+test_stage_cpu_seconds_total{stage="pdf \\"extraction\\""} 1
+# HELP test_stage_errors_total Stages that raised an exception.
+# TYPE test_stage_errors_total counter
+test_stage_errors_total{stage="encode"} 0
+test_stage_errors_total{stage="pdf \\"extraction\\""} 1
+# HELP test_stage_attribute_observations_total Spans that reported each attribute.
+# TYPE test_stage_attribute_observations_total counter
+test_stage_attribute_observations_total{stage="encode",attribute="cache_hit"} 2
+test_stage_attribute_observations_total{stage="encode",attribute="texts"} 2
+# HELP test_stage_attribute_sum_total Sum of each numeric attribute; true booleans count as 1.
+# TYPE test_stage_attribute_sum_total counter
+test_stage_attribute_sum_total{stage="encode",attribute="cache_hit"} 1
+test_stage_attribute_sum_total{stage="encode",attribute="texts"} 10
+# TYPE test_server_in_flight gauge
+test_server_in_flight 2
+"""
+
+
+def test_metrics_aggregate_live_spans(records):
+    metrics = StageMetrics()
+    add_span_hook(metrics)
+    try:
+        for _ in range(3):
+            with span("format_checks", chars=100):
+                pass
+    finally:
+        remove_span_hook(metrics)
+    rendered = metrics.render()
+    assert 'resume_elevate_stage_seconds_count{stage="format_checks"} 3' in rendered
+    assert 'resume_elevate_stage_attribute_sum_total{stage="format_checks",attribute="chars"} 300' in rendered
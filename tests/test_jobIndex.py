@@ -0,0 +1,69 @@
+import random
+
+import pytest
+
+from analyzer import score_resume
+from jobIndex import JobIndex
+
+
+def _job_index() -> JobIndex:
+    job_index = JobIndex()
+    job_index.add_job("Backend Engineer", ["Python", "SQL", "Docker"], ["Kubernetes"])
+    job_index.add_job("Data Scientist", ["python", "machine  learning"], ["sql"])
+    job_index.add_job("Frontend Engineer", ["react", "typescript"], [])
+    job_index.add_job("Intern", [], [])
+    return job_index
+
+
+def test_weighted_scores_match_top_k():
+    job_index = _job_index()
+    job_index.compact()
+    # Jobs added after compaction live in the delta
+    job_index.add_job("Platform Engineer", ["docker"], ["python"])
+    resume_keywords = ["python", "Machine Learning", "docker"]
+    top = {row["job_id"]: row["weighted_score"] for row in job_index.top_k(resume_keywords, k=10)}
+    scores = job_index.weighted_scores(resume_keywords, list(range(len(job_index)))).tolist()
+    assert scores == [top.get(job_id, 0.0) for job_id in range(len(job_index))]
+
+
+def _random_jobs(seed: int, num_jobs: int = 200) -> tuple[list[tuple[str, list[str], list[str]]], list[str]]:
+    rng = random.Random(seed)
+    vocabulary = [f"skill {i}" for i in range(60)]
+    jobs = [(f"Role {i}", rng.sample(vocabulary, rng.randint(0, 8)), rng.sample(vocabulary, rng.randint(0, 5)))
+            for i in range(num_jobs)]
+    return jobs, rng.sample(vocabulary, 12)
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_top_k_matches_score_resume_for_every_job(seed):
+    jobs, resume_keywords = _random_jobs(seed)
+    job_index = JobIndex()
+    for i, (role, required, preferred) in enumerate(jobs):
+        job_index.add_job(role, required, preferred)
+        # Half the jobs are compacted, half stay in the delta
+        if i == len(jobs) // 2: job_index.compact()
+
+    expected = {}
+    for job_id, (_, required, preferred) in enumerate(jobs):
+        result = score_resume(resume_keywords, required, preferred)
+        if result["matched_keywords"]: expected[job_id] = (result["weighted_score"], sorted(result["matched_keywords"]))
+    rows = job_index.top_k(resume_keywords, k=len(jobs))
+    assert {row["job_id"]: (row["weighted_score"], sorted(row["matched_keywords"])) for row in rows} == expected
+    scores = [row["weighted_score"] for row in rows]
+    assert scores == sorted(scores, reverse=True)
+
+
+def test_top_k_keeps_the_k_best(tmp_path):
+    jobs, resume_keywords = _random_jobs(0)
+    job_index = JobIndex()
+    for role, required, preferred in jobs: job_index.add_job(role, required, preferred)
+    everything = job_index.top_k(resume_keywords, k=len(jobs))
+    assert job_index.top_k(resume_keywords, k=10) == everything[:10]
+    # A saved and memory-mapped index ranks the same
+    job_index.save(str(tmp_path))
+    assert JobIndex.load(str(tmp_path)).top_k(resume_keywords, k=10) == everything[:10]
+
+
+def test_skills_are_normalized_like_the_parser_output():
+    job_index = _job_index()
+    assert job_index.top_k(["MACHINE LEARNING"], k=1)[0]["job_role"] == "Data Scientist"
@@ -0,0 +1,59 @@
+import os
+import re
+
+import pytest
+
+from conftest import APP_DIR
+from keywordAutomaton import KeywordAutomaton
+from pdfExtraction import extract_text_from_pdf
+from test_formatChecks import BUNDLED_PDFS
+
+
+def _load_skills() -> list[str]:
+    with open(os.path.join(APP_DIR, "jobDescriptions", "skills.txt"), "r") as f:
+        return [line.strip().lower() for line in f if line.strip()]
+
+
+# The substring scan the parser used before the automaton, with the automaton's word-boundary rule added:
+# a keyword edge that is a word character must not touch another word character.
+def _reference_first_match_ends(keywords: list[str], text: str) -> dict[str, int]:
+    first_ends = {}
+    for keyword in keywords:
+        if keyword not in text: continue
+        pattern = ((r'(?<!\w)' if re.match(r'\w', keyword[0]) else '') + re.escape(keyword)
+                   + (r'(?!\w)' if re.match(r'\w', keyword[-1]) else ''))
+        match = re.search(pattern, text)
+        if match: first_ends[keyword] = match.end()
+    return first_ends
+
+
+@pytest.fixture(scope="module")
+def skills() -> list[str]:
+    return _load_skills()
+
+
+@pytest.mark.parametrize("pdf_path", BUNDLED_PDFS, ids=os.path.basename)
+def test_matches_the_bounded_substring_scan_on_bundled_resumes(skills, pdf_path):
+    text = extract_text_from_pdf(pdf_path).lower()
+    first_ends = KeywordAutomaton(skills).first_match_ends(text)
+    assert first_ends == _reference_first_match_ends(skills, text)
+    # Every automaton match is also a match of the old unbounded scan
+    assert all(skill in text for skill in first_ends)
+
+
+def test_keywords_must_sit_on_word_boundaries():
+    automaton = KeywordAutomaton(["java", "go", "c++", ".net", "node.js"])
+    text = "javascript, golang and google; c++ with .net and node.js, not java-like"
+    assert set(automaton.first_match_ends(text)) == {"c++", ".net", "node.js", "java"}
+    # Punctuation edges need no boundary, so "c++" matches in "c++17"
+    assert set(automaton.first_match_ends("vb.net c++17")) == {".net", "c++"}
+
+
+def test_overlapping_keywords_are_all_found():
+    automaton = KeywordAutomaton(["machine learning", "learning", "deep learning", "machine", "sql", "nosql"])
+    text = "deep learning and machine learning with nosql"
+    matches = [(keyword, text[start:end]) for start, end, keyword in automaton.iter_matches(text)]
+    assert sorted(keyword for keyword, _ in matches) == sorted(
+        ["deep learning", "learning", "machine", "machine learning", "learning", "nosql"])
+    assert all(keyword == matched for keyword, matched in matches)
+    assert automaton.first_match_ends(text) == _reference_first_match_ends(automaton.keywords, text)
@@ -0,0 +1,82 @@
+import os
+import re
+
+import pytest
+
+from parsedResume import REQUIRED_SECTIONS, ParsedResume, _RESUME_HEADING_RE
+from pdfExtraction import extract_text_from_pdf
+from test_formatChecks import BUNDLED_PDFS
+
+# --- The two passes ParsedResume replaced, kept as the reference ---
+_REFERENCE_TOKEN_RE = re.compile(
+    r'(?P<bullet>[\n\r]\s*[\*•-]\s*)'
+    r'|(?P<email>[\w\.-]+@[\w\.-]+)'
+    r'|(?P<linkedin>linkedin.com/in/[\w-]+)'
+    r'|(?P<github>github.com/[\w-]+)'
+    r'|(?P<phone>\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4})'
+    r'|(?P<degree>\b(?:bachelor|master|b\.s|m\.s)\b)'
+    r'|(?P<word>\w+)'
+)
+
+
+# The format rules' scan over the lower-cased resume.
+def _reference_scan(resume_text: str) -> dict:
+    text = resume_text.lower()
+    scan = {"markers": set(), "words": [], "section_index": {}, "bullets": []}
+    for match in _REFERENCE_TOKEN_RE.finditer(text):
+        kind, token = match.lastgroup, match.group()
+        if kind == 'word':
+            scan["words"].append(token)
+            if token in REQUIRED_SECTIONS: scan["section_index"].setdefault(token, match.start())
+        elif kind == 'bullet':
+            line_end = text.find('\n', match.end())
+            scan["bullets"].append(text[match.end():line_end if line_end != -1 else len(text)])
+        else:
+            scan["markers"].add(kind)
+            scan["words"].extend(re.findall(r'\w+', token))
+    return scan
+
+
+# promptBuilder's section splitter.
+def _reference_sections(resume_text: str) -> list[tuple[str, str]]:
+    sections = [("header", [])]
+    for line in resume_text.splitlines():
+        match = _RESUME_HEADING_RE.match(line)
+        if match:
+            sections.append((match.group(1).lower(), []))
+        sections[-1][1].append(line)
+    return [(heading, "\n".join(lines).strip()) for heading, lines in sections if "\n".join(lines).strip()]
+
+
+@pytest.fixture(scope="module", params=BUNDLED_PDFS, ids=os.path.basename)
+def resume_text(request) -> str:
+    return extract_text_from_pdf(request.param)
+
+
+def test_scan_matches_the_reference(resume_text):
+    parsed, reference = ParsedResume(resume_text), _reference_scan(resume_text)
+    assert parsed.markers == reference["markers"]
+    assert parsed.words == reference["words"]
+    assert parsed.word_set == frozenset(reference["words"])
+    assert parsed.section_index == reference["section_index"]
+    assert parsed.bullet_texts == reference["bullets"]
+
+
+def test_sections_match_the_reference(resume_text):
+    assert ParsedResume(resume_text).section_texts() == _reference_sections(resume_text)
+
+
+def test_offsets_point_into_the_original_text(resume_text):
+    parsed = ParsedResume(resume_text)
+    for word, offset in zip(parsed.words, parsed.word_offsets):
+        assert resume_text[offset:offset + len(word)].lower() == word
+    for (start, end), bullet in zip(parsed.bullets, parsed.bullet_texts):
+        assert resume_text[start:end].lower() == bullet
+        assert parsed.sections[parsed.section_at(start)][1] <= start
+
+
+def test_bullets_in_a_section():
+    parsed = ParsedResume("Jane Doe\nExperience\n- Built an API\nProjects:\n* Wrote a parser\n- Shipped an app")
+    assert [heading for heading, _, _ in parsed.sections] == ["header", "experience", "projects"]
+    assert parsed.bullets_in("projects") == ["wrote a parser", "shipped an app"]
+    assert parsed.bullets_in("experience") == ["built an api"]
@@ -0,0 +1,66 @@
+import io
+import os
+import random
+
+import pytest
+
+import pdfExtraction
+from pdfExtraction import PARALLEL_PAGE_THRESHOLD, extract_text_from_pdf
+from test_formatChecks import BUNDLED_PDFS
+
+
+@pytest.fixture(scope="module")
+def long_pdf() -> bytes:
+    from PyPDF2 import PdfReader, PdfWriter
+    writer = PdfWriter()
+    while len(writer.pages) < PARALLEL_PAGE_THRESHOLD:
+        for path in BUNDLED_PDFS:
+            for page in PdfReader(path).pages: writer.add_page(page)
+    output = io.BytesIO()
+    writer.write(output)
+    return output.getvalue()
+
+
+@pytest.fixture
+def page_pool(registry):
+    yield
+    pool = registry._REGISTRY.get("pdf_page_pool")
+    if pool is not None: pool.executor.shutdown(wait=True, cancel_futures=True)
+
+
+def test_parallel_extraction_matches_sequential(long_pdf, page_pool):
+    sequential = extract_text_from_pdf(long_pdf, parallel=False)
+    assert sequential
+    assert extract_text_from_pdf(long_pdf) == sequential
+
+
+def test_sequential_extraction_stops_at_the_deadline(long_pdf):
+    assert extract_text_from_pdf(long_pdf, parallel=False, timeout=0) == ""
+
+
+def test_timed_out_pool_is_replaced(long_pdf, page_pool):
+    pool = pdfExtraction._get_page_pool()
+    assert extract_text_from_pdf(long_pdf, timeout=0) == ""
+    assert pdfExtraction._get_page_pool() is not pool
+    assert pool.executor._shutdown_thread
+
+
+def test_pool_with_a_dead_worker_is_replaced(long_pdf, page_pool):
+    pool = pdfExtraction._get_page_pool()
+    with pytest.raises(Exception):
+        pool.executor.submit(os._exit, 1).result()
+    assert extract_text_from_pdf(long_pdf) == ""
+    assert pdfExtraction._get_page_pool() is not pool
+    assert extract_text_from_pdf(long_pdf) == extract_text_from_pdf(long_pdf, parallel=False)
+
+
+# Truncated and bit-flipped copies of a bundled PDF must give "" or some text, never an exception.
+def test_corrupted_pdfs_do_not_raise():
+    with open(BUNDLED_PDFS[0], "rb") as f:
+        data = f.read()
+    rng = random.Random(0)
+    for _ in range(100):
+        corrupted = bytearray(data[:rng.randrange(len(data))] if rng.random() < 0.3 else data)
+        for _ in range(rng.randint(1, 20)):
+            corrupted[rng.randrange(len(corrupted))] = rng.randrange(256)
+        assert isinstance(extract_text_from_pdf(bytes(corrupted), parallel=False), str)
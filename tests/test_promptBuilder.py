@@ -0,0 +1,59 @@
+from promptBuilder import MAX_PROMPT_KEYWORDS, compact_prompt_inputs, estimate_tokens, select_resume_sections, strip_jd_boilerplate
+
+JOB_DESCRIPTION = """About us
+We build payment infrastructure.
+Requirements:
+- Experience with crypto wallets and blockchain
+- 3+ years of Python
+Benefits
+- Unlimited vacation
+- Free lunch and commuter stipend
+- Home office budget
+- 401(k) matching
+What You'll Do
+- Ship features to production
+We are an equal opportunity employer."""
+
+RESUME = """Jane Doe
+jane@example.com
+Education
+B.S. Computer Science, GPA 3.9
+Experience
+- Built a payments service in Go
+Projects
+- Wrote a ray tracer
+Skills
+Python, SQL"""
+
+
+def test_requirement_lines_are_not_mistaken_for_boilerplate():
+    stripped = strip_jd_boilerplate(JOB_DESCRIPTION)
+    assert "crypto wallets and blockchain" in stripped
+    assert "Ship features to production" in stripped
+
+
+def test_benefits_block_is_dropped_until_the_next_heading():
+    stripped = strip_jd_boilerplate(JOB_DESCRIPTION)
+    for benefit in ("Unlimited vacation", "Free lunch", "Home office budget", "401(k)", "equal opportunity"):
+        assert benefit not in stripped
+
+
+def test_resume_within_budget_is_kept_whole():
+    assert select_resume_sections(RESUME, ["kubernetes"]) == RESUME
+
+
+def test_compaction_keeps_education_and_skills():
+    long_projects = "\n".join(f"- Project {i} with unrelated tooling" for i in range(200))
+    resume = RESUME.replace("Projects\n", "Projects\n" + long_projects + "\n")
+    budget = estimate_tokens(resume) // 2
+    selected = select_resume_sections(resume, ["kubernetes"], max_tokens=budget)
+    assert "GPA 3.9" in selected
+    assert "Python, SQL" in selected
+
+
+def test_keywords_are_truncated_by_jd_emphasis_not_alphabet():
+    jd_text = "Requirements:\n- Python services on Kubernetes\n- Deploy Python with Kubernetes and Terraform\n- Python"
+    missing = [f"aaa skill {i}" for i in range(MAX_PROMPT_KEYWORDS)] + ["terraform", "python", "kubernetes"]
+    _, _, _, kept = compact_prompt_inputs("Skills\nGo", jd_text, [], missing)
+    assert kept[:3] == ["python", "kubernetes", "terraform"]
+    assert len(kept) == MAX_PROMPT_KEYWORDS
@@ -0,0 +1,111 @@
+import asyncio
+import base64
+import json
+import threading
+import time
+import urllib.error
+import urllib.request
+
+import pytest
+
+import analyzer
+from server import AnalysisServer, RequestError
+from test_formatChecks import BUNDLED_PDFS
+
+JD_TEXT = "Requirements:\n- Experience with Python and REST APIs"
+
+
+def _start(tmp_path_factory, monkeypatch, **kwargs) -> tuple[AnalysisServer, threading.Thread]:
+    monkeypatch.setenv("RESUME_ELEVATE_CACHE_DIR", str(tmp_path_factory.mktemp("embeddings")))
+    monkeypatch.delenv("GEMINI_API_KEY", raising=False)
+    server = AnalysisServer(port=0, **kwargs)
+    server.start()
+    thread = threading.Thread(target=server.serve_forever)
+    thread.start()
+    return server, thread
+
+
+def _stop(server: AnalysisServer, thread: threading.Thread):
+    server.shutdown()
+    thread.join(timeout=30)
+    assert not thread.is_alive()
+
+
+@pytest.fixture(scope="module")
+def server(tmp_path_factory):
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        server, thread = _start(tmp_path_factory, monkeypatch, workers=2, max_queue=0)
+        yield server
+        _stop(server, thread)
+
+
+def _request(server: AnalysisServer, path: str, body: dict = None) -> tuple[int, dict, dict]:
+    host, port = server.httpd.server_address[:2]
+    data = json.dumps(body).encode("utf-8") if body is not None else None
+    try:
+        with urllib.request.urlopen(urllib.request.Request(f"http://{host}:{port}{path}", data=data), timeout=30) as response:
+            return response.status, dict(response.headers), json.loads(response.read())
+    except urllib.error.HTTPError as e:
+        return e.code, dict(e.headers), json.loads(e.read())
+
+
+def _analyze_body() -> dict:
+    with open(BUNDLED_PDFS[0], "rb") as f:
+        return {"resume_pdf": base64.b64encode(f.read()).decode("ascii"), "job_description": JD_TEXT}
+
+
+def test_every_worker_is_warmed_before_serving(server):
+    assert len(server.worker_pids) == server.workers == 2
+
+
+def test_analyze_returns_the_analysis(server):
+    status, _, body = _request(server, "/analyze", _analyze_body())
+    assert status == 200
+    assert {"weighted_score", "semantic_score", "codepath_format_feedback", "suggestions"} <= body.keys()
+    assert server.health()["in_flight"] == 0
+
+
+def test_bad_request_is_rejected(server):
+    status, _, body = _request(server, "/analyze", {"job_description": JD_TEXT})
+    assert status == 400 and "resume_pdf" in body["error"]
+
+
+def test_full_server_answers_503(server):
+    with server._lock: server.in_flight += server.capacity
+    try:
+        status, headers, _ = _request(server, "/analyze", _analyze_body())
+    finally:
+        with server._lock: server.in_flight -= server.capacity
+    assert status == 503 and headers["Retry-After"] == "1"
+
+
+def test_slow_analysis_answers_504(server, monkeypatch):
+    monkeypatch.setattr(server, "request_timeout", 0)
+    status, _, _ = _request(server, "/analyze", _analyze_body())
+    assert status == 504
+
+
+def test_hung_suggestions_answer_504_at_the_deadline(server, monkeypatch):
+    async def hang(*args, **kwargs):
+        await asyncio.sleep(60)
+    monkeypatch.setattr(analyzer, "generate_improvement_suggestions_async", hang)
+    monkeypatch.setattr(server, "request_timeout", 2)
+    status, _, body = _request(server, "/analyze", _analyze_body())
+    assert status == 504 and "2 seconds" in body["error"]
+
+
+def test_shutdown_finishes_in_flight_requests_and_rejects_new_ones(tmp_path_factory, monkeypatch):
+    server, thread = _start(tmp_path_factory, monkeypatch, workers=1)
+    responses = []
+    request = threading.Thread(target=lambda: responses.append(_request(server, "/analyze", _analyze_body())))
+    request.start()
+    deadline = time.monotonic() + 30
+    while server.health()["in_flight"] == 0 and request.is_alive() and time.monotonic() < deadline:
+        time.sleep(0.001)
+    _stop(server, thread)
+    request.join(timeout=30)
+    assert responses and responses[0][0] == 200
+    assert server.health()["status"] == "draining"
+    with pytest.raises(RequestError) as error:
+        server.analyze(b"%PDF", JD_TEXT)
+    assert error.value.status == 503
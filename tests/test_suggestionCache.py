@@ -0,0 +1,50 @@
+import asyncio
+import os
+import time
+
+from suggestionCache import SuggestionCache
+
+
+def _miss_once(cache: SuggestionCache):
+    get = cache.get
+    calls = []
+
+    def get_after_first_miss(key):
+        calls.append(key)
+        return None if len(calls) == 1 else get(key)
+    cache.get = get_after_first_miss
+
+
+# A caller that missed just before the previous owner stored the response must not call the model again.
+def test_response_stored_after_the_first_check_is_not_regenerated(tmp_path):
+    cache = SuggestionCache(str(tmp_path))
+    cache.put("key", "stored")
+    _miss_once(cache)
+    assert cache.get_or_generate("key", lambda: "generated") == "stored"
+
+
+def test_async_response_stored_after_the_first_check_is_not_regenerated(tmp_path):
+    cache = SuggestionCache(str(tmp_path))
+    cache.put("key", "stored")
+    _miss_once(cache)
+
+    async def generate():
+        return "generated"
+    assert asyncio.run(cache.get_or_generate_async("key", generate)) == "stored"
+
+
+def test_put_prunes_expired_files(tmp_path):
+    cache = SuggestionCache(str(tmp_path), ttl_seconds=60, prune_interval_seconds=0)
+    expired = time.time() - 120
+    with open(tmp_path / "old.json", "w") as f:
+        f.write(f'{{"created_at": {expired}, "text": "text"}}')
+    cache.put("new", "text")
+    assert sorted(os.listdir(tmp_path)) == ["new.json"]
+
+
+def test_put_does_not_prune_before_the_interval(tmp_path):
+    cache = SuggestionCache(str(tmp_path), ttl_seconds=60)
+    with open(tmp_path / "old.json", "w") as f:
+        f.write(f'{{"created_at": {time.time() - 120}, "text": "text"}}')
+    cache.put("new", "text")
+    assert sorted(os.listdir(tmp_path)) == ["new.json", "old.json"]
@@ -0,0 +1,61 @@
+import asyncio
+import threading
+
+import pytest
+
+from analyzer import SUGGESTIONS_ERROR_MESSAGE, generate_improvement_suggestions, generate_improvement_suggestions_async
+from llmClients import FakeLLMClient
+from suggestionCache import SuggestionCache
+
+RESUME_TEXT = "Education\nState University, B.S. Computer Science\nExperience\n- Built a Flask API serving 2,000 users\nSkills\nPython, SQL"
+JD_TEXT = "Requirements:\n- Experience with Python and REST APIs\nPreferred Qualifications:\n- Docker"
+SUGGESTION_INPUTS = (RESUME_TEXT, JD_TEXT, ["python"], ["docker", "rest apis"], ["Add a CodePath mention."], 0.5, 0.62)
+
+
+@pytest.fixture
+def suggestion_cache(registry, tmp_path):
+    cache = SuggestionCache(str(tmp_path / "suggestions"))
+    registry.get_or_create("suggestion_cache", lambda: cache)
+    return cache
+
+
+def test_suggestions_come_from_the_client_then_the_cache(suggestion_cache):
+    client = FakeLLMClient("Add Docker to your projects.")
+    assert generate_improvement_suggestions(*SUGGESTION_INPUTS, llm_client=client) == "Add Docker to your projects."
+    assert client.call_count == 1
+    assert "docker" in client.prompts[0] and "Built a Flask API" in client.prompts[0]
+    # Whitespace changes do not change the cache key
+    assert generate_improvement_suggestions(RESUME_TEXT + "\n", *SUGGESTION_INPUTS[1:], llm_client=client) == "Add Docker to your projects."
+    assert client.call_count == 1
+
+
+def test_client_errors_are_reported_and_not_cached(suggestion_cache):
+    client = FakeLLMClient(error=RuntimeError("quota exceeded"))
+    assert generate_improvement_suggestions(*SUGGESTION_INPUTS, llm_client=client) == SUGGESTIONS_ERROR_MESSAGE
+    client.error = None
+    assert generate_improvement_suggestions(*SUGGESTION_INPUTS, llm_client=client) == client.response_text
+    assert client.call_count == 2
+
+
+def test_concurrent_identical_requests_share_one_call(suggestion_cache):
+    client = FakeLLMClient(delay_seconds=0.2)
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(generate_improvement_suggestions(*SUGGESTION_INPUTS, llm_client=client)))
+               for _ in range(4)]
+    for thread in threads: thread.start()
+    for thread in threads: thread.join()
+    assert results == [client.response_text] * 4
+    assert client.call_count == 1
+    assert suggestion_cache.stats()["coalesced"] == 3
+
+
+def test_concurrent_identical_async_requests_share_one_call(suggestion_cache):
+    client = FakeLLMClient(delay_seconds=0.1)
+
+    async def run():
+        return await asyncio.gather(*(generate_improvement_suggestions_async(*SUGGESTION_INPUTS, llm_client=client)
+                                      for _ in range(4)))
+
+    assert asyncio.run(run()) == [client.response_text] * 4
+    assert client.call_count == 1
+    assert suggestion_cache.stats()["coalesced"] == 3
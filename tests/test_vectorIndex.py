@@ -0,0 +1,77 @@
+import numpy as np
+import pytest
+
+import vectorIndex
+from vectorIndex import VectorIndex
+
+
+def _random_embeddings(rows: int, seed: int = 0) -> np.ndarray:
+    return np.random.default_rng(seed).standard_normal((rows, 32)).astype(np.float32)
+
+
+def test_int8_scores_match_float32_across_blocks(monkeypatch):
+    monkeypatch.setattr(vectorIndex, "SCORE_BLOCK_ROWS", 7)
+    embeddings, query = _random_embeddings(50), _random_embeddings(1, seed=1)[0]
+    exact, quantized = VectorIndex(), VectorIndex("int8")
+    for index in (exact, quantized):
+        index.add_embeddings(list(range(50)), embeddings)
+    scores = quantized.scores(query)
+    assert scores.dtype == np.float32
+    np.testing.assert_allclose(scores, exact.scores(query), atol=0.02)
+
+
+@pytest.mark.parametrize("quantization", ["float32", "int8"])
+def test_save_and_load_round_trip(tmp_path, quantization):
+    index = VectorIndex(quantization)
+    index.add_embeddings(["a", "b", "c"], _random_embeddings(3))
+    index.save(str(tmp_path))
+    loaded = VectorIndex.load(str(tmp_path))
+    query = _random_embeddings(1, seed=1)[0]
+    assert loaded.job_ids == ["a", "b", "c"]
+    np.testing.assert_allclose(loaded.scores(query), index.scores(query))
+
+
+def test_empty_int8_index_round_trips(tmp_path):
+    VectorIndex("int8").save(str(tmp_path))
+    loaded = VectorIndex.load(str(tmp_path))
+    assert len(loaded) == 0
+    assert loaded.search_embedding(_random_embeddings(1)[0]) == []
+    loaded.add_embeddings(["a"], _random_embeddings(1))
+    assert loaded.search_embedding(_random_embeddings(1)[0], k=1)[0][0] == "a"
+
+
+class FixedBatcher:
+    def __init__(self, embedding):
+        self.embedding = np.asarray(embedding, dtype=np.float32)
+
+    def encode(self, texts):
+        return np.stack([self.embedding] * len(texts))
+
+
+def test_rank_jobs_scores_keywords_of_semantic_candidates(registry):
+    from jobIndex import JobIndex
+    registry.get_or_create("sentence_model", lambda: object())
+    registry.get_or_create("encode_batcher", lambda: FixedBatcher([1.0, 0.0]))
+    registry.get_or_create("embedding_cache", lambda: None)
+    job_index = JobIndex()
+    job_index.add_job("Backend Engineer", ["python", "sql"], [])
+    job_index.add_job("Data Engineer", ["python"], [])
+    vectors = VectorIndex()
+    vectors.add_embeddings([0, 1], [[1.0, 0.0], [0.0, 1.0]])
+
+    # Job 0 is the only semantic candidate and misses the keyword top-1, which is job 1
+    rows = vectorIndex.rank_jobs("resume", ["python"], vectors, job_index, candidate_pool=1)
+    weighted_scores = {row["job_id"]: row["weighted_score"] for row in rows}
+    assert weighted_scores == {0: 0.5, 1: 1.0}
+    assert rows[0]["job_id"] == 0
+
+
+def test_missing_sentence_model_raises_a_clear_error(registry):
+    registry.get_or_create("sentence_model", lambda: None)
+    index = VectorIndex()
+    with pytest.raises(RuntimeError, match="sentence model is not available"):
+        index.add_texts([0], ["Backend engineer"])
+    with pytest.raises(RuntimeError, match="sentence model is not available"):
+        index.search("resume")
+    with pytest.raises(RuntimeError, match="sentence model is not available"):
+        vectorIndex.rank_jobs("resume", [], index)